@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+God Mode Engine - Preflop Equity Matrix Builder
+Computes all-in equity for every pair of the 169 starting-hand classes and
+writes data/equity/preflop_169.bin for the engine to memory-map.
+
+Exact mode (the default) evaluates every one of the 1326 combos on every
+one of the C(52,5) = 2,598,960 boards once with evaluate_batch, then
+counts wins and ties per (hero, villain) pair with vectorized compares. By
+suit symmetry a class's equity equals that of any single representative
+combo against all card-disjoint combos of the villain class, so only 169
+hero vectors are kept in memory while villain combos stream past them (the
+workers share the hero vectors by fork). Every pair is scored over all
+C(48,5) = 1,712,304 boards, and the result satisfies m + m.T == 1 with an
+exact 0.5 diagonal.
+
+Monte-Carlo mode reduces each class pair to its suit-isomorphic combo
+matchups (AKs vs QQ has 2 distinct matchups instead of 24) and samples
+boards for each. Class pairs are spread over a process pool.
+
+Usage:
+    python scripts/build_preflop_equity.py                   # Exact enumeration
+    python scripts/build_preflop_equity.py --samples 20000   # Monte-Carlo boards per matchup
+    python scripts/build_preflop_equity.py --workers 16 --output /tmp/preflop_169.bin
+"""
+
+import os
+import sys
+import time
+import argparse
+import itertools
+from functools import lru_cache
+from pathlib import Path
+from multiprocessing import Pool
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.engine.chart_index import DECK, NUM_HAND_CLASSES, hand_class_index
+from src.engine.evaluator import evaluate_batch
+from src.engine.preflop_equity import EQUITY_PATH, write_equity_file
+
+
+# ============================================================================
+# CARDS
+# ============================================================================
+
+# Card ints follow DECK order: index = rank_index * 4 + suit, rank_index 0 = Ace
+SUIT_PERMUTATIONS = list(itertools.permutations(range(4)))
+
+# All 1326 two-card combos grouped by hand class
+COMBOS_BY_CLASS: Dict[int, List[Tuple[int, int]]] = {}
+for _a, _b in itertools.combinations(range(52), 2):
+    COMBOS_BY_CLASS.setdefault(hand_class_index(DECK[_a] + DECK[_b]), []).append((_a, _b))
+
+
+def _permute(card: int, perm: Tuple[int, ...]) -> int:
+    return (card // 4) * 4 + perm[card % 4]
+
+
+def canonical_matchups(i: int, j: int) -> List[Tuple[Tuple[int, int], Tuple[int, int], int]]:
+    """
+    Collapse every card-disjoint (combo of i, combo of j) pair into suit
+    isomorphism classes.
+
+    Returns:
+        List of (hero combo, villain combo, weight) with weights summing to
+        the number of disjoint combo pairs.
+    """
+    counts: Dict[Tuple, int] = {}
+    for hero in COMBOS_BY_CLASS[i]:
+        for villain in COMBOS_BY_CLASS[j]:
+            if set(hero) & set(villain):
+                continue
+            key = min(
+                (tuple(sorted(_permute(c, p) for c in hero)),
+                 tuple(sorted(_permute(c, p) for c in villain)))
+                for p in SUIT_PERMUTATIONS
+            )
+            counts[key] = counts.get(key, 0) + 1
+    return [(hero, villain, weight) for (hero, villain), weight in counts.items()]
+
+
+# ============================================================================
+# SHOWDOWN EVALUATION
+# ============================================================================
+
+BOARD_CHUNK = 250_000
+BOARDS_PER_MATCHUP = 1_712_304  # C(48, 5)
+
+# Strength sentinels for boards that share a card with the combo: the hero
+# scores 0 and the villain 65535, so those boards are neither wins nor ties
+HERO_BLOCKED = 0
+VILLAIN_BLOCKED = np.iinfo(np.uint16).max
+
+
+@lru_cache(maxsize=1)
+def all_boards() -> Tuple[np.ndarray, np.ndarray]:
+    """Every C(52,5) board as card ints, plus a 52-bit card mask per board."""
+    boards = np.fromiter(
+        itertools.chain.from_iterable(itertools.combinations(range(52), 5)),
+        dtype=np.uint8,
+        count=2_598_960 * 5,
+    ).reshape(-1, 5)
+    masks = np.zeros(len(boards), dtype=np.uint64)
+    for column in range(5):
+        masks |= np.left_shift(np.uint64(1), boards[:, column].astype(np.uint64))
+    return boards, masks
+
+
+def combo_strengths(combo: Tuple[int, int], blocked: int) -> np.ndarray:
+    """Strength of `combo` on every board; `blocked` where they share a card."""
+    boards, masks = all_boards()
+    open_rows = np.flatnonzero((masks & np.uint64((1 << combo[0]) | (1 << combo[1]))) == 0)
+    result = np.full(len(boards), blocked, dtype=np.uint16)
+    hole = np.array(combo, dtype=np.uint8)
+    for start in range(0, len(open_rows), BOARD_CHUNK):
+        rows = open_rows[start:start + BOARD_CHUNK]
+        result[rows] = evaluate_batch(np.hstack([np.broadcast_to(hole, (len(rows), 2)), boards[rows]]))
+    return result
+
+
+def matchup_equity(hero: Tuple[int, int], villain: Tuple[int, int], samples: int, seed: int) -> float:
+    """Hero's equity (ties count half) over `samples` random boards."""
+    remaining = np.array([c for c in range(52) if c not in hero and c not in villain], dtype=np.int16)
+    rng = np.random.default_rng(seed)
+    positions = rng.random((samples, 48)).argpartition(5, axis=1)[:, :5]
+
+    score = 0.0
+    for start in range(0, len(positions), BOARD_CHUNK):
+        boards = remaining[positions[start:start + BOARD_CHUNK]]
+        n = len(boards)
+        h = evaluate_batch(np.hstack([np.broadcast_to(np.array(hero, dtype=np.int16), (n, 2)), boards]))
+        v = evaluate_batch(np.hstack([np.broadcast_to(np.array(villain, dtype=np.int16), (n, 2)), boards]))
+        score += np.count_nonzero(h > v) + 0.5 * np.count_nonzero(h == v)
+    return score / len(positions)
+
+
+# ============================================================================
+# POOL TASKS
+# ============================================================================
+
+def class_pair_equity(task: Tuple[int, int, int, int]) -> Tuple[int, int, float]:
+    i, j, samples, seed = task
+    matchups = canonical_matchups(i, j)
+    total_weight = sum(w for _, _, w in matchups)
+    equity = sum(
+        w * matchup_equity(hero, villain, samples, seed + k)
+        for k, (hero, villain, w) in enumerate(matchups)
+    ) / total_weight
+    return i, j, equity
+
+
+# Hero representatives' board strengths, set before the pool forks
+_HERO_STRENGTHS: np.ndarray = np.empty((0, 0), dtype=np.uint16)
+_HERO_COMBOS: List[Tuple[int, int]] = []
+HERO_ROWS_PER_COMPARE = 16
+
+
+def villain_combo_scores(villain: Tuple[int, int]) -> Tuple[Tuple[int, int], np.ndarray]:
+    """Wins + ties/2 (over all boards) of every hero representative vs one combo."""
+    strengths = combo_strengths(villain, VILLAIN_BLOCKED)
+    scores = np.empty(len(_HERO_COMBOS))
+    for start in range(0, len(_HERO_COMBOS), HERO_ROWS_PER_COMPARE):
+        heroes = _HERO_STRENGTHS[start:start + HERO_ROWS_PER_COMPARE]
+        wins = np.count_nonzero(heroes > strengths, axis=1)
+        ties = np.count_nonzero(heroes == strengths, axis=1)
+        scores[start:start + len(heroes)] = wins + 0.5 * ties
+    return villain, scores
+
+
+def build_exact_matrix(workers: int) -> np.ndarray:
+    """Exact enumeration (see module docstring)."""
+    global _HERO_STRENGTHS, _HERO_COMBOS
+    started = time.time()
+    _HERO_COMBOS = [COMBOS_BY_CLASS[i][0] for i in range(NUM_HAND_CLASSES)]
+    _HERO_STRENGTHS = np.stack([combo_strengths(combo, HERO_BLOCKED) for combo in _HERO_COMBOS])
+    print(f"🂠 Hero representatives evaluated on every board ({time.time() - started:,.0f}s)")
+
+    totals = np.zeros((NUM_HAND_CLASSES, NUM_HAND_CLASSES))
+    counts = np.zeros((NUM_HAND_CLASSES, NUM_HAND_CLASSES))
+    villains = list(itertools.combinations(range(52), 2))
+    with Pool(processes=workers) as pool:
+        for done, (villain, scores) in enumerate(pool.imap_unordered(villain_combo_scores, villains), 1):
+            j = hand_class_index(DECK[villain[0]] + DECK[villain[1]])
+            for i, hero in enumerate(_HERO_COMBOS):
+                if set(hero) & set(villain):
+                    continue
+                totals[i, j] += scores[i] / BOARDS_PER_MATCHUP
+                counts[i, j] += 1
+            if done % 50 == 0 or done == len(villains):
+                elapsed = time.time() - started
+                eta = elapsed / done * (len(villains) - done)
+                print(f"📈 {done}/{len(villains)} villain combos ({elapsed:,.0f}s elapsed, ~{eta:,.0f}s left)")
+
+    computed = totals / counts
+    asymmetry = np.abs(computed + computed.T - 1.0).max()
+    print(f"🔎 Max |m + m.T - 1| before symmetrizing: {asymmetry:.2e}")
+    if asymmetry > 1e-9:
+        raise RuntimeError(f"Exact equities are not antisymmetric ({asymmetry:.2e}); evaluator bug?")
+
+    # Take the upper triangle so the stored matrix is exactly complementary
+    upper = np.triu(computed, k=1)
+    matrix = upper + np.tril(1.0 - upper.T, k=-1)
+    np.fill_diagonal(matrix, 0.5)
+    return matrix
+
+
+def build_matrix(samples: int, workers: int, seed: int) -> np.ndarray:
+    if samples == 0:
+        return build_exact_matrix(workers)
+    matrix = np.full((NUM_HAND_CLASSES, NUM_HAND_CLASSES), 0.5, dtype=np.float64)
+    # A class against itself is 0.5 by symmetry; the diagonal stays as is
+    tasks = [
+        (i, j, samples, seed + i * NUM_HAND_CLASSES * 8 + j * 8)
+        for i in range(NUM_HAND_CLASSES)
+        for j in range(i + 1, NUM_HAND_CLASSES)
+    ]
+
+    started = time.time()
+    with Pool(processes=workers) as pool:
+        for done, (i, j, equity) in enumerate(pool.imap_unordered(class_pair_equity, tasks, chunksize=4), 1):
+            matrix[i, j] = equity
+            matrix[j, i] = 1.0 - equity
+            if done % 500 == 0 or done == len(tasks):
+                elapsed = time.time() - started
+                eta = elapsed / done * (len(tasks) - done)
+                print(f"📈 {done}/{len(tasks)} class pairs ({elapsed:,.0f}s elapsed, ~{eta:,.0f}s left)")
+    return matrix
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the 169x169 preflop equity matrix")
+    parser.add_argument("--samples", type=int, default=0, help="Random boards per matchup (0 = exact)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="Worker processes")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for Monte-Carlo sampling")
+    parser.add_argument("--output", type=str, default=str(EQUITY_PATH), help="Output .bin path")
+    args = parser.parse_args()
+
+    mode = "exact enumeration" if args.samples == 0 else f"{args.samples} sampled boards per matchup"
+    print("\n🃏 GOD MODE ENGINE - Preflop Equity Builder")
+    print("=" * 50)
+    print(f"Mode: {mode}, {args.workers} workers")
+
+    matrix = build_matrix(args.samples, args.workers, args.seed)
+    write_equity_file(Path(args.output), matrix, samples=args.samples)
+    print(f"\n✅ Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
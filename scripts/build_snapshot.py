@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+God Mode Engine - Boot Snapshot Builder
+Packs the game registry and compiled charts into the single file the
+server loads at boot (data/snapshot/engine.snapshot).
+
+Run it as a deploy step, after seeding the registry. The server still
+reconciles the registry with the database in the background, so a
+slightly stale snapshot only costs a short window of old configs.
+
+Usage:
+    python scripts/build_snapshot.py                 # Registry from Supabase
+    python scripts/build_snapshot.py --output /tmp/engine.snapshot
+    python scripts/build_snapshot.py --from-seed --output /tmp/seed.snapshot
+
+--from-seed builds offline from seed_games.py. Seed rows have no database
+ids, so they get stable placeholder ids (uuid5 of the slug) that will not
+match game_registry; such a snapshot is for local inspection and
+benchmarks only and can't be written to the boot path.
+"""
+
+import os
+import sys
+import time
+import uuid
+import argparse
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.engine.chart_index import CHARTS_DIR, ChartIndex
+from src.engine.snapshot import SNAPSHOT_PATH, load_snapshot, write_snapshot
+
+# Supabase import is optional (only needed for the live registry)
+try:
+    from src.engine.db_transport import create_db_client
+    SUPABASE_AVAILABLE = True
+except ImportError:
+    SUPABASE_AVAILABLE = False
+    create_db_client = None
+
+# Namespace for the placeholder ids of --from-seed rows
+SEED_ID_NAMESPACE = uuid.UUID("6f1c1d7e-3b52-4d8a-9a43-5c0f6e2b9d10")
+
+
+def fetch_registry() -> list[dict]:
+    """Read every game_registry row from Supabase."""
+    if not SUPABASE_AVAILABLE:
+        raise ImportError("supabase not installed. Run: pip install supabase")
+    url = os.environ.get("SUPABASE_URL") or os.environ.get("NEXT_PUBLIC_SUPABASE_URL")
+    key = os.environ.get("SUPABASE_KEY") or os.environ.get("SUPABASE_SERVICE_KEY")
+    if not url or not key:
+        raise ValueError(
+            "Missing Supabase credentials. Set SUPABASE_URL and SUPABASE_KEY environment variables."
+        )
+    client, _ = create_db_client(url, key)
+    result = client.table("game_registry").select("*").execute()
+    return result.data or []
+
+
+def seed_registry() -> list[dict]:
+    """Registry rows as seed_games.py would insert them, with placeholder ids."""
+    sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+    from seed_games import parse_games
+    games = parse_games()
+    for game in games:
+        game["id"] = str(uuid.uuid5(SEED_ID_NAMESPACE, game["slug"]))
+    return games
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the engine boot snapshot")
+    parser.add_argument("--from-seed", action="store_true", help="Use seed_games.py instead of Supabase")
+    parser.add_argument("--output", type=str, default=str(SNAPSHOT_PATH), help="Output snapshot path")
+    args = parser.parse_args()
+
+    output = Path(args.output)
+    if args.from_seed and output.resolve() == SNAPSHOT_PATH.resolve():
+        raise SystemExit(
+            "❌ --from-seed ids don't match the database; pass --output to write it somewhere "
+            "other than the boot snapshot"
+        )
+
+    print("\n📦 GOD MODE ENGINE - Snapshot Builder")
+    print("=" * 50)
+
+    registry = seed_registry() if args.from_seed else fetch_registry()
+    print(f"📋 Registry: {len(registry)} games ({'seed' if args.from_seed else 'supabase'})")
+
+    charts = ChartIndex.load(CHARTS_DIR)
+    print(f"📊 Charts: {len(charts.charts)} compiled")
+
+    size = write_snapshot(output, registry, charts)
+
+    started = time.perf_counter()
+    snapshot = load_snapshot(output)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if snapshot is None:
+        raise SystemExit(f"❌ Wrote {output} but could not read it back")
+
+    print(f"\n✅ Wrote {output} ({size / 1024:,.1f} KB, loads in {elapsed_ms:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -22,7 +22,13 @@ from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
 # Supabase client
-from supabase import create_client, Client
+from supabase import Client
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.engine.db_transport import create_db_client
+from src.engine.difficulty import difficulty_bucket, spot_difficulty
 
 # ═══════════════════════════════════════════════════════════════════════════
 # CONFIGURATION
@@ -31,8 +37,9 @@ from supabase import create_client, Client
 SUPABASE_URL = os.getenv('SUPABASE_URL', 'YOUR_SUPABASE_URL')
 SUPABASE_KEY = os.getenv('SUPABASE_KEY', 'YOUR_SUPABASE_KEY')
 
-# Initialize Supabase client
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+# Initialize Supabase client (pool size, timeouts and in-flight cap via DB_* env)
+supabase: Client
+supabase, db_governor = create_db_client(SUPABASE_URL, SUPABASE_KEY)
 
 # Valid enum values (must match database schema)
 VALID_STREETS = ['Flop', 'Turn', 'River']
@@ -287,6 +294,9 @@ def process_csv_file(file_path: Path) -> Optional[Dict]:
             # Range advantage is simplified here - you can enhance this
             macro_metrics['hero_range_adv'] = avg_hero_ev / 100 if avg_hero_ev > 0 else 0
         
+        # Difficulty drives level-based spot selection in the engine
+        difficulty = spot_difficulty(strategy_matrix)
+        
         # Build final record
         record = {
             'scenario_hash': scenario_hash,
@@ -297,7 +307,9 @@ def process_csv_file(file_path: Path) -> Optional[Dict]:
             'mode': variables['mode'],
             'board_cards': board,
             'macro_metrics': macro_metrics,
-            'strategy_matrix': strategy_matrix
+            'strategy_matrix': strategy_matrix,
+            'difficulty': difficulty,
+            'difficulty_bucket': difficulty_bucket(difficulty)
         }
         
         return record
@@ -322,6 +334,34 @@ def ingest_file(file_path: Path) -> bool:
         return False
 
 
+def backfill_difficulty(page_size: int = 100) -> int:
+    """
+    Score rows ingested before the difficulty columns existed.
+
+    One upsert per page instead of one UPDATE per row. PostgREST upserts
+    need every NOT NULL column, so full rows are read and written back.
+    """
+    updated = 0
+    last_id = None
+    while True:
+        query = supabase.table('solved_spots_gold')\
+            .select('*')\
+            .is_('difficulty', 'null')\
+            .order('id')
+        if last_id is not None:
+            query = query.gt('id', last_id)
+        rows = query.limit(page_size).execute().data
+        if not rows:
+            return updated
+        for row in rows:
+            row['difficulty'] = spot_difficulty(row['strategy_matrix'] or {})
+            row['difficulty_bucket'] = difficulty_bucket(row['difficulty'])
+        supabase.table('solved_spots_gold').upsert(rows, on_conflict='id').execute()
+        last_id = rows[-1]['id']
+        updated += len(rows)
+        print(f"📈 Difficulty backfilled: {updated}")
+
+
 def scan_directory(root_dir: Path) -> List[Path]:
     """Recursively scan directory for CSV files."""
     csv_files = []
@@ -341,6 +381,11 @@ def main():
     print("GOD MODE OMNI-INGEST SCRIPT")
     print("═" * 80)
     
+    # One-off: score spots ingested before difficulty existed
+    if len(sys.argv) > 1 and sys.argv[1] == '--backfill-difficulty':
+        print(f"✅ Backfilled difficulty for {backfill_difficulty()} spots")
+        return
+    
     # Get root directory from command line or use default
     if len(sys.argv) > 1:
         root_dir = Path(sys.argv[1])
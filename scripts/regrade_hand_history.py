@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""
+God Mode Engine - Hand History Re-Grader
+Re-grades god_mode_hand_history against the current calculate_hp_loss rules.
+
+History is streamed in id order (a server-side cursor when DATABASE_URL is set,
+keyset pages over PostgREST otherwise) and joined to solved_spots_gold by
+file_id. Pages are graded across a process pool, changed rows are written back
+in bulk, and progress is checkpointed so an interrupted run resumes where it
+stopped. Memory stays bounded by page size x in-flight pages, not table size.
+
+Usage:
+    python scripts/regrade_hand_history.py --dry-run              # Report only
+    python scripts/regrade_hand_history.py                        # Re-grade + write diffs
+    python scripts/regrade_hand_history.py --workers 8 --page-size 5000
+    python scripts/regrade_hand_history.py --dry-run --report shift.json
+    python scripts/regrade_hand_history.py --reset                # Ignore checkpoint
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.engine.engine_core import GameEngine
+
+# Supabase import is optional (only needed for the PostgREST source)
+try:
+    from supabase import create_client
+    SUPABASE_AVAILABLE = True
+except ImportError:
+    SUPABASE_AVAILABLE = False
+    create_client = None
+
+# psycopg2 is optional (only needed for the server-side cursor source)
+try:
+    import psycopg2
+    import psycopg2.extras
+    PSYCOPG2_AVAILABLE = True
+except ImportError:
+    PSYCOPG2_AVAILABLE = False
+    psycopg2 = None
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+HISTORY_TABLE = "god_mode_hand_history"
+SPOTS_TABLE = "solved_spots_gold"
+
+# Columns the grader reads from each history row
+HISTORY_COLUMNS = [
+    "id", "game_id", "file_id", "user_action", "user_sizing",
+    "is_correct", "ev_loss", "hp_damage",
+]
+
+# Columns rewritten when a row's grade changes
+GRADE_COLUMNS = ["is_correct", "ev_loss", "hp_damage"]
+
+# hp_damage buckets for the distribution report (mirror calculate_hp_loss tiers)
+DAMAGE_BUCKETS = [(0, 0, "0"), (1, 5, "1-5"), (6, 15, "6-15"), (16, 25, "16-25")]
+
+DEFAULT_CHECKPOINT = PROJECT_ROOT / ".regrade_checkpoint.json"
+SPOT_CACHE_SIZE = 20_000
+SPOT_LOOKUP_CHUNK = 100  # file_ids per `in` filter (they go into the URL)
+EV_TOLERANCE = 1e-9
+
+
+# ============================================================================
+# HISTORY SOURCES
+# ============================================================================
+
+class PostgresHistorySource:
+    """
+    Streams history through a named (server-side) cursor.
+
+    The join to solved_spots_gold happens in SQL, so each fetched row already
+    carries its solver_node and pot.
+    """
+
+    def __init__(self, dsn: str, page_size: int):
+        # Writes go through a second connection: committing on the reading
+        # connection would close the named cursor mid-stream.
+        self.read_conn = psycopg2.connect(dsn)
+        self.write_conn = psycopg2.connect(dsn)
+        self.page_size = page_size
+
+    def pages(self, after_id: Optional[str]) -> Iterator[List[Dict]]:
+        cursor = self.read_conn.cursor(
+            name="regrade_history",
+            cursor_factory=psycopg2.extras.RealDictCursor,
+        )
+        cursor.itersize = self.page_size
+        columns = ", ".join(f"h.{c}" for c in HISTORY_COLUMNS)
+        cursor.execute(
+            f"""
+            SELECT {columns}, s.solver_node, s.pot
+            FROM {HISTORY_TABLE} h
+            LEFT JOIN {SPOTS_TABLE} s ON s.id::text = h.file_id::text
+            WHERE %s::uuid IS NULL OR h.id > %s::uuid
+            ORDER BY h.id
+            """,
+            (after_id, after_id),
+        )
+        try:
+            while True:
+                rows = cursor.fetchmany(self.page_size)
+                if not rows:
+                    return
+                yield [dict(row) for row in rows]
+        finally:
+            cursor.close()
+
+    def write(self, diffs: List[Dict]):
+        """Apply grade changes with one UPDATE ... FROM (VALUES ...) per batch."""
+        if not diffs:
+            return
+        with self.write_conn.cursor() as cursor:
+            psycopg2.extras.execute_values(
+                cursor,
+                f"""
+                UPDATE {HISTORY_TABLE} AS h
+                SET is_correct = v.is_correct, ev_loss = v.ev_loss, hp_damage = v.hp_damage
+                FROM (VALUES %s) AS v(id, is_correct, ev_loss, hp_damage)
+                WHERE h.id = v.id::uuid
+                """,
+                [(d["id"], d["is_correct"], d["ev_loss"], d["hp_damage"]) for d in diffs],
+                page_size=1000,
+            )
+        self.write_conn.commit()
+
+    def close(self):
+        self.read_conn.close()
+        self.write_conn.close()
+
+
+class SupabaseHistorySource:
+    """
+    Streams history as keyset pages over PostgREST (id > last_id ORDER BY id).
+
+    PostgREST caps a response at its max-rows setting (1000 by default), so
+    a short page does not mean the table is exhausted; only an empty page
+    ends the stream.
+
+    Each page is joined to solved_spots_gold with `in` queries (chunked to
+    keep the URL short) for the file_ids not already held in a bounded LRU
+    of solver nodes.
+    """
+
+    def __init__(self, client, page_size: int):
+        self.client = client
+        self.page_size = page_size
+        self._spots: OrderedDict = OrderedDict()
+
+    def pages(self, after_id: Optional[str]) -> Iterator[List[Dict]]:
+        last_id = after_id
+        while True:
+            query = self.client.table(HISTORY_TABLE).select("*").order("id")
+            if last_id:
+                query = query.gt("id", last_id)
+            rows = query.limit(self.page_size).execute().data or []
+            if not rows:
+                return
+            self._join_spots(rows)
+            yield rows
+            last_id = rows[-1]["id"]
+
+    def _join_spots(self, rows: List[Dict]):
+        missing = sorted({str(r["file_id"]) for r in rows if r.get("file_id")} - set(self._spots))
+        for start in range(0, len(missing), SPOT_LOOKUP_CHUNK):
+            result = self.client.table(SPOTS_TABLE) \
+                .select("id, solver_node, pot") \
+                .in_("id", missing[start:start + SPOT_LOOKUP_CHUNK]) \
+                .execute()
+            for spot in result.data or []:
+                self._remember(str(spot["id"]), spot)
+        for row in rows:
+            spot = self._spots.get(str(row.get("file_id")))
+            if spot is not None:
+                self._spots.move_to_end(str(row["file_id"]))
+            row["solver_node"] = spot.get("solver_node") if spot else None
+            row["pot"] = spot.get("pot") if spot else None
+
+    def _remember(self, file_id: str, spot: Dict):
+        self._spots[file_id] = spot
+        if len(self._spots) > SPOT_CACHE_SIZE:
+            self._spots.popitem(last=False)
+
+    def write(self, diffs: List[Dict]):
+        """Upsert full rows (PostgREST upsert needs every NOT NULL column)."""
+        if not diffs:
+            return
+        payload = [d["row"] for d in diffs]
+        self.client.table(HISTORY_TABLE).upsert(payload, on_conflict="id").execute()
+
+    def close(self):
+        pass
+
+
+def open_source(page_size: int):
+    """Prefer a direct server-side cursor; fall back to PostgREST keyset pages."""
+    dsn = os.environ.get("DATABASE_URL")
+    if dsn and PSYCOPG2_AVAILABLE:
+        print("🔌 Source: PostgreSQL server-side cursor")
+        return PostgresHistorySource(dsn, page_size)
+
+    if not SUPABASE_AVAILABLE:
+        raise RuntimeError("Install psycopg2 (with DATABASE_URL) or supabase to read history")
+
+    url = os.environ.get("SUPABASE_URL") or os.environ.get("NEXT_PUBLIC_SUPABASE_URL")
+    key = os.environ.get("SUPABASE_KEY") or os.environ.get("SUPABASE_SERVICE_KEY")
+    if not url or not key:
+        raise ValueError(
+            "Missing credentials. Set DATABASE_URL, or SUPABASE_URL and SUPABASE_KEY."
+        )
+    print("🔌 Source: PostgREST keyset pages")
+    return SupabaseHistorySource(create_client(url, key), page_size)
+
+
+# ============================================================================
+# GRADING (runs inside pool workers)
+# ============================================================================
+
+_worker_engine: Optional[GameEngine] = None
+
+
+def _init_worker():
+    """Each worker grades with its own DB-less engine instance."""
+    global _worker_engine
+    _worker_engine = GameEngine(None)
+
+
+def grade_page(rows: List[Dict], keep_rows: bool) -> Dict:
+    """
+    Re-grade one page of history.
+
+    Returns the diffs for changed rows plus compact (old, new) samples for the
+    distribution report, so the parent never needs the full page back.
+    """
+    engine = _worker_engine or GameEngine(None)
+    diffs = []
+    samples = []
+
+    for row in rows:
+        solver_node = row.get("solver_node") or {}
+        if isinstance(solver_node, str):
+            solver_node = json.loads(solver_node)
+        if not row.get("user_action") or not solver_node:
+            continue
+
+        result = engine.calculate_hp_loss(
+            user_action=row["user_action"],
+            solver_node=solver_node,
+            user_sizing=row.get("user_sizing"),
+            pot_size=float(row.get("pot") or 100),
+        )
+        old_damage = int(row.get("hp_damage") or 0)
+        samples.append((
+            str(row.get("game_id")),
+            bool(row.get("is_correct")), old_damage,
+            result.is_correct, result.hp_damage,
+        ))
+
+        changed = (
+            bool(row.get("is_correct")) != result.is_correct
+            or old_damage != result.hp_damage
+            or abs(float(row.get("ev_loss") or 0) - result.ev_loss) > EV_TOLERANCE
+        )
+        if changed:
+            diff = {
+                "id": row["id"],
+                "is_correct": result.is_correct,
+                "ev_loss": result.ev_loss,
+                "hp_damage": result.hp_damage,
+            }
+            if keep_rows:
+                updated = {k: v for k, v in row.items() if k not in ("solver_node", "pot")}
+                updated.update({c: diff[c] for c in GRADE_COLUMNS})
+                diff["row"] = updated
+            diffs.append(diff)
+
+    return {"last_id": rows[-1]["id"], "rows": len(rows), "diffs": diffs, "samples": samples}
+
+
+# ============================================================================
+# DISTRIBUTION REPORT
+# ============================================================================
+
+def damage_bucket(damage: int) -> str:
+    for low, high, label in DAMAGE_BUCKETS:
+        if low <= damage <= high:
+            return label
+    return DAMAGE_BUCKETS[-1][2]
+
+
+class ShiftReport:
+    """Streaming old-vs-new accuracy and damage distributions."""
+
+    def __init__(self, state: Optional[Dict] = None):
+        state = state or {}
+        self.graded = state.get("graded", 0)
+        self.flipped_to_correct = state.get("flipped_to_correct", 0)
+        self.flipped_to_mistake = state.get("flipped_to_mistake", 0)
+        self.damage = state.get("damage", {
+            "old": {label: 0 for _, _, label in DAMAGE_BUCKETS},
+            "new": {label: 0 for _, _, label in DAMAGE_BUCKETS},
+        })
+        self.games = state.get("games", {})
+
+    def add(self, samples: List[tuple]):
+        for game_id, old_ok, old_dmg, new_ok, new_dmg in samples:
+            self.graded += 1
+            if old_ok != new_ok:
+                if new_ok:
+                    self.flipped_to_correct += 1
+                else:
+                    self.flipped_to_mistake += 1
+            self.damage["old"][damage_bucket(old_dmg)] += 1
+            self.damage["new"][damage_bucket(new_dmg)] += 1
+
+            game = self.games.setdefault(game_id, [0, 0, 0])  # [hands, old_ok, new_ok]
+            game[0] += 1
+            game[1] += old_ok
+            game[2] += new_ok
+
+    def to_dict(self) -> Dict:
+        return {
+            "graded": self.graded,
+            "flipped_to_correct": self.flipped_to_correct,
+            "flipped_to_mistake": self.flipped_to_mistake,
+            "damage": self.damage,
+            "games": self.games,
+        }
+
+    def print(self):
+        total_old = sum(g[1] for g in self.games.values())
+        total_new = sum(g[2] for g in self.games.values())
+        n = max(1, self.graded)
+
+        print("\n" + "=" * 60)
+        print("📊 ACCURACY SHIFT")
+        print("=" * 60)
+        print(f"  Graded hands:     {self.graded}")
+        print(f"  Accuracy (old):   {total_old / n * 100:6.2f}%")
+        print(f"  Accuracy (new):   {total_new / n * 100:6.2f}%")
+        print(f"  Mistake → OK:     {self.flipped_to_correct}")
+        print(f"  OK → Mistake:     {self.flipped_to_mistake}")
+
+        print("\n  HP damage        old        new")
+        for _, _, label in DAMAGE_BUCKETS:
+            print(f"  {label:>8}  {self.damage['old'][label]:>9}  {self.damage['new'][label]:>9}")
+
+        moved = sorted(
+            self.games.items(),
+            key=lambda kv: -abs(kv[1][2] - kv[1][1]) / max(1, kv[1][0]),
+        )[:10]
+        if moved:
+            print("\n  Largest per-game shifts")
+            for game_id, (hands, old_ok, new_ok) in moved:
+                delta = (new_ok - old_ok) / max(1, hands) * 100
+                print(f"  {game_id[:36]:36} {hands:>8} hands  {delta:+6.2f} pts")
+        print()
+
+
+# ============================================================================
+# CHECKPOINTING
+# ============================================================================
+
+def load_checkpoint(path: Path) -> Dict:
+    if path.exists():
+        with open(path) as f:
+            return json.load(f)
+    return {}
+
+
+def save_checkpoint(path: Path, state: Dict):
+    """Write atomically so a crash mid-write never corrupts the checkpoint."""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+# ============================================================================
+# MAIN LOOP
+# ============================================================================
+
+def run(args) -> ShiftReport:
+    checkpoint_path = Path(args.checkpoint)
+    if args.dry_run:
+        checkpoint_path = checkpoint_path.with_name(checkpoint_path.stem + ".dry-run.json")
+    state = {} if args.reset else load_checkpoint(checkpoint_path)
+    if state:
+        print(f"↩️  Resuming after id {state['last_id']} ({state['rows']} rows done)")
+
+    report = ShiftReport(state.get("report"))
+    rows_done = state.get("rows", 0)
+    written = state.get("written", 0)
+    last_id = state.get("last_id")
+
+    source = open_source(args.page_size)
+    keep_rows = isinstance(source, SupabaseHistorySource) and not args.dry_run
+    started = time.time()
+
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker) as pool:
+            # Bounded window of in-flight pages: memory stays flat and results
+            # are consumed in submission order, so the checkpoint is monotone.
+            in_flight: deque = deque()
+            max_in_flight = args.workers * 2
+
+            def drain(block_until: int):
+                nonlocal rows_done, written, last_id
+                while len(in_flight) > block_until:
+                    page = in_flight.popleft().result()
+                    report.add(page["samples"])
+                    if not args.dry_run:
+                        for i in range(0, len(page["diffs"]), args.write_batch):
+                            source.write(page["diffs"][i:i + args.write_batch])
+                        written += len(page["diffs"])
+                    rows_done += page["rows"]
+                    last_id = page["last_id"]
+                    save_checkpoint(checkpoint_path, {
+                        "last_id": last_id,
+                        "rows": rows_done,
+                        "written": written,
+                        "report": report.to_dict(),
+                    })
+                    rate = rows_done / max(1e-6, time.time() - started)
+                    print(f"📈 {rows_done} rows, {written} rewritten ({rate:,.0f} rows/s)")
+
+            for page in source.pages(last_id):
+                in_flight.append(pool.submit(grade_page, page, keep_rows))
+                drain(max_in_flight)
+            drain(0)
+    finally:
+        source.close()
+
+    print(f"\n✅ Re-grade {'dry run ' if args.dry_run else ''}complete: "
+          f"{rows_done} rows scanned, {written} rewritten")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-grade god_mode_hand_history with current rules")
+    parser.add_argument("--dry-run", action="store_true", help="Report the accuracy shift without writing")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="Grading processes")
+    parser.add_argument("--page-size", type=int, default=2000, help="History rows per page")
+    parser.add_argument("--write-batch", type=int, default=500, help="Rows per bulk write")
+    parser.add_argument("--checkpoint", type=str, default=str(DEFAULT_CHECKPOINT), help="Checkpoint file")
+    parser.add_argument("--reset", action="store_true", help="Ignore any existing checkpoint")
+    parser.add_argument("--report", type=str, help="Also write the shift report as JSON")
+    args = parser.parse_args()
+
+    print("\n🎯 GOD MODE ENGINE - Hand History Re-Grader")
+    print("=" * 50)
+
+    report = run(args)
+    report.print()
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report.to_dict(), f, indent=2)
+        print(f"📄 Report written: {args.report}")
+
+
+if __name__ == "__main__":
+    main()
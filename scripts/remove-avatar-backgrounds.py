@@ -3,78 +3,365 @@
 🎨 Avatar Background Removal Script
 Removes backgrounds from all 75 poker avatars for clean table display
 Uses rembg library for AI-powered background removal
+
+Avatars are processed in a pool of worker processes; each worker loads the
+rembg model session once and reuses it for every image it is handed.
+Inputs whose content hash (plus model and size cap) matches the cache
+manifest in the output directory, and whose output still exists, are
+skipped, so a new avatar drop only processes the new files. Images larger
+than --max-side are downscaled before inference to bound worker memory.
+
+Each cut-out PNG then gets table-sized derivatives in public/avatars/derived:
+WebP (and AVIF when Pillow can encode it) plus a PNG fallback at every size
+in DERIVATIVE_SIZES, named <tier>/<name>-<size>.<hash>.<ext> where hash is
+the source PNG's content hash, so they can be served as immutable.
+public/avatars/manifest.json maps each avatar to its derivatives for the
+frontend; avatars whose source hash is already in the manifest are skipped.
+
+Usage:
+    python scripts/remove-avatar-backgrounds.py                 # Process new/changed avatars
+    python scripts/remove-avatar-backgrounds.py --workers 4     # Pool size (default: CPU count)
+    python scripts/remove-avatar-backgrounds.py --force         # Ignore the skip cache
+    python scripts/remove-avatar-backgrounds.py --derivatives-only  # Rebuild derivatives/manifest only
 """
 
-from rembg import remove
-from PIL import Image
 import os
+import sys
+import json
+import time
+import hashlib
+import importlib.util
+import argparse
+from multiprocessing import Pool, cpu_count
 from pathlib import Path
 
+from PIL import Image, features
+
 # Configuration
 INPUT_DIR = Path(__file__).parent.parent / '.gemini' / 'antigravity' / 'brain' / '2998d0c1-93f0-4fe3-bc75-b084014084f0'
 OUTPUT_DIR = Path(__file__).parent.parent / 'public' / 'avatars'
+CACHE_FILE = '.bg-removal-cache.json'
+DEFAULT_MODEL = 'u2net'  # rembg's default model
+MAX_SIDE = 2048  # Larger inputs are downscaled before inference
+TASKS_PER_WORKER = 50  # Recycle workers to return memory to the OS
+
+# Derivatives: longest side in pixels (1x and 2x of the table seat sizes)
+DERIVATIVE_SIZES = (64, 128, 256)
+DERIVED_DIR = 'derived'
+MANIFEST_FILE = 'manifest.json'
+WEBP_QUALITY = 80
+WEBP_METHOD = 5  # method 6 is ~80x slower for ~1% smaller files
+AVIF_QUALITY = 60
+AVIF_SPEED = 8
+HASH_LENGTH = 12
+
+# Per-process model session, created once by _init_worker
+_session = None
+
+
+def file_sha256(path):
+    """Content hash of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
 
-def remove_background(input_path, output_path):
-    """Remove background from an image using AI"""
+def output_path_for(avatar_file, output_dir):
+    """Tier directory and clean filename for an input avatar."""
+    # Determine if FREE or VIP
+    if 'free' in avatar_file.name or 'clean' in avatar_file.name[:15]:
+        tier_dir = output_dir / 'free'
+    else:
+        tier_dir = output_dir / 'vip'
+
+    # Generate clean output filename
+    clean_name = avatar_file.name.replace('avatar_', '').replace('_clean', '').replace('vip_', '').replace('free_', '')
+    return tier_dir / clean_name
+
+
+def load_cache(output_dir):
     try:
-        # Read input image
-        with open(input_path, 'rb') as input_file:
-            input_data = input_file.read()
-        
-        # Remove background
-        output_data = remove(input_data)
-        
-        # Save as PNG with transparency
-        with open(output_path, 'wb') as output_file:
-            output_file.write(output_data)
-        
-        print(f"✅ Processed: {output_path.name}")
-        return True
+        with open(output_dir / CACHE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(output_dir, cache):
+    tmp_path = output_dir / (CACHE_FILE + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, output_dir / CACHE_FILE)
+
+
+def _init_worker(model_name, threads):
+    """Load the model session once per worker process, capped to `threads` inference threads."""
+    global _session
+    # Set before onnxruntime is first imported in this process
+    os.environ['OMP_NUM_THREADS'] = str(threads)
+    import onnxruntime
+    from rembg.sessions import sessions_class
+
+    # onnxruntime sizes its pools from SessionOptions; without this every
+    # worker starts one thread per core and the pool oversubscribes the CPU.
+    # rembg's new_session builds its own options (and doesn't take ours),
+    # so the session is constructed the same way it does, with these.
+    sess_opts = onnxruntime.SessionOptions()
+    sess_opts.intra_op_num_threads = threads
+    sess_opts.inter_op_num_threads = 1
+    session_class = next((sc for sc in sessions_class if sc.name() == model_name), None)
+    if session_class is None:
+        raise ValueError(f"Unknown rembg model: {model_name}")
+    _session = session_class(model_name, sess_opts)
+
+
+def remove_background(task):
+    """Remove background from an image using AI (runs in a worker)"""
+    input_path, output_path, max_side = task
+    from rembg import remove
+
+    started = time.perf_counter()
+    try:
+        with Image.open(input_path) as image:
+            image.load()
+            if max(image.size) > max_side:
+                image.thumbnail((max_side, max_side), Image.LANCZOS)
+            pixels = image.size[0] * image.size[1]
+
+            # Remove background with this worker's session
+            output = remove(image, session=_session)
+
+        # Save as PNG with transparency (atomically, so a crash never leaves a partial file)
+        tmp_path = output_path.with_name(output_path.name + '.tmp')
+        output.save(tmp_path, format='PNG', optimize=True)
+        os.replace(tmp_path, output_path)
+        return input_path, True, None, time.perf_counter() - started, pixels
+    except Exception as e:
+        return input_path, False, str(e), time.perf_counter() - started, 0
+
+
+def avif_supported():
+    """Whether this Pillow build (or the pillow-avif-plugin) can write AVIF."""
+    try:
+        import pillow_avif  # noqa: F401 — registers the AVIF codec
+    except ImportError:
+        pass
+    try:
+        return bool(features.check('avif'))
+    except ValueError:  # Pillow older than 11.2 doesn't know the feature name
+        return 'AVIF' in Image.SAVE
+
+
+def build_derivatives(task):
+    """Write every size/format of one cut-out avatar (runs in a worker)."""
+    source_path, output_dir, name, digest, sizes, avif = task
+    stem = Path(name).stem
+    tier = Path(name).parent
+    started = time.perf_counter()
+    try:
+        entry = {"hash": digest, "fallback": name, "sizes": {}}
+        with Image.open(source_path) as image:
+            image = image.convert('RGBA')
+            entry["width"], entry["height"] = image.size
+            for size in sizes:
+                scaled = image.copy()
+                scaled.thumbnail((size, size), Image.LANCZOS)
+                files = {}
+                formats = [('webp', 'WEBP', {'quality': WEBP_QUALITY, 'method': WEBP_METHOD})]
+                if avif:
+                    formats.append(('avif', 'AVIF', {'quality': AVIF_QUALITY, 'speed': AVIF_SPEED}))
+                formats.append(('png', 'PNG', {'optimize': True}))
+                for ext, fmt, options in formats:
+                    rel = Path(DERIVED_DIR) / tier / f"{stem}-{size}.{digest[:HASH_LENGTH]}.{ext}"
+                    path = output_dir / rel
+                    if not path.exists():
+                        tmp_path = path.with_name(path.name + '.tmp')
+                        scaled.save(tmp_path, format=fmt, **options)
+                        os.replace(tmp_path, path)
+                    files[ext] = {"src": rel.as_posix(), "bytes": path.stat().st_size}
+                files["width"], files["height"] = scaled.size
+                entry["sizes"][str(size)] = files
+        return name, entry, None, time.perf_counter() - started
     except Exception as e:
-        print(f"❌ Error processing {input_path.name}: {e}")
-        return False
+        return name, None, str(e), time.perf_counter() - started
+
+
+def generate_derivatives(output_dir, workers, sizes, force=False):
+    """
+    Build derivatives for every cut-out PNG whose hash isn't in the manifest
+    yet, in a process pool, then rewrite the manifest and drop superseded files.
+    """
+    manifest_path = output_dir / MANIFEST_FILE
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    avatars = manifest.get("avatars", {})
+    avif = avif_supported()
+    formats = ['webp'] + (['avif'] if avif else []) + ['png']
+    settings_changed = manifest.get("sizes") != list(sizes) or manifest.get("formats") != formats
+
+    sources = sorted(
+        p for tier in ('free', 'vip') for p in (output_dir / tier).glob('*.png')
+    )
+    tasks = []
+    for source_path in sources:
+        name = source_path.relative_to(output_dir).as_posix()
+        digest = file_sha256(source_path)
+        if not (force or settings_changed) and avatars.get(name, {}).get("hash") == digest:
+            continue
+        (output_dir / DERIVED_DIR / source_path.parent.name).mkdir(parents=True, exist_ok=True)
+        tasks.append((source_path, output_dir, name, digest, tuple(sizes), avif))
+
+    print(f"\n🖼️  Derivatives: {len(tasks)} to build, {len(sources) - len(tasks)} unchanged "
+          f"({', '.join(formats)} at {', '.join(map(str, sizes))}px)")
+
+    started = time.perf_counter()
+    failures = 0
+    if tasks:
+        with Pool(max(1, min(workers, len(tasks)))) as pool:
+            for name, entry, error, seconds in pool.imap_unordered(build_derivatives, tasks, chunksize=1):
+                if error:
+                    failures += 1
+                    print(f"❌ Derivatives for {name}: {error}")
+                    continue
+                avatars[name] = entry
+
+    # Forget avatars whose cut-out is gone
+    live = {p.relative_to(output_dir).as_posix() for p in sources}
+    avatars = {name: entry for name, entry in avatars.items() if name in live}
+
+    manifest = {"sizes": list(sizes), "formats": formats, "avatars": avatars}
+    tmp_path = manifest_path.with_name(MANIFEST_FILE + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+    # Remove derivative files no manifest entry points to any more
+    referenced = {
+        files[ext]["src"]
+        for entry in avatars.values()
+        for files in entry["sizes"].values()
+        for ext in formats if ext in files
+    }
+    removed = 0
+    for path in (output_dir / DERIVED_DIR).rglob('*.*'):
+        if path.is_file() and path.relative_to(output_dir).as_posix() not in referenced:
+            path.unlink()
+            removed += 1
+
+    original = sum((output_dir / name).stat().st_size for name in avatars)
+    smallest = sum(
+        min(files[ext]["bytes"] for ext in formats if ext in files)
+        for files in (entry["sizes"].get(str(min(sizes))) for entry in avatars.values())
+        if files
+    )
+    print(f"⏱️  Derivatives took {time.perf_counter() - started:.1f}s; removed {removed} stale files")
+    if original:
+        print(f"📉 {min(sizes)}px set: {smallest / 1024:.0f} KB vs {original / 1024:.0f} KB full-size PNGs "
+              f"({100 * smallest / original:.1f}%)")
+    print(f"🗂️  Manifest: {manifest_path}")
+    return failures
+
 
 def main():
+    parser = argparse.ArgumentParser(description="Remove backgrounds from avatar images")
+    parser.add_argument("--input-dir", type=Path, default=INPUT_DIR)
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR)
+    parser.add_argument("--workers", type=int, default=cpu_count(), help="Worker processes")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="rembg model name")
+    parser.add_argument("--max-side", type=int, default=MAX_SIDE, help="Downscale inputs above this many pixels per side")
+    parser.add_argument("--force", action="store_true", help="Reprocess even if the cache says unchanged")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DERIVATIVE_SIZES), help="Derivative sizes (px)")
+    parser.add_argument("--derivatives-only", action="store_true", help="Skip background removal")
+    parser.add_argument("--skip-derivatives", action="store_true", help="Skip WebP/AVIF/PNG derivatives")
+    args = parser.parse_args()
+
     print("🎨 Avatar Background Removal Script")
     print("=" * 50)
-    
+
     # Create output directories
-    (OUTPUT_DIR / 'free').mkdir(parents=True, exist_ok=True)
-    (OUTPUT_DIR / 'vip').mkdir(parents=True, exist_ok=True)
-    
+    (args.output_dir / 'free').mkdir(parents=True, exist_ok=True)
+    (args.output_dir / 'vip').mkdir(parents=True, exist_ok=True)
+
+    if args.derivatives_only:
+        failures = generate_derivatives(args.output_dir, args.workers, sorted(args.sizes), force=args.force)
+        sys.exit(1 if failures else 0)
+
+    # Check if rembg is installed (without importing it: the workers must be
+    # the first to load onnxruntime, after their thread caps are set)
+    if importlib.util.find_spec('rembg') is None:
+        print("❌ rembg library not found!")
+        print("📦 Install with: pip install rembg")
+        exit(1)
+
     # Get all avatar images
-    avatar_files = list(INPUT_DIR.glob('avatar_*.png'))
-    
+    avatar_files = sorted(args.input_dir.glob('avatar_*.png'))
     print(f"\nFound {len(avatar_files)} avatar images")
-    print("\nProcessing...")
-    
-    success_count = 0
-    
+
+    # Skip inputs whose hash, model and size cap match the last successful run
+    cache = {} if args.force else load_cache(args.output_dir)
+    tasks, keys = [], {}
     for avatar_file in avatar_files:
-        # Determine if FREE or VIP
-        if 'free' in avatar_file.name or 'clean' in avatar_file.name[:15]:
-            tier_dir = OUTPUT_DIR / 'free'
-        else:
-            tier_dir = OUTPUT_DIR / 'vip'
-        
-        # Generate clean output filename
-        clean_name = avatar_file.name.replace('avatar_', '').replace('_clean', '').replace('vip_', '').replace('free_', '')
-        output_path = tier_dir / clean_name
-        
-        # Remove background
-        if remove_background(avatar_file, output_path):
-            success_count += 1
-    
-    print(f"\n✅ Successfully processed {success_count}/{len(avatar_files)} avatars")
-    print(f"📁 Output directory: {OUTPUT_DIR}")
+        output_path = output_path_for(avatar_file, args.output_dir)
+        key = f"{file_sha256(avatar_file)}:{args.model}:{args.max_side}"
+        keys[avatar_file] = (str(output_path.relative_to(args.output_dir)), key)
+        if cache.get(keys[avatar_file][0]) == key and output_path.exists():
+            continue
+        tasks.append((avatar_file, output_path, args.max_side))
+
+    skipped = len(avatar_files) - len(tasks)
+    print(f"⏭️  Unchanged: {skipped}")
+    print(f"\nProcessing {len(tasks)}...")
+
+    success_count = 0
+    worker_seconds = 0.0
+    megapixels = 0.0
+    started = time.perf_counter()
+
+    if tasks:
+        workers = max(1, min(args.workers, len(tasks)))
+        threads = max(1, cpu_count() // workers)
+        print(f"🧵 {workers} workers × {threads} inference threads, model {args.model}")
+        try:
+            with Pool(
+                workers,
+                initializer=_init_worker,
+                initargs=(args.model, threads),
+                maxtasksperchild=TASKS_PER_WORKER,
+            ) as pool:
+                # chunksize=1 keeps at most one image per worker in memory
+                for input_path, ok, error, seconds, pixels in pool.imap_unordered(remove_background, tasks, chunksize=1):
+                    worker_seconds += seconds
+                    if ok:
+                        success_count += 1
+                        megapixels += pixels / 1e6
+                        name, key = keys[input_path]
+                        cache[name] = key
+                        print(f"✅ Processed: {Path(name).name} ({seconds:.2f}s)")
+                    else:
+                        print(f"❌ Error processing {input_path.name}: {error}")
+        finally:
+            save_cache(args.output_dir, cache)
+
+    elapsed = time.perf_counter() - started
+    print(f"\n✅ Successfully processed {success_count}/{len(tasks)} avatars ({skipped} unchanged)")
+    if success_count:
+        print(
+            f"⏱️  {elapsed:.1f}s wall, {success_count / elapsed:.2f} images/s, "
+            f"{megapixels / elapsed:.2f} MP/s, {worker_seconds / len(tasks):.2f}s per image in workers"
+        )
+    print(f"📁 Output directory: {args.output_dir}")
+
+    failures = 0
+    if not args.skip_derivatives:
+        failures = generate_derivatives(args.output_dir, args.workers, sorted(args.sizes), force=args.force)
+
+    if success_count < len(tasks) or failures:
+        sys.exit(1)
 
 if __name__ == '__main__':
-    # Check if rembg is installed
-    try:
-        import rembg
-    except ImportError:
-        print("❌ rembg library not found!")
-        print("📦 Install with: pip install rembg")
-        exit(1)
-    
     main()
@@ -3,25 +3,43 @@
 God Mode Engine - Game Registry Seeder
 Parses the 100 Game Titles and inserts into Supabase game_registry table.
 
+Only rows that differ from the live registry are written: the seeder reads
+game_registry once, diffs it field by field against parse_games(), and
+upserts the changed rows in multi-row chunks. Unchanged rows are not
+touched, so their updated_at (and any registry cache keyed on it) stays put.
+
 Usage:
-    python scripts/seed_games.py           # Run the seeder
+    python scripts/seed_games.py           # Upsert changed games
     python scripts/seed_games.py --dry-run # Preview without inserting
+    python scripts/seed_games.py --diff    # Show field-level diff vs the live registry
+    python scripts/seed_games.py --diff-sql out.sql  # Write the diff as one SQL upsert
     python scripts/seed_games.py --stats   # Show engine distribution stats
 """
 
 import os
 import re
+import sys
 import json
 import argparse
+from pathlib import Path
 from typing import Optional
 
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
 # Supabase import is optional (only needed for actual insertion)
 try:
-    from supabase import create_client
+    from src.engine.db_transport import create_db_client
     SUPABASE_AVAILABLE = True
 except ImportError:
     SUPABASE_AVAILABLE = False
-    create_client = None
+    create_db_client = None
+
+# Columns the seeder owns; everything else in game_registry is left alone
+SEED_FIELDS = ("title", "slug", "engine_type", "category", "config", "description", "is_active", "is_premium")
+
+# Rows per multi-row upsert request
+UPSERT_CHUNK_SIZE = 500
 
 # ============================================================================
 # RAW GAME DATA
@@ -305,33 +323,89 @@ def get_supabase_client():
             "Missing Supabase credentials. Set SUPABASE_URL and SUPABASE_KEY environment variables."
         )
     
-    return create_client(url, key)
+    # Pooled keep-alive transport; limits come from DB_* environment variables
+    client, _ = create_db_client(url, key)
+    return client
+
+
+def fetch_registry(client) -> dict[str, dict]:
+    """Current seeder-owned columns of every game_registry row, by slug (one query)."""
+    result = client.table("game_registry").select(", ".join(SEED_FIELDS)).execute()
+    return {row["slug"]: row for row in result.data or []}
+
+
+def diff_games(games: list[dict], current: dict[str, dict]) -> list[tuple[dict, dict]]:
+    """
+    Field-level diff of parsed games against the live registry.
+
+    Returns:
+        [(game, {field: (old, new)})] for new or changed games only; new
+        games list every field with old=None
+    """
+    changes = []
+    for game in games:
+        row = current.get(game["slug"])
+        fields = {
+            field: (row.get(field) if row else None, game[field])
+            for field in SEED_FIELDS
+            if row is None or row.get(field) != game[field]
+        }
+        if fields:
+            changes.append((game, fields))
+    return changes
+
+
+def print_diff(changes: list[tuple[dict, dict]], current: dict[str, dict]):
+    """Print one line per new game and one per changed field."""
+    for game, fields in changes:
+        if game["slug"] not in current:
+            print(f"  + [{game['engine_type']:8}] {game['title']}")
+            continue
+        print(f"  ~ [{game['engine_type']:8}] {game['title']}")
+        for field, (old, new) in fields.items():
+            if field == "config":
+                keys = sorted(k for k in set(old or {}) | set(new) if (old or {}).get(k) != new.get(k))
+                print(f"        config: {', '.join(keys)}")
+            else:
+                print(f"        {field}: {old!r} → {new!r}")
 
 
 def upsert_games(games: list[dict], dry_run: bool = False) -> dict:
-    """Upsert games into game_registry table."""
+    """Upsert new or changed games into game_registry in multi-row chunks."""
     if dry_run:
         print("\n🔍 DRY RUN - No data will be inserted\n")
         for i, game in enumerate(games, 1):
             print(f"{i:3}. [{game['engine_type']:8}] {game['title']}")
-        return {"inserted": 0, "total": len(games)}
+        return {"inserted": 0, "updated": 0, "unchanged": 0, "failed": 0, "total": len(games)}
     
     client = get_supabase_client()
+    current = fetch_registry(client)
+    changes = diff_games(games, current)
+    print_diff(changes, current)
     
-    # Upsert each game (on conflict, update)
-    inserted = 0
-    for game in games:
+    inserted = updated = failed = 0
+    for start in range(0, len(changes), UPSERT_CHUNK_SIZE):
+        chunk = changes[start:start + UPSERT_CHUNK_SIZE]
         try:
-            result = client.table("game_registry").upsert(
-                game,
+            client.table("game_registry").upsert(
+                [game for game, _ in chunk],
                 on_conflict="slug"
             ).execute()
-            inserted += 1
-            print(f"✅ {game['title']}")
         except Exception as e:
-            print(f"❌ {game['title']}: {e}")
+            failed += len(chunk)
+            print(f"❌ Upsert of {len(chunk)} games failed: {e}")
+            continue
+        new = sum(1 for game, _ in chunk if game["slug"] not in current)
+        inserted += new
+        updated += len(chunk) - new
     
-    return {"inserted": inserted, "total": len(games)}
+    return {
+        "inserted": inserted,
+        "updated": updated,
+        "unchanged": len(games) - len(changes),
+        "failed": failed,
+        "total": len(games),
+    }
 
 
 def show_stats(games: list[dict]):
@@ -369,6 +443,8 @@ def main():
     parser.add_argument("--dry-run", action="store_true", help="Preview without inserting")
     parser.add_argument("--stats", action="store_true", help="Show engine distribution stats")
     parser.add_argument("--output", type=str, help="Output SQL file instead of inserting")
+    parser.add_argument("--diff", action="store_true", help="Show the diff against the live registry without writing")
+    parser.add_argument("--diff-sql", type=str, help="Write only the changed games as one SQL upsert")
     args = parser.parse_args()
     
     print("\n🎮 GOD MODE ENGINE - Game Seeder")
@@ -388,11 +464,26 @@ def main():
         generate_sql(games, args.output)
         return
     
+    # Diff against the live registry
+    if args.diff or args.diff_sql:
+        current = fetch_registry(get_supabase_client())
+        changes = diff_games(games, current)
+        print_diff(changes, current)
+        print(f"\n{len(changes)} of {len(games)} games differ from the registry")
+        if args.diff_sql:
+            generate_diff_sql([game for game, _ in changes], args.diff_sql)
+        return
+    
     # Upsert to database
     result = upsert_games(games, dry_run=args.dry_run)
     
     print("\n" + "=" * 50)
-    print(f"✅ Inserted {result['inserted']}/{result['total']} games")
+    print(
+        f"✅ Inserted {result['inserted']}, updated {result['updated']}, "
+        f"unchanged {result['unchanged']}/{result['total']} games"
+    )
+    if result["failed"]:
+        print(f"❌ Failed {result['failed']} games")
     show_stats(games)
 
 
@@ -447,5 +538,42 @@ def generate_sql(games: list[dict], output_path: str):
     print(f"   PIO={stats['PIO']}, CHART={stats['CHART']}, SCENARIO={stats['SCENARIO']}")
 
 
+def _sql_literal(value) -> str:
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, dict):
+        return "'" + json.dumps(value).replace("'", "''") + "'::jsonb"
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def generate_diff_sql(games: list[dict], output_path: str):
+    """Write the changed games as a single multi-row upsert statement."""
+    lines = [
+        "-- ════════════════════════════════════════════════════════════════════════════",
+        "-- GOD MODE ENGINE — Game Registry Diff",
+        "-- Auto-generated by seed_games.py --diff-sql",
+        f"-- {len(games)} new or changed games",
+        "-- ════════════════════════════════════════════════════════════════════════════",
+        "",
+    ]
+    if games:
+        lines.append(f"INSERT INTO game_registry ({', '.join(SEED_FIELDS)})")
+        lines.append("VALUES")
+        lines.append(",\n".join(
+            "    (" + ", ".join(_sql_literal(game[field]) for field in SEED_FIELDS) + ")"
+            for game in games
+        ))
+        lines.append("ON CONFLICT (slug) DO UPDATE SET")
+        lines.extend(f"    {field} = EXCLUDED.{field}," for field in SEED_FIELDS if field != "slug")
+        lines.append("    updated_at = NOW();")
+    else:
+        lines.append("-- Registry is up to date")
+    
+    with open(output_path, 'w') as f:
+        f.write("\n".join(lines) + "\n")
+    
+    print(f"📄 Generated diff SQL file: {output_path}")
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,498 @@
+#!/usr/bin/env python3
+"""
+Tournament Event Store
+Loads every tournament schedule in data/ into one normalized, indexed
+in-memory store, so schedule queries never re-parse the source files.
+
+Sources (each with its own shape, see TOUR_LABELS):
+    data/*-events.json          — tour stops / series with nested events
+    data/poker-tour-events-2026.csv — flat WSOP / WPT / WSOPC export
+
+Tour schedules load first, then the regional aggregate, then the CSV; a
+later record describing an event already loaded (series, event number or
+name, start date, flight) is dropped. Recurring daily events without a
+date span their whole series.
+
+Indexes:
+    date      — events sorted by start day; an overlap query bisects to the
+                window that can still be running (spans up to
+                SHORT_SPAN_DAYS) and checks the few longer events directly
+    series / tour / venue / state — dict of normalized name → event ids
+    buy-in    — sorted (buy_in, id) pairs, range lookups by bisection
+
+Usage:
+    python scripts/tournament_events.py --from 2026-02-20 --to 2026-02-22 --max-buy-in 600 --state NV
+    python scripts/tournament_events.py --weekend --state NV --max-buy-in 600
+    python scripts/tournament_events.py --stats
+    python scripts/tournament_events.py --benchmark
+"""
+
+import re
+import sys
+import csv
+import json
+import time
+import argparse
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = PROJECT_ROOT / "data"
+
+# ============================================================================
+# SOURCES
+# ============================================================================
+
+# Tour label per JSON schedule (file stem without "-2026-events")
+TOUR_LABELS = {
+    "wsop": "WSOP",
+    "wsop-circuit": "WSOPC",
+    "wsopc": "WSOPC",
+    "wpt": "WPT",
+    "mspt": "MSPT",
+    "rgps": "RGPS",
+    "venetian": "Venetian",
+    "regional-series": "Regional",
+}
+
+# Location fields some files only imply (the Venetian file names its venue only)
+SOURCE_DEFAULTS = {
+    "venetian": {"city": "Las Vegas", "state": "NV"},
+}
+
+# Aggregates repeating stops that tour files also list; loaded after them
+# so events keep their tour's label
+AGGREGATE_SOURCES = ("regional-series",)
+
+EVENTS_CSV = "poker-tour-events-2026.csv"
+
+# Events running at most this many days sit in the bisected date index;
+# longer ones (recurring dailies, festival-long satellites) are scanned
+SHORT_SPAN_DAYS = 14
+
+
+def normalize(name: Optional[str]) -> str:
+    """Index key for series / venue / tour names: lowercase alphanumerics."""
+    return re.sub(r"[^a-z0-9]+", " ", (name or "").lower()).strip()
+
+
+# ============================================================================
+# EVENT RECORD
+# ============================================================================
+
+class TournamentEvent:
+    """One scheduled event (or flight). Dates are proleptic ordinals."""
+
+    __slots__ = (
+        "uid", "tour", "series", "event_number", "name", "event_type",
+        "game_type", "buy_in", "fee", "guaranteed", "start", "end",
+        "start_time", "flight", "venue", "city", "state", "recurring",
+    )
+
+    def __init__(self, **fields):
+        for slot in self.__slots__:
+            value = fields.get(slot)
+            setattr(self, slot, sys.intern(value) if isinstance(value, str) else value)
+
+    @property
+    def start_date(self) -> date:
+        return date.fromordinal(self.start)
+
+    @property
+    def end_date(self) -> date:
+        return date.fromordinal(self.end)
+
+    def to_dict(self) -> dict:
+        record = {slot: getattr(self, slot) for slot in self.__slots__}
+        record["start"] = self.start_date.isoformat()
+        record["end"] = self.end_date.isoformat()
+        return record
+
+    def __repr__(self) -> str:
+        return f"<TournamentEvent {self.start_date} {self.series} #{self.event_number} {self.name}>"
+
+
+# ============================================================================
+# LOADERS
+# ============================================================================
+
+def _ordinal(value: str) -> int:
+    return date.fromisoformat(value).toordinal()
+
+
+def _event(tour: str, series: dict, raw: dict, source: str) -> Optional[TournamentEvent]:
+    """Normalize one nested JSON event under its series / stop."""
+    if raw.get("start_date"):
+        start = _ordinal(raw["start_date"])
+        end = start + max(1, int(raw.get("days") or 1)) - 1
+    elif raw.get("recurring") and series.get("start_date"):
+        start = _ordinal(series["start_date"])
+        end = _ordinal(series.get("end_date") or series["start_date"])
+    else:
+        return None
+
+    series_name = series.get("name") or series.get("series")
+    return TournamentEvent(
+        uid=f"{source}:{series.get('series_uid') or series.get('stop_uid') or normalize(series_name)}"
+            f":{raw.get('event_number', raw.get('event_name'))}:{raw.get('flight') or ''}",
+        tour=tour,
+        series=series_name,
+        event_number=raw.get("event_number"),
+        name=raw.get("event_name"),
+        event_type=raw.get("event_type"),
+        game_type=raw.get("game_type"),
+        buy_in=int(raw.get("buy_in") or 0),
+        fee=raw.get("fee"),
+        guaranteed=raw.get("guaranteed"),
+        start=start,
+        end=max(start, end),
+        start_time=raw.get("start_time"),
+        flight=raw.get("flight"),
+        venue=series.get("venue"),
+        city=series.get("city"),
+        state=series.get("state"),
+        recurring=raw.get("recurring"),
+    )
+
+
+def _source_name(path: Path) -> str:
+    return path.name.replace("-2026-events.json", "").replace("-events.json", "")
+
+
+def load_json_events(path: Path) -> Iterator[TournamentEvent]:
+    """Events from one data/*-events.json schedule, whatever its layout."""
+    with open(path) as f:
+        data = json.load(f)
+    source = _source_name(path)
+    metadata = data.get("metadata", {})
+    tour = TOUR_LABELS.get(source, source.upper())
+
+    # Location/series fields at file level are inherited by every series
+    inherited = {k: metadata[k] for k in ("venue", "city", "state") if metadata.get(k)}
+    inherited.update({k: v for k, v in SOURCE_DEFAULTS.get(source, {}).items() if k not in inherited})
+
+    groups = list(data.get("stops") or []) + list(data.get("series") or [])
+    if "events" in data or "daily_events" in data:
+        # Single-series file (WSOP): the metadata describes the series
+        groups.append({
+            "name": metadata.get("series"),
+            "start_date": metadata.get("start_date"),
+            "end_date": metadata.get("end_date"),
+            "events": list(data.get("events", [])) + list(data.get("daily_events", [])),
+        })
+
+    for group in groups:
+        series = {**inherited, **{k: v for k, v in group.items() if k != "events" and v}}
+        for raw in group.get("events", []):
+            event = _event(tour, series, raw, source)
+            if event is not None:
+                yield event
+
+
+def load_csv_events(path: Path) -> Iterator[TournamentEvent]:
+    """Events from the flat poker-tour-events CSV export."""
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            if not row.get("Start Date"):
+                continue
+            start = _ordinal(row["Start Date"])
+            number = row.get("Event Number") or None
+            yield TournamentEvent(
+                uid=f"csv:{normalize(row['Series Name'])}:{number}:{row.get('Flight') or ''}",
+                tour=row.get("Tour"),
+                series=row.get("Series Name"),
+                event_number=int(number) if number and number.isdigit() else number,
+                name=row.get("Event Name"),
+                event_type=row.get("Event Type") or None,
+                game_type=row.get("Game Type") or None,
+                buy_in=int(float(row.get("Buy-In") or 0)),
+                fee=int(float(row["Fee"])) if row.get("Fee") else None,
+                guaranteed=int(float(row["Guaranteed"])) if row.get("Guaranteed") else None,
+                start=start,
+                end=start,
+                start_time=row.get("Start Time") or None,
+                flight=row.get("Flight") or None,
+                venue=row.get("Venue") or None,
+                city=row.get("City") or None,
+                state=row.get("State") or None,
+                recurring=None,
+            )
+
+
+# ============================================================================
+# STORE
+# ============================================================================
+
+class TournamentEventStore:
+    """
+    Indexed, read-only collection of tournament events.
+
+    Usage:
+        store = TournamentEventStore.load()
+        events = store.query(start=date(2026, 2, 20), end=date(2026, 2, 22),
+                             max_buy_in=600, state="NV")
+    """
+
+    def __init__(self, events: Iterable[TournamentEvent]):
+        self.events: list[TournamentEvent] = []
+        self.duplicates = 0
+        seen = set()
+        for event in events:
+            # Sources number events independently, so a shared number alone
+            # doesn't make a duplicate: buy-in and name must agree too
+            key = (
+                normalize(event.series), str(event.event_number), event.start,
+                event.flight or "", event.buy_in, normalize(event.name),
+            )
+            if key in seen:
+                self.duplicates += 1
+                continue
+            seen.add(key)
+            self.events.append(event)
+        self._build_indexes()
+
+    @classmethod
+    def load(cls, data_dir: Path = DATA_DIR) -> "TournamentEventStore":
+        """Read every *-events.json schedule, then the CSV export."""
+        paths = sorted(
+            data_dir.glob("*-events.json"),
+            key=lambda p: (_source_name(p) in AGGREGATE_SOURCES, p.name)
+        )
+
+        def events():
+            for path in paths:
+                yield from load_json_events(path)
+            if (data_dir / EVENTS_CSV).exists():
+                yield from load_csv_events(data_dir / EVENTS_CSV)
+        return cls(events())
+
+    def _build_indexes(self):
+        events = self.events
+
+        # Date: short events sorted by start (ids parallel to starts); long ones apart
+        short = sorted(
+            (e.start, i) for i, e in enumerate(events) if e.end - e.start < SHORT_SPAN_DAYS
+        )
+        self._starts = [start for start, _ in short]
+        self._start_ids = [i for _, i in short]
+        self._long_ids = [i for i, e in enumerate(events) if e.end - e.start >= SHORT_SPAN_DAYS]
+
+        # Exact-match indexes
+        self._by_series: dict[str, list[int]] = {}
+        self._by_tour: dict[str, list[int]] = {}
+        self._by_venue: dict[str, list[int]] = {}
+        self._by_state: dict[str, list[int]] = {}
+        for i, e in enumerate(events):
+            self._by_series.setdefault(normalize(e.series), []).append(i)
+            self._by_tour.setdefault(normalize(e.tour), []).append(i)
+            self._by_venue.setdefault(normalize(e.venue), []).append(i)
+            self._by_state.setdefault((e.state or "").upper(), []).append(i)
+
+        # Buy-in: sorted for range bisection
+        by_buy_in = sorted((e.buy_in, i) for i, e in enumerate(events))
+        self._buy_ins = [b for b, _ in by_buy_in]
+        self._buy_in_ids = [i for _, i in by_buy_in]
+
+    # ------------------------------------------------------------------
+    # Index lookups (each returns event ids)
+    # ------------------------------------------------------------------
+
+    def ids_between(self, start: date, end: date) -> list[int]:
+        """Events running on any day of [start, end]."""
+        first, last = start.toordinal(), end.toordinal()
+        lo = bisect_left(self._starts, first - SHORT_SPAN_DAYS + 1)
+        hi = bisect_right(self._starts, last)
+        events = self.events
+        ids = [i for i in self._start_ids[lo:hi] if events[i].end >= first]
+        ids.extend(i for i in self._long_ids if events[i].start <= last and events[i].end >= first)
+        return ids
+
+    def ids_by_buy_in(self, low: Optional[int] = None, high: Optional[int] = None) -> list[int]:
+        """Events with low <= buy_in <= high (either bound optional)."""
+        lo = 0 if low is None else bisect_left(self._buy_ins, low)
+        hi = len(self._buy_ins) if high is None else bisect_right(self._buy_ins, high)
+        return self._buy_in_ids[lo:hi]
+
+    def ids_by_series(self, series: str) -> list[int]:
+        return self._by_series.get(normalize(series), [])
+
+    def ids_by_tour(self, tour: str) -> list[int]:
+        return self._by_tour.get(normalize(tour), [])
+
+    def ids_by_venue(self, venue: str) -> list[int]:
+        return self._by_venue.get(normalize(venue), [])
+
+    def ids_by_state(self, state: str) -> list[int]:
+        return self._by_state.get(state.upper(), [])
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def query(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        min_buy_in: Optional[int] = None,
+        max_buy_in: Optional[int] = None,
+        series: Optional[str] = None,
+        tour: Optional[str] = None,
+        venue: Optional[str] = None,
+        state: Optional[str] = None,
+        game_type: Optional[str] = None,
+    ) -> list[TournamentEvent]:
+        """
+        Events matching every given filter, ordered by start day and time.
+
+        Each filter resolves through its index; the id lists are intersected
+        smallest first. game_type has no index and is checked per result.
+        """
+        candidates = []
+        if start is not None or end is not None:
+            candidates.append(self.ids_between(start or date.min, end or start))
+        if min_buy_in is not None or max_buy_in is not None:
+            candidates.append(self.ids_by_buy_in(min_buy_in, max_buy_in))
+        if series:
+            candidates.append(self.ids_by_series(series))
+        if tour:
+            candidates.append(self.ids_by_tour(tour))
+        if venue:
+            candidates.append(self.ids_by_venue(venue))
+        if state:
+            candidates.append(self.ids_by_state(state))
+
+        if candidates:
+            candidates.sort(key=len)
+            ids = set(candidates[0])
+            for other in candidates[1:]:
+                if not ids:
+                    break
+                ids.intersection_update(other)
+        else:
+            ids = range(len(self.events))
+
+        events = [self.events[i] for i in ids]
+        if game_type:
+            events = [e for e in events if (e.game_type or "").upper() == game_type.upper()]
+        events.sort(key=lambda e: (e.start, _minutes(e.start_time), e.series or "", str(e.event_number)))
+        return events
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+
+def _minutes(start_time: Optional[str]) -> int:
+    """'11:00 AM' → minutes after midnight (unknown times sort last)."""
+    match = re.match(r"(\d{1,2}):(\d{2})\s*([AP]M)", start_time or "", re.I)
+    if not match:
+        return 24 * 60
+    hour, minute, half = int(match.group(1)) % 12, int(match.group(2)), match.group(3).upper()
+    return (hour + (12 if half == "PM" else 0)) * 60 + minute
+
+
+def weekend_of(day: date) -> tuple[date, date]:
+    """Friday–Sunday of the weekend containing (or following) day."""
+    if day.weekday() == 6:
+        return day - timedelta(days=2), day
+    friday = day + timedelta(days=(4 - day.weekday()) % 7)
+    if day.weekday() == 5:
+        friday = day - timedelta(days=1)
+    return friday, friday + timedelta(days=2)
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def show_stats(store: TournamentEventStore):
+    print(f"📋 {len(store)} events ({store.duplicates} duplicate rows dropped)")
+    print(f"   {len(store._by_series)} series, {len(store._by_venue)} venues, "
+          f"{len(store._by_state)} states, {len(store._long_ids)} events spanning ≥{SHORT_SPAN_DAYS} days")
+    tours = {}
+    for e in store.events:
+        tours[e.tour] = tours.get(e.tour, 0) + 1
+    for tour, count in sorted(tours.items(), key=lambda x: -x[1]):
+        print(f"   {tour:12} {count:4}")
+
+
+def benchmark(store: TournamentEventStore, rounds: int = 200):
+    """Time "weekend, ≤ $600, in NV" for every weekend the schedules cover."""
+    first = date.fromordinal(min(e.start for e in store.events))
+    last = date.fromordinal(max(e.end for e in store.events))
+    weekends = []
+    friday, _ = weekend_of(first)
+    while friday <= last:
+        weekends.append((friday, friday + timedelta(days=2)))
+        friday += timedelta(days=7)
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        matched = sum(
+            len(store.query(start=fri, end=sun, max_buy_in=600, state="NV")) for fri, sun in weekends
+        )
+    elapsed = time.perf_counter() - started
+    print(f"⏱️  {len(weekends)} weekends × (≤$600, NV): {matched} matches, "
+          f"{elapsed / rounds / len(weekends) * 1e6:.1f} µs per query")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the unified tournament event store")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    parser.add_argument("--from", dest="start", type=date.fromisoformat, help="First day (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="end", type=date.fromisoformat, help="Last day (YYYY-MM-DD)")
+    parser.add_argument("--weekend", action="store_true", help="This coming weekend (or --from's weekend)")
+    parser.add_argument("--min-buy-in", type=int)
+    parser.add_argument("--max-buy-in", type=int)
+    parser.add_argument("--series")
+    parser.add_argument("--tour")
+    parser.add_argument("--venue")
+    parser.add_argument("--state")
+    parser.add_argument("--game-type")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--stats", action="store_true", help="Show store statistics")
+    parser.add_argument("--benchmark", action="store_true", help="Time a typical query")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    store = TournamentEventStore.load(args.data_dir)
+    load_ms = (time.perf_counter() - started) * 1000
+
+    if args.stats or args.benchmark:
+        print(f"🗂️  Loaded in {load_ms:.1f} ms")
+        if args.stats:
+            show_stats(store)
+        if args.benchmark:
+            benchmark(store)
+        return
+
+    start, end = args.start, args.end
+    if args.weekend:
+        start, end = weekend_of(start or date.today())
+
+    events = store.query(
+        start=start,
+        end=end,
+        min_buy_in=args.min_buy_in,
+        max_buy_in=args.max_buy_in,
+        series=args.series,
+        tour=args.tour,
+        venue=args.venue,
+        state=args.state,
+        game_type=args.game_type,
+    )
+
+    if args.json:
+        print(json.dumps([e.to_dict() for e in events], indent=2))
+        return
+
+    for e in events:
+        span = f"{e.start_date}" if e.start == e.end else f"{e.start_date}→{e.end_date}"
+        print(f"{span:23} {e.start_time or '':8} ${e.buy_in:<6} [{e.tour}] {e.series} — {e.name} "
+              f"({e.venue}, {e.state})")
+    print(f"\n{len(events)} events")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,24 +7,38 @@ Endpoints:
 - POST /api/session/start  — Initialize new training session
 - POST /api/hand/next      — Fetch next hand with director narrative
 - POST /api/hand/action    — Submit user action and get villain response
+- WS   /ws/session/{id}    — Same next/action loop over one connection
+- GET  /api/metrics        — Per-worker DB pool / cache metrics
+- GET  /api/stats/{user}    — Accuracy rollups by game / level / spot attribute
+- GET  /api/games, /api/games/{slug}, /api/leaderboard/{slug}
+                           — Cached, precompressed bodies with ETag / 304
 
 Run:
-    uvicorn server:app --reload --port 8000
+    uvicorn server:app --reload --port 8000            # Dev, single process
+    REDIS_URL=redis://... python server.py --workers 8  # Fork-after-load workers
 
 Author: Smarter.Poker Engineering
 """
 
+import gc
 import os
+import json
 import uuid
+import signal
+import socket
 import asyncio
-from typing import Optional, Dict, Any, List
+import argparse
+import traceback
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Any, AsyncIterator, List
 from datetime import datetime
 
 import uvicorn
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
-from supabase import create_client, Client
+from supabase import Client
 
 # Import our GameEngine
 from src.engine.engine_core import (
@@ -35,8 +49,21 @@ from src.engine.engine_core import (
     ScenarioInstruction,
     VillainAction,
     HPResult,
+    build_narrative_summary,
     format_hand_for_display,
 )
+from src.engine.circuit_breaker import CircuitOpenError
+from src.engine.db_transport import create_db_client
+from src.engine.history_buffer import HistoryWriteBuffer
+from src.engine.http_cache import BodyCache, CachedBody, negotiate
+from src.engine.review_queue import ReviewScheduler, create_review_store
+from src.engine.rng import MAX_SEED, SessionRNG
+from src.engine.rollups import AccuracyRollups, ROLLUP_TABLE, merge_rollups
+from src.engine.session_journal import JOURNAL_DIR
+from src.engine.session_state import SessionState
+from src.engine.session_store import SessionConflict, create_session_store
+from src.engine.single_flight import query_key
+from src.engine.snapshot import load_snapshot
 
 
 # ============================================================================
@@ -49,6 +76,14 @@ SUPABASE_KEY = os.environ.get("SUPABASE_KEY") or os.environ.get("SUPABASE_SERVIC
 if not SUPABASE_URL or not SUPABASE_KEY:
     raise ValueError("Missing SUPABASE_URL or SUPABASE_KEY environment variables")
 
+# Short-lived sharing of /api/games/{slug} lookups
+GAME_DETAIL_TTL_SECONDS = 10.0
+
+# How long read-mostly bodies are served without touching the DB; also the
+# max-age clients and CDNs may reuse them for
+REGISTRY_BODY_TTL_SECONDS = 60
+LEADERBOARD_BODY_TTL_SECONDS = 15
+
 
 # ============================================================================
 # FASTAPI SETUP
@@ -80,11 +115,77 @@ app.add_middleware(
 # GLOBAL INSTANCES
 # ============================================================================
 
-# Supabase client
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+# Supabase client on the pooled, concurrency-governed transport
+supabase: Client
+supabase, db_governor = create_db_client(SUPABASE_URL, SUPABASE_KEY)
+
+# GameEngine instance, booted from the prebuilt snapshot when present
+# (scripts/build_snapshot.py) and reconciled with the DB after startup
+engine = GameEngine(supabase, snapshot=load_snapshot())
+
+# Per-worker batched hand-history writes
+history_buffer = HistoryWriteBuffer(supabase, breaker=engine.breaker)
+engine.history_buffer = history_buffer
+
+# Per-worker accuracy rollup deltas, batch-flushed to god_mode_accuracy_rollup
+rollups = AccuracyRollups(supabase, breaker=engine.breaker)
+
+# Encoded /api/games and /api/leaderboard bodies (ETag + gzip/brotli copies)
+response_bodies = BodyCache()
+
+_background_tasks: List[asyncio.Task] = []
+
+
+def init_worker():
+    """
+    Give a freshly forked worker its own Supabase client.
+    
+    HTTP connection pools must not be shared across processes; everything
+    read-only (charts, equity matrix, registry cache) stays shared.
+    """
+    global supabase, db_governor
+    supabase, db_governor = create_db_client(SUPABASE_URL, SUPABASE_KEY)
+    engine.supabase = supabase
+    history_buffer.supabase = supabase
+    rollups.supabase = supabase
+
+
+@app.on_event("startup")
+async def start_background_workers():
+    """Keep the SCENARIO rigged-deal pools topped up, flush history and probe the DB."""
+    engine.deal_pool.start_refill_worker()
+    _background_tasks.append(asyncio.create_task(history_buffer.run()))
+    _background_tasks.append(asyncio.create_task(rollups.run()))
+    _background_tasks.append(asyncio.create_task(engine.breaker.run_probe(_probe_database)))
+    _background_tasks.append(asyncio.create_task(sessions.run_checkpoints()))
+    _background_tasks.append(asyncio.create_task(engine.reviews.store.run_checkpoints()))
+    if engine.snapshot is not None:
+        _background_tasks.append(asyncio.create_task(_reconcile_snapshot()))
+
+
+async def _reconcile_snapshot():
+    try:
+        changed = await engine.reconcile_registry()
+        print(f"🔄 Registry reconciled with database ({changed} games changed since snapshot)")
+    except Exception as e:
+        # Keep serving from the snapshot
+        print(f"Registry reconcile failed: {e}")
 
-# GameEngine instance
-engine = GameEngine(supabase)
+
+def _probe_database():
+    """Cheapest registry read; closes the circuit breaker once it succeeds."""
+    supabase.table("game_registry").select("id").limit(1).execute()
+
+
+@app.on_event("shutdown")
+async def stop_background_workers():
+    engine.deal_pool.stop_refill_worker()
+    for task in _background_tasks:
+        task.cancel()
+    await asyncio.to_thread(history_buffer.flush)
+    await asyncio.to_thread(rollups.flush)
+    sessions.checkpoint()
+    engine.reviews.store.checkpoint()
 
 
 # ============================================================================
@@ -95,6 +196,7 @@ class StartSessionRequest(BaseModel):
     """Request to start a new training session."""
     user_id: str = Field(..., description="UUID of the user")
     game_id: str = Field(..., description="Game slug or UUID from game_registry")
+    seed: Optional[int] = Field(None, ge=0, le=MAX_SEED, description="RNG seed to replay a previous session")
 
 
 class StartSessionResponse(BaseModel):
@@ -106,6 +208,7 @@ class StartSessionResponse(BaseModel):
     current_level: int
     current_hp: int
     hands_per_round: int
+    rng_seed: int  # Pass back as `seed` to replay this session's deals (not SCENARIO rigged deals, see deal_pool)
 
 
 class NextHandRequest(BaseModel):
@@ -125,6 +228,7 @@ class NextHandResponse(BaseModel):
     current_level: int
     hands_played: int
     hands_remaining: int
+    is_review: bool = False  # Spaced-repetition replay of a missed spot
 
 
 class ActionRequest(BaseModel):
@@ -153,17 +257,38 @@ class ActionResponse(BaseModel):
 
 
 # ============================================================================
-# SESSION STORAGE (In-Memory for dev, use Redis/DB in production)
+# SESSION STORAGE (In-process dict for dev; Redis when REDIS_URL is set)
 # ============================================================================
 
-sessions: Dict[str, Dict[str, Any]] = {}
+# The in-process store is journaled to disk (snapshot + append-only log) so
+# a restart keeps live sessions; set SESSION_JOURNAL_DIR="" to disable
+SESSION_JOURNAL_DIR = os.environ.get("SESSION_JOURNAL_DIR", str(JOURNAL_DIR)) or None
+sessions = create_session_store(os.environ.get("REDIS_URL"), journal_dir=SESSION_JOURNAL_DIR)
 
+# Spaced-repetition queues follow the sessions: shared through Redis, or
+# in-process and saved next to the session journal
+engine.reviews = ReviewScheduler(create_review_store(
+    os.environ.get("REDIS_URL"),
+    path=os.path.join(SESSION_JOURNAL_DIR, "reviews.pkl") if SESSION_JOURNAL_DIR else None,
+))
 
-def get_session(session_id: str) -> Dict[str, Any]:
-    """Get session by ID or raise 404."""
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
-    return sessions[session_id]
+
+@asynccontextmanager
+async def session_transaction(session_id: str) -> AsyncIterator[SessionState]:
+    """
+    Yield the session for read-modify-write; it is saved on exit.
+
+    Raises:
+        HTTPException: 404 if the session doesn't exist, 409 if another
+            request updated it concurrently (the client should retry)
+    """
+    try:
+        async with sessions.transaction(session_id) as session:
+            if session is None:
+                raise HTTPException(status_code=404, detail="Session not found")
+            yield session
+    except SessionConflict:
+        raise HTTPException(status_code=409, detail="Session was updated concurrently, retry")
 
 
 # ============================================================================
@@ -176,10 +301,14 @@ async def start_session(request: StartSessionRequest):
     Start a new training session.
     
     - Resets user's level to 1 and health to 100
-    - Creates a new session ID
+    - Creates a new session ID and its seeded RNG stream
     - Returns session configuration
     """
-    user_id = request.user_id
+    # Every DB write keyed on the user (session, history, rollups) casts to UUID
+    try:
+        user_id = str(uuid.UUID(request.user_id))
+    except ValueError:
+        raise HTTPException(status_code=422, detail="user_id must be a UUID")
     game_id = request.game_id
     
     # Get game config from registry
@@ -200,31 +329,25 @@ async def start_session(request: StartSessionRequest):
     }
     
     # Upsert to god_mode_user_session
-    result = supabase.table("god_mode_user_session").upsert(
-        session_data,
-        on_conflict="user_id,game_id"
-    ).execute()
+    await asyncio.to_thread(
+        supabase.table("god_mode_user_session").upsert(
+            session_data,
+            on_conflict="user_id,game_id"
+        ).execute
+    )
     
     # Generate session ID
     session_id = str(uuid.uuid4())
     
-    # Store in memory
+    # Store in the session store
     config = game.get("config", {})
-    sessions[session_id] = {
-        "user_id": user_id,
-        "game_id": game["id"],
-        "game_slug": game["slug"],
-        "game_name": game["title"],
-        "engine_type": game["engine_type"],
-        "current_level": 1,
-        "current_hp": 100,
-        "hands_played": 0,
-        "correct_answers": 0,
-        "hands_per_round": config.get("hands_per_round", 20),
-        "current_hand": None,
-        "current_hand_id": None,
-        "current_solver_node": None,
-    }
+    rng = SessionRNG(request.seed)
+    await sessions.save(session_id, SessionState(
+        user_id,
+        game,
+        hands_per_round=config.get("hands_per_round", 20),
+        rng=rng,
+    ))
     
     return StartSessionResponse(
         session_id=session_id,
@@ -234,6 +357,7 @@ async def start_session(request: StartSessionRequest):
         current_level=1,
         current_hp=100,
         hands_per_round=config.get("hands_per_round", 20),
+        rng_seed=rng.seed,
     )
 
 
@@ -250,56 +374,96 @@ async def get_next_hand(request: NextHandRequest):
     - Handles level completion
     - Generates narrative summary for Director Mode
     """
-    session = get_session(request.session_id)
+    async with session_transaction(request.session_id) as session:
+        hand = await _next_hand(request, session)
     
+    # PIO hands: splice the cached JSON instead of re-serializing the hand
+    body = _encode_hand(hand, session)
+    if body is not None:
+        return Response(content=body, media_type="application/json")
+    return hand
+
+
+# Per-request fields of a PIO NextHandResponse; the rest comes pre-encoded
+_HAND_HEAD_FIELDS = (
+    "status", "hand_id", "engine_type", "current_hp", "current_level",
+    "hands_played", "hands_remaining", "is_review",
+)
+
+
+def _encode_hand(hand: NextHandResponse, session: SessionState, extra: Optional[Dict] = None) -> Optional[bytes]:
+    """
+    JSON for a ready PIO hand built from the render cache's encoded bytes,
+    or None when the hand is not cached (callers serialize normally).
+    """
+    if hand.engine_type != EngineType.PIO.value or hand.hand_id != session.hand_id:
+        return None
+    rendered = engine.render_cache.peek((session.file_id, session.variant_hash))
+    if rendered is None:
+        return None
+    head = dict(extra or {})
+    head.update((field, getattr(hand, field)) for field in _HAND_HEAD_FIELDS)
+    return b"".join((
+        json.dumps(head).encode()[:-1],
+        b', "hand_data": ', rendered.display_json,
+        b', "narrative_summary": ', rendered.narrative_json,
+        b"}",
+    ))
+
+
+async def _next_hand(request: NextHandRequest, session: SessionState) -> NextHandResponse:
+    """Body of /api/hand/next; mutates `session` in place."""
     # Check if round is complete
-    hands_per_round = session["hands_per_round"]
-    if session["hands_played"] >= hands_per_round:
+    hands_per_round = session.hands_per_round
+    if session.hands_played >= hands_per_round:
         # Calculate if passed
-        accuracy = (session["correct_answers"] / session["hands_played"]) * 100
+        accuracy = (session.correct_answers / session.hands_played) * 100
         thresholds = [85, 87, 89, 91, 93, 95, 97, 98, 99, 100]
-        level = session["current_level"]
+        level = session.current_level
         passed = accuracy >= thresholds[level - 1] if level <= 10 else accuracy >= 100
         
         if passed and level < 10:
             # Level up!
-            session["current_level"] = level + 1
-            session["hands_played"] = 0
-            session["correct_answers"] = 0
-            session["current_hp"] = 100  # Reset HP for new level
+            session.current_level = level + 1
+            session.hands_played = 0
+            session.correct_answers = 0
+            session.current_hp = 100  # Reset HP for new level
             
             return NextHandResponse(
                 status="LEVEL_COMPLETE",
-                current_hp=session["current_hp"],
-                current_level=session["current_level"],
+                current_hp=session.current_hp,
+                current_level=session.current_level,
                 hands_played=0,
                 hands_remaining=hands_per_round,
             )
         else:
+            session.completed = True
             return NextHandResponse(
                 status="SESSION_COMPLETE",
-                current_hp=session["current_hp"],
-                current_level=session["current_level"],
-                hands_played=session["hands_played"],
+                current_hp=session.current_hp,
+                current_level=session.current_level,
+                hands_played=session.hands_played,
                 hands_remaining=0,
             )
     
     # Check if HP is depleted
-    if session["current_hp"] <= 0:
+    if session.current_hp <= 0:
+        session.completed = True
         return NextHandResponse(
             status="SESSION_COMPLETE",
             current_hp=0,
-            current_level=session["current_level"],
-            hands_played=session["hands_played"],
-            hands_remaining=hands_per_round - session["hands_played"],
+            current_level=session.current_level,
+            hands_played=session.hands_played,
+            hands_remaining=hands_per_round - session.hands_played,
         )
     
     # Fetch next hand from engine
     try:
         hand_result = await engine.fetch_next_hand(
             user_id=request.user_id,
-            game_id=session["game_slug"],
-            current_level=session["current_level"],
+            game_id=session.game_slug,
+            current_level=session.current_level,
+            rng=session.rng,
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch hand: {str(e)}")
@@ -310,30 +474,28 @@ async def get_next_hand(request: NextHandRequest):
     # Build response based on engine type
     if isinstance(hand_result, HandResult):
         # PIO Engine
-        hand_data = format_hand_for_display(hand_result.hand_data)
-        narrative = build_narrative_summary(hand_result.hand_data)
+        # Rotation, display dict and narrative are shared per (spot, variant)
+        rendered = await engine.render_solver_hand(hand_result.file_id, hand_result.variant_hash)
         
         # Store current state
-        session["current_hand"] = hand_result
-        session["current_hand_id"] = hand_id
-        session["current_solver_node"] = hand_result.hand_data.get("solver_node", {})
+        session.set_hand(hand_id, hand_result)
         
         return NextHandResponse(
             status="HAND_READY",
             hand_id=hand_id,
             engine_type="PIO",
-            hand_data=hand_data,
-            narrative_summary=narrative,
-            current_hp=session["current_hp"],
-            current_level=session["current_level"],
-            hands_played=session["hands_played"],
-            hands_remaining=hands_per_round - session["hands_played"],
+            hand_data=rendered.display,
+            narrative_summary=rendered.narrative,
+            current_hp=session.current_hp,
+            current_level=session.current_level,
+            hands_played=session.hands_played,
+            hands_remaining=hands_per_round - session.hands_played,
+            is_review=hand_result.is_review,
         )
         
     elif isinstance(hand_result, ChartInstruction):
         # CHART Engine
-        session["current_hand"] = hand_result
-        session["current_hand_id"] = hand_id
+        session.set_hand(hand_id, hand_result)
         
         return NextHandResponse(
             status="HAND_READY",
@@ -345,18 +507,18 @@ async def get_next_hand(request: NextHandRequest):
                 "stack_bb": hand_result.stack_bb,
                 "villain_position": hand_result.villain_position,
                 "extra_params": hand_result.extra_params,
+                "hero_hand": hand_result.hero_hand,
             },
-            narrative_summary=f"Hero is {hand_result.hero_position} with {hand_result.stack_bb} BB...",
-            current_hp=session["current_hp"],
-            current_level=session["current_level"],
-            hands_played=session["hands_played"],
-            hands_remaining=hands_per_round - session["hands_played"],
+            narrative_summary=f"Hero is {hand_result.hero_position} with {hand_result.stack_bb} BB holding {hand_result.hero_hand}...",
+            current_hp=session.current_hp,
+            current_level=session.current_level,
+            hands_played=session.hands_played,
+            hands_remaining=hands_per_round - session.hands_played,
         )
         
     elif isinstance(hand_result, ScenarioInstruction):
         # SCENARIO Engine
-        session["current_hand"] = hand_result
-        session["current_hand_id"] = hand_id
+        session.set_hand(hand_id, hand_result)
         
         return NextHandResponse(
             status="HAND_READY",
@@ -366,57 +528,18 @@ async def get_next_hand(request: NextHandRequest):
                 "scenario_id": hand_result.scenario_id,
                 "script_name": hand_result.script_name,
                 "rigged_outcome": hand_result.rigged_outcome,
+                "deal": hand_result.deal,
             },
             narrative_summary="A challenging situation arises...",
-            current_hp=session["current_hp"],
-            current_level=session["current_level"],
-            hands_played=session["hands_played"],
-            hands_remaining=hands_per_round - session["hands_played"],
+            current_hp=session.current_hp,
+            current_level=session.current_level,
+            hands_played=session.hands_played,
+            hands_remaining=hands_per_round - session.hands_played,
         )
     
     raise HTTPException(status_code=500, detail="Unknown hand result type")
 
 
-def build_narrative_summary(hand_data: Dict[str, Any]) -> str:
-    """
-    Build the narrative summary for Director Mode.
-    
-    Example: "Hero (BTN) Raises 2.2bb... Villain (BB) Calls..."
-    """
-    lines = []
-    
-    action_history = hand_data.get("action_history", [])
-    hero_pos = hand_data.get("hero_position", "BTN")
-    villain_pos = hand_data.get("villain_position", "BB")
-    
-    for action in action_history:
-        player = action.get("player", "hero")
-        action_type = action.get("action", "")
-        amount = action.get("amount")
-        
-        pos = hero_pos if player == "hero" else villain_pos
-        player_name = "Hero" if player == "hero" else "Villain"
-        
-        if action_type == "raises":
-            lines.append(f"{player_name} ({pos}) Raises to {amount}bb...")
-        elif action_type == "calls":
-            lines.append(f"{player_name} ({pos}) Calls...")
-        elif action_type == "checks":
-            lines.append(f"{player_name} ({pos}) Checks...")
-        elif action_type == "bets":
-            lines.append(f"{player_name} ({pos}) Bets {amount}bb...")
-        elif action_type == "folds":
-            lines.append(f"{player_name} ({pos}) Folds...")
-    
-    # Add board if present
-    board = hand_data.get("board", "")
-    if board and len(board) >= 6:
-        flop = board[:6]
-        lines.append(f"Flop: {flop}")
-    
-    return "\n".join(lines) if lines else "Action begins..."
-
-
 # ============================================================================
 # ENDPOINT: POST /api/hand/action (THE GAME LOOP)
 # ============================================================================
@@ -432,33 +555,60 @@ async def submit_action(request: ActionRequest):
     3. Save to hand history
     4. Return result
     """
-    session = get_session(request.session_id)
-    
+    async with session_transaction(request.session_id) as session:
+        return await _submit_action(request, session)
+
+
+async def _submit_action(request: ActionRequest, session: SessionState) -> ActionResponse:
+    """Body of /api/hand/action; mutates `session` in place."""
     # Validate hand ID
-    if session["current_hand_id"] != request.hand_id:
+    if session.hand_id != request.hand_id:
         raise HTTPException(status_code=400, detail="Invalid hand ID")
     
-    current_hand = session["current_hand"]
-    solver_node = session.get("current_solver_node", {})
+    # The session only references its hand; PIO hand data is re-resolved
+    # from the engine's shared spot cache
+    hand_data: Dict[str, Any] = {}
+    if session.hand_kind == EngineType.PIO.value:
+        try:
+            hand_data = await engine.resolve_solver_hand(session.file_id, session.variant_hash)
+        except ValueError as e:
+            raise HTTPException(status_code=410, detail=str(e))
+    solver_node = hand_data.get("solver_node", {})
     
     # ========================================================================
     # PHASE 1: Grade User Action
     # ========================================================================
     
-    hp_result = engine.calculate_hp_loss(
-        user_action=request.action_type,
-        solver_node=solver_node,
-        user_sizing=request.amount,
-        pot_size=current_hand.hand_data.get("pot", 100) if isinstance(current_hand, HandResult) else 100,
-    )
+    if session.hand_kind == EngineType.CHART.value:
+        hp_result = engine.grade_chart_hand(
+            session.chart_id, session.hand_class, session.hero_hand, request.action_type
+        )
+    else:
+        hp_result = engine.calculate_hp_loss(
+            user_action=request.action_type,
+            solver_node=solver_node,
+            user_sizing=request.amount,
+            pot_size=hand_data.get("pot", 100),
+        )
     
     # Apply damage
-    new_hp = session["current_hp"] - hp_result.hp_damage
-    session["current_hp"] = max(0, new_hp)
+    new_hp = session.current_hp - hp_result.hp_damage
+    session.current_hp = max(0, new_hp)
     
     # Track correct answers
     if hp_result.is_correct:
-        session["correct_answers"] += 1
+        session.correct_answers += 1
+    
+    # Streaming accuracy by spot attribute (flushed in batches)
+    rollups.add(
+        session.user_id,
+        session.game_slug,
+        session.current_level,
+        _spot_attributes(session, hand_data),
+        hp_result.is_correct,
+        hp_result.ev_loss,
+        hp_result.hp_damage,
+    )
     
     # XP earned (10 per correct, 0 per mistake)
     xp_earned = 10 if hp_result.is_correct else 0
@@ -482,13 +632,13 @@ async def submit_action(request: ActionRequest):
         is_hand_over = True  # Simplified: one action per hand
         
         # If hand were to continue, resolve villain action:
-        # villain_action = engine.resolve_villain_action(solver_node)
+        # villain_action = engine.resolve_villain_action(solver_node, session.rng)
         # villain_move = villain_action.action
         # villain_sizing = villain_action.sizing
         # 
         # # Deal next card if applicable
         # if villain_action.next_node:
-        #     session["current_solver_node"] = villain_action.next_node
+        #     (advance the session's node reference to villain_action.next_node)
         #     # Get new card from next node
         #     next_board_state = villain_action.next_node.get("new_card")
         #     is_hand_over = False
@@ -497,29 +647,32 @@ async def submit_action(request: ActionRequest):
     # PHASE 3: Save to Hand History
     # ========================================================================
     
-    if isinstance(current_hand, HandResult):
+    if session.hand_kind == EngineType.PIO.value:
         history_record = {
-            "user_id": request.user_id,
-            "game_id": session["game_id"],
-            "file_id": current_hand.file_id,
-            "variant_hash": current_hand.variant_hash,
+            "user_id": session.user_id,
+            "game_id": session.game_id,
+            "file_id": session.file_id,
+            "variant_hash": session.variant_hash,
             "user_action": request.action_type,
             "user_sizing": request.amount,
             "is_correct": hp_result.is_correct,
             "ev_loss": hp_result.ev_loss,
             "hp_damage": hp_result.hp_damage,
-            "level": session["current_level"],
+            "level": session.current_level,
             "played_at": datetime.utcnow().isoformat(),
         }
         
-        try:
-            supabase.table("god_mode_hand_history").insert(history_record).execute()
-        except Exception as e:
-            # Log but don't fail the request
-            print(f"Failed to save hand history: {e}")
+        # Batched per worker; flushed on a timer and at shutdown
+        history_buffer.add(history_record)
+        
+        # Misses (and reviews) feed the spaced-repetition queue
+        await engine.reviews.record(
+            session.user_id, session.game_slug, session.file_id,
+            session.variant_hash, hp_result.is_correct
+        )
     
     # Increment hands played
-    session["hands_played"] += 1
+    session.hands_played += 1
     
     # ========================================================================
     # Return Result
@@ -535,55 +688,277 @@ async def submit_action(request: ActionRequest):
         villain_sizing=villain_sizing,
         next_board_state=next_board_state,
         is_hand_over=is_hand_over,
-        current_hp=session["current_hp"],
+        current_hp=session.current_hp,
         xp_earned=xp_earned,
     )
 
 
+def _spot_attributes(session: SessionState, hand_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Rollup dimensions describing the hand that was just graded."""
+    if session.hand_kind == EngineType.PIO.value:
+        return {field: hand_data.get(field) for field in ("street", "stack_depth", "game_type", "mode")}
+    if session.hand_kind == EngineType.CHART.value:
+        chart = engine.charts.charts.get(session.chart_id)
+        if chart is None:
+            return {}
+        return {"chart_type": chart.family, "position": chart.position, "stack_bb": chart.stack_bb}
+    if session.hand_kind == EngineType.SCENARIO.value:
+        return {"scenario_id": session.scenario_id}
+    return {}
+
+
+# ============================================================================
+# WEBSOCKET: /ws/session/{session_id} (THE GAME LOOP, ONE CONNECTION)
+# ============================================================================
+
+@app.websocket("/ws/session/{session_id}")
+async def session_socket(websocket: WebSocket, session_id: str):
+    """
+    The /api/hand/next + /api/hand/action loop over one persistent socket.
+    
+    Client → server (JSON):
+        {"type": "next"}
+        {"type": "action", "hand_id": ..., "action_type": "CALL",
+         "amount": null, "solver_node_id": null}
+    
+    Server → client (JSON):
+        {"type": "hand", ...NextHandResponse}
+        {"type": "result", ...ActionResponse}
+        {"type": "error", "status": 400, "detail": "..."}
+    
+    Binary or malformed frames get a 400 error frame and unexpected failures a 500
+    (logged); either way the socket stays open for the next message.
+    
+    After a graded action that ends the hand, the next hand is fetched
+    while the result frame is being sent and pushed straight after it, so
+    the client never has to ask for it.
+    """
+    await websocket.accept()
+    try:
+        while True:
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
+            if frame.get("text") is None:
+                await websocket.send_json({"type": "error", "status": 400, "detail": "Frames must be JSON text"})
+                continue
+            try:
+                message = json.loads(frame["text"])
+            except ValueError:
+                await websocket.send_json({"type": "error", "status": 400, "detail": "Frame is not valid JSON"})
+                continue
+            if not isinstance(message, dict):
+                await websocket.send_json({"type": "error", "status": 400, "detail": "Frame must be a JSON object"})
+                continue
+            try:
+                async with session_transaction(session_id) as session:
+                    await _handle_socket_message(websocket, session_id, session, message)
+            except HTTPException as e:
+                await websocket.send_json({"type": "error", "status": e.status_code, "detail": e.detail})
+                if e.status_code == 404:
+                    await websocket.close(code=4404)
+                    return
+            except WebSocketDisconnect:
+                raise
+            except Exception as e:
+                print(f"⚠️ Socket message failed for session {session_id}: {e!r}")
+                traceback.print_exc()
+                await websocket.send_json({"type": "error", "status": 500, "detail": "Internal server error"})
+    except WebSocketDisconnect:
+        pass
+
+
+async def _handle_socket_message(
+    websocket: WebSocket,
+    session_id: str,
+    session: SessionState,
+    message: Dict[str, Any]
+):
+    """Dispatch one client frame to the shared next/action bodies."""
+    kind = message.get("type")
+    user_id = session.user_id
+    
+    if kind == "next":
+        hand = await _next_hand(NextHandRequest(session_id=session_id, user_id=user_id), session)
+        await _send_hand(websocket, hand, session)
+        return
+    
+    if kind != "action":
+        raise HTTPException(status_code=400, detail=f"Unknown message type: {kind}")
+    
+    try:
+        request = ActionRequest(
+            session_id=session_id,
+            user_id=user_id,
+            hand_id=message.get("hand_id"),
+            action_type=message.get("action_type"),
+            amount=message.get("amount"),
+            solver_node_id=message.get("solver_node_id"),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    result = await _submit_action(request, session)
+    if not result.is_hand_over:
+        await websocket.send_json({"type": "result", **jsonable_encoder(result)})
+        return
+    
+    # Start the next hand while the result goes out
+    prefetch = asyncio.create_task(
+        _next_hand(NextHandRequest(session_id=session_id, user_id=user_id), session)
+    )
+    try:
+        await websocket.send_json({"type": "result", **jsonable_encoder(result)})
+    except BaseException:
+        # Client gone (or send failed): drop the prefetch, keep the original error
+        prefetch.cancel()
+        await asyncio.gather(prefetch, return_exceptions=True)
+        raise
+    hand = await prefetch
+    await _send_hand(websocket, hand, session)
+
+
+async def _send_hand(websocket: WebSocket, hand: NextHandResponse, session: SessionState):
+    body = _encode_hand(hand, session, extra={"type": "hand"})
+    if body is not None:
+        await websocket.send_text(body.decode())
+    else:
+        await websocket.send_json({"type": "hand", **jsonable_encoder(hand)})
+
+
 # ============================================================================
 # HEALTH CHECK ENDPOINT
 # ============================================================================
 
 @app.get("/api/health")
 async def health_check():
-    """Health check endpoint."""
+    """Health check endpoint ("degraded" while serving from local caches)."""
     return {
-        "status": "healthy",
+        "status": "degraded" if engine.breaker.is_open else "healthy",
         "version": "1.0.0",
         "engine": "God Mode Engine",
         "timestamp": datetime.utcnow().isoformat(),
     }
 
 
+@app.get("/api/metrics")
+async def metrics():
+    """Per-worker load metrics: DB queueing/utilization and cache behaviour."""
+    return {
+        "pid": os.getpid(),
+        "db": db_governor.metrics(),
+        "single_flight": dict(engine.flights.stats),
+        "history_buffer_rows": len(history_buffer),
+        "history_spooled_rows": history_buffer.spooled_rows,
+        "history_rejected_rows": history_buffer.rejected_rows,
+        "rollup_deltas": len(rollups),
+        "rollup_rejected_rows": rollups.rejected_rows,
+        "circuit_breaker": engine.breaker.metrics(),
+        "solver_rows_cached": len(engine._solver_rows),
+        "render_cache": engine.render_cache.metrics(),
+        "response_bodies": response_bodies.metrics(),
+        "deal_pool": engine.deal_pool.sizes(),
+        "deal_pool_misses": engine.deal_pool.misses,
+    }
+
+
 # ============================================================================
 # GAME REGISTRY ENDPOINT
 # ============================================================================
 
+def _cached_response(request: Request, body: CachedBody, max_age: int) -> Response:
+    """Send a cached body: 304 on a matching If-None-Match, else the best encoding."""
+    status, content, headers = negotiate(
+        body,
+        request.headers.get("if-none-match"),
+        request.headers.get("accept-encoding"),
+        max_age,
+    )
+    return Response(
+        content=content,
+        status_code=status,
+        headers=headers,
+        media_type="application/json" if status == 200 else None,
+    )
+
+
 @app.get("/api/games")
-async def list_games():
+async def list_games(request: Request):
     """List all available games from game_registry."""
-    result = supabase.table("game_registry") \
-        .select("id, title, slug, engine_type, category, config, description") \
-        .eq("is_active", True) \
-        .order("category") \
-        .execute()
+    def fetch_games():
+        return supabase.table("game_registry") \
+            .select("id, title, slug, engine_type, category, config, description") \
+            .eq("is_active", True) \
+            .order("category") \
+            .execute() \
+            .data
     
-    return {"games": result.data if result.data else []}
+    async def produce():
+        data = await engine.flights.do(query_key("game_registry", "active_list"), fetch_games)
+        return {"games": data if data else []}
+    
+    body = await response_bodies.get("games", produce, ttl=REGISTRY_BODY_TTL_SECONDS)
+    return _cached_response(request, body, REGISTRY_BODY_TTL_SECONDS)
 
 
 @app.get("/api/games/{game_slug}")
-async def get_game(game_slug: str):
+async def get_game(game_slug: str, request: Request):
     """Get a specific game by slug."""
-    result = supabase.table("game_registry") \
-        .select("*") \
-        .eq("slug", game_slug) \
-        .single() \
-        .execute()
+    def fetch_game():
+        return supabase.table("game_registry") \
+            .select("*") \
+            .eq("slug", game_slug) \
+            .single() \
+            .execute() \
+            .data
+    
+    async def produce():
+        # Concurrent requests for the same slug share one query
+        data = await engine.flights.do(
+            query_key("game_registry", "single", slug=game_slug),
+            fetch_game,
+            ttl=GAME_DETAIL_TTL_SECONDS,
+        )
+        if not data:
+            raise HTTPException(status_code=404, detail="Game not found")
+        return data
     
-    if not result.data:
-        raise HTTPException(status_code=404, detail="Game not found")
+    body = await response_bodies.get(("game", game_slug), produce, ttl=REGISTRY_BODY_TTL_SECONDS)
+    return _cached_response(request, body, REGISTRY_BODY_TTL_SECONDS)
+
+
+# ============================================================================
+# STATS ENDPOINT
+# ============================================================================
+
+@app.get("/api/stats/{user_id}")
+async def get_user_stats(user_id: str, game_slug: Optional[str] = None):
+    """
+    Precomputed accuracy for a user (profile / coach views).
     
-    return result.data
+    Reads the user's rollup rows (one per game × level × attribute, never
+    the hand history) plus this worker's not-yet-flushed deltas.
+    
+    Fails fast with 503 while the database circuit breaker is open.
+    """
+    # The rollup table's user_id is a UUID column
+    try:
+        user_id = str(uuid.UUID(user_id))
+    except ValueError:
+        raise HTTPException(status_code=422, detail="user_id must be a UUID")
+    
+    query = supabase.table(ROLLUP_TABLE).select("*").eq("user_id", user_id)
+    if game_slug:
+        query = query.eq("game_id", game_slug)
+    try:
+        result = await asyncio.to_thread(engine.breaker.call, query.execute)
+    except CircuitOpenError:
+        raise HTTPException(status_code=503, detail="Stats are temporarily unavailable")
+    
+    return {
+        "user_id": user_id,
+        "rollups": merge_rollups(result.data or [], rollups.pending(user_id, game_slug)),
+    }
 
 
 # ============================================================================
@@ -591,27 +966,88 @@ async def get_game(game_slug: str):
 # ============================================================================
 
 @app.get("/api/leaderboard/{game_slug}")
-async def get_leaderboard(game_slug: str, limit: int = 10):
+async def get_leaderboard(game_slug: str, request: Request, limit: int = 10):
     """Get leaderboard for a specific game."""
-    result = supabase.table("god_mode_leaderboard") \
-        .select("*, profiles(username, avatar_url)") \
-        .eq("game_slug", game_slug) \
-        .order("best_accuracy", desc=True) \
-        .limit(limit) \
-        .execute()
+    def fetch_leaderboard():
+        return supabase.table("god_mode_leaderboard") \
+            .select("*, profiles(username, avatar_url)") \
+            .eq("game_slug", game_slug) \
+            .order("best_accuracy", desc=True) \
+            .limit(limit) \
+            .execute() \
+            .data
+    
+    async def produce():
+        data = await engine.flights.do(
+            query_key("god_mode_leaderboard", "top", game_slug=game_slug, limit=limit),
+            fetch_leaderboard,
+        )
+        return {"leaderboard": data if data else []}
     
-    return {"leaderboard": result.data if result.data else []}
+    body = await response_bodies.get(
+        ("leaderboard", game_slug, limit), produce, ttl=LEADERBOARD_BODY_TTL_SECONDS
+    )
+    return _cached_response(request, body, LEADERBOARD_BODY_TTL_SECONDS)
 
 
 # ============================================================================
 # RUN SERVER
 # ============================================================================
 
+def serve_forked(host: str, port: int, workers: int):
+    """
+    Production mode: load once, fork N workers sharing one listening socket.
+    
+    Read-only data (chart index, equity matrix, evaluator tables, game
+    registry) is built in the parent, then gc.freeze() moves it out of the
+    collector's reach so workers keep sharing those pages copy-on-write.
+    """
+    engine.preload()
+    
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    
+    gc.collect()
+    gc.freeze()
+    
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            init_worker()
+            config = uvicorn.Config(app, host=host, port=port, log_level="info")
+            uvicorn.Server(config).run(sockets=[sock])
+            os._exit(0)
+        children.append(pid)
+    print(f"🚀 God Mode Engine: {workers} workers on {host}:{port} (pids {children})")
+    
+    # Ctrl-C reaches the whole process group; SIGTERM must be forwarded
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda signum, frame: [os.kill(pid, signum) for pid in children])
+    for pid in children:
+        os.waitpid(pid, 0)
+
+
 if __name__ == "__main__":
-    uvicorn.run(
-        "server:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info",
-    )
+    parser = argparse.ArgumentParser(description="God Mode Engine API server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("WEB_CONCURRENCY", 1)),
+                        help="Forked worker processes (>1 requires REDIS_URL)")
+    args = parser.parse_args()
+    
+    if args.workers > 1:
+        if not sessions.shared:
+            raise SystemExit("❌ --workers > 1 requires REDIS_URL so workers share sessions")
+        serve_forked(args.host, args.port, args.workers)
+    else:
+        uvicorn.run(
+            "server:app",
+            host=args.host,
+            port=args.port,
+            reload=True,
+            log_level="info",
+        )
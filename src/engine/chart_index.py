@@ -0,0 +1,260 @@
+"""
+God Mode Engine — Chart Range Index
+====================================
+Compiles the static preflop charts in data/charts/*.json into compact
+169-entry action arrays so CHART hands can be graded server-side with a
+single array lookup.
+
+Hand classes are laid out on the standard 13×13 grid:
+- row == col: pocket pair ("AA")
+- row <  col: suited      ("AKs")
+- row >  col: offsuit     ("AKo")
+so index = row * 13 + col, with ranks ordered A..2.
+
+Author: Smarter.Poker Engineering
+"""
+
+import json
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+# ============================================================================
+# HAND CLASSES
+# ============================================================================
+
+RANKS = "AKQJT98765432"
+SUITS = "shdc"
+
+RANK_INDEX = {r: i for i, r in enumerate(RANKS)}
+
+# Full 52-card deck ("As", "Ah", ... "2c")
+DECK: List[str] = [r + s for r in RANKS for s in SUITS]
+
+
+def _build_hand_classes() -> List[str]:
+    classes = []
+    for row, high in enumerate(RANKS):
+        for col, low in enumerate(RANKS):
+            if row == col:
+                classes.append(high + low)
+            elif row < col:
+                classes.append(high + low + "s")
+            else:
+                classes.append(low + high + "o")
+    return classes
+
+
+HAND_CLASSES: List[str] = _build_hand_classes()
+HAND_CLASS_INDEX: Dict[str, int] = {name: i for i, name in enumerate(HAND_CLASSES)}
+NUM_HAND_CLASSES = len(HAND_CLASSES)  # 169
+
+
+def hand_class_index(hand: str) -> int:
+    """
+    Map a concrete hand ("AhKd") or class name ("AKo") to its grid index.
+
+    Raises:
+        ValueError: If the hand cannot be parsed
+    """
+    if hand in HAND_CLASS_INDEX:
+        return HAND_CLASS_INDEX[hand]
+
+    if len(hand) != 4:
+        raise ValueError(f"Cannot parse hand: {hand}")
+
+    r1, s1, r2, s2 = hand[0].upper(), hand[1].lower(), hand[2].upper(), hand[3].lower()
+    if r1 not in RANK_INDEX or r2 not in RANK_INDEX:
+        raise ValueError(f"Cannot parse hand: {hand}")
+
+    i, j = RANK_INDEX[r1], RANK_INDEX[r2]
+    if i > j:
+        i, j = j, i
+    if i == j:
+        return i * 13 + i
+    if s1 == s2:
+        return i * 13 + j   # suited: upper triangle
+    return j * 13 + i       # offsuit: lower triangle
+
+
+# ============================================================================
+# ACTIONS
+# ============================================================================
+
+FOLD, CALL, PUSH, THREE_BET = 0, 1, 2, 3
+ACTION_NAMES = ["FOLD", "CALL", "PUSH", "3BET"]
+ACTION_CODES = {name: code for code, name in enumerate(ACTION_NAMES)}
+
+# User action strings accepted for each chart action
+_ACTION_ALIASES = {
+    FOLD: {"FOLD"},
+    CALL: {"CALL"},
+    PUSH: {"PUSH", "ALLIN", "ALL-IN", "SHOVE", "RAISE", "BET"},
+    THREE_BET: {"3BET", "3-BET", "RAISE", "BET"},
+}
+
+
+def action_matches(code: int, user_action: str) -> bool:
+    """Check whether a user's action string satisfies a chart action code."""
+    return user_action.upper() in _ACTION_ALIASES.get(code, set())
+
+
+# ============================================================================
+# COMPILED CHARTS
+# ============================================================================
+
+# Instruction chart_type -> chart family (one family per data/charts file)
+CHART_FAMILIES = {
+    "push_fold": "push_fold",
+    "icm_ranges": "icm_bubble",
+    "bubble_pressure": "icm_bubble",
+    "3bet_range": "3bet",
+    "squeeze": "3bet",
+    "resteal": "3bet",
+}
+
+# data/charts file stem -> chart family
+_FILE_FAMILIES = {
+    "push_fold_ranges": "push_fold",
+    "icm_bubble_ranges": "icm_bubble",
+    "3bet_ranges": "3bet",
+}
+
+_POSITION_PATTERN = re.compile(r"\b(UTG\+?\d?|LJ|HJ|CO|BTN|SB|BB)\b")
+
+
+@dataclass(frozen=True)
+class CompiledChart:
+    """One chart compressed to a 169-byte action array."""
+    chart_id: str
+    family: str
+    position: str
+    stack_bb: int
+    actions: bytes  # ACTION_* code per hand class
+    villain_position: Optional[str] = None
+
+    def action_for(self, hand: str) -> str:
+        return ACTION_NAMES[self.actions[hand_class_index(hand)]]
+
+
+class ChartIndex:
+    """
+    All compiled charts, keyed by chart id and by (family, position).
+
+    Usage:
+        index = ChartIndex.load(Path("data/charts"))
+        chart = index.select("push_fold", "BTN", 12)
+        chart.actions[hand_class_index("AhKd")]  # -> PUSH
+    """
+
+    def __init__(self, charts: List[CompiledChart]):
+        self.charts: Dict[str, CompiledChart] = {c.chart_id: c for c in charts}
+        self._by_family: Dict[str, List[CompiledChart]] = {}
+        for chart in charts:
+            self._by_family.setdefault(chart.family, []).append(chart)
+
+    @classmethod
+    def load(cls, charts_dir: Path) -> "ChartIndex":
+        """Compile every data/charts/*.json file into action arrays."""
+        charts = []
+        for path in sorted(Path(charts_dir).glob("*.json")):
+            family = _FILE_FAMILIES.get(path.stem, path.stem)
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            for chart_id, chart in data.get("charts", {}).items():
+                charts.append(compile_chart(chart_id, family, chart))
+        return cls(charts)
+
+    def get(self, chart_id: str) -> CompiledChart:
+        return self.charts[chart_id]
+
+    def add(self, chart: CompiledChart):
+        """Register an externally built chart (e.g. a solver result)."""
+        self.charts[chart.chart_id] = chart
+        self._by_family.setdefault(chart.family, []).append(chart)
+
+    def families(self) -> List[str]:
+        return list(self._by_family)
+
+    def select(
+        self,
+        chart_type: str,
+        position: Optional[str],
+        stack_bb: int
+    ) -> Optional[CompiledChart]:
+        """
+        Pick the chart that best fits a dealt situation.
+
+        Prefers the hero's position, then the nearest stack depth.
+        Returns None if the chart type has no compiled charts.
+        """
+        family = CHART_FAMILIES.get(chart_type, chart_type)
+        candidates = self._by_family.get(family, [])
+        if not candidates:
+            return None
+
+        same_position = [c for c in candidates if c.position == position]
+        pool = same_position or candidates
+        return min(pool, key=lambda c: (abs(c.stack_bb - stack_bb), c.chart_id))
+
+
+def compile_chart(chart_id: str, family: str, chart: Dict) -> CompiledChart:
+    """Compress one chart's grid into a 169-byte action array."""
+    grid = chart.get("grid", {})
+    actions = bytearray(NUM_HAND_CLASSES)  # Missing classes default to FOLD
+
+    for hand, action in grid.items():
+        code = ACTION_CODES.get(str(action).upper())
+        if code is None:
+            raise ValueError(f"Unknown action '{action}' for {hand} in chart {chart_id}")
+        actions[hand_class_index(hand)] = code
+
+    return CompiledChart(
+        chart_id=chart_id,
+        family=family,
+        position=chart.get("position", "BTN"),
+        stack_bb=int(chart.get("stackBB", 0)),
+        actions=bytes(actions),
+        villain_position=_villain_position(chart),
+    )
+
+
+def _villain_position(chart: Dict) -> Optional[str]:
+    """Derive the opponent's seat from 'facing' or the first listed opponent."""
+    facing = chart.get("facing")
+    if facing:
+        match = _POSITION_PATTERN.search(facing)
+        if match:
+            return match.group(1)
+    opponents = chart.get("opponents") or []
+    return opponents[0] if opponents else None
+
+
+# ============================================================================
+# DEFAULT INDEX
+# ============================================================================
+
+CHARTS_DIR = Path(__file__).resolve().parents[2] / "data" / "charts"
+
+
+@lru_cache(maxsize=1)
+def load_default_chart_index() -> ChartIndex:
+    """Compile data/charts once per process and share it across engines."""
+    return ChartIndex.load(CHARTS_DIR)
+
+
+def deal_hand(rng) -> Tuple[str, int]:
+    """
+    Deal two random hole cards (uniform over all 1326 combos).
+
+    Returns:
+        Tuple of (hand string like "AhKd", hand class index)
+    """
+    first, second = rng.sample(DECK, 2)
+    if RANK_INDEX[first[0]] > RANK_INDEX[second[0]]:
+        first, second = second, first
+    hand = first + second
+    return hand, hand_class_index(hand)
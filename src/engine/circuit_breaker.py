@@ -0,0 +1,216 @@
+"""
+God Mode Engine — Circuit Breaker & Degraded Mode
+==================================================
+Keeps training going when Supabase is slow or down.
+
+CircuitBreaker wraps blocking database callables. Consecutive failures,
+or calls slower than `slow_call_seconds`, trip it OPEN; while open, calls
+fail immediately with CircuitOpenError so the engine can fall back to its
+warm caches instead of waiting on timeouts. After `reset_timeout` one
+trial call (or the server's health probe) is let through HALF_OPEN, and a
+success closes the breaker again.
+
+While it is open the engine deals only from what it already holds: the
+registry cache, each filter set's last difficulty index, and the solver
+rows in its per-worker row cache.
+
+Errors the database answers with (bad input, constraint violations, other
+4xx) prove it is reachable, so they never count against the breaker.
+`send_isolating_rejects` uses the same classification to split a failing
+batch write until the offending rows are isolated, so one bad row cannot
+keep a whole batch retrying forever.
+
+Author: Smarter.Poker Engineering
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+FAILURE_THRESHOLD = 5  # Consecutive failures (or slow calls) that trip it
+SLOW_CALL_SECONDS = 3.0  # A call slower than this counts as a failure
+RESET_TIMEOUT_SECONDS = 10.0  # Open time before a trial call is allowed
+PROBE_INTERVAL_SECONDS = 2.0
+
+# SQLSTATE classes for bad data / constraint violations / bad statements,
+# and PostgREST's request-parsing codes: retrying never helps
+CLIENT_ERROR_SQLSTATE_PREFIXES = ("22", "23", "42", "PGRST1")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the database while the breaker is open."""
+    pass
+
+
+def is_client_error(exc: BaseException) -> bool:
+    """
+    Whether the database rejected the request itself (non-retryable).
+
+    Recognizes PostgREST APIErrors by SQLSTATE / PGRST code and HTTP errors
+    by 4xx status (except 408 and 429, which are worth retrying).
+    """
+    code = str(getattr(exc, "code", "") or "")
+    if code.startswith(CLIENT_ERROR_SQLSTATE_PREFIXES):
+        return True
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None)
+    return isinstance(status, int) and 400 <= status < 500 and status not in (408, 429)
+
+
+@dataclass
+class BatchOutcome:
+    """What send_isolating_rejects managed to do with a batch."""
+    written: int = 0
+    rejected: List[Tuple[Dict, str]] = field(default_factory=list)  # (row, error)
+    unsent: List[Dict] = field(default_factory=list)  # Left over after `error`
+    error: Optional[Exception] = None  # Retryable failure that stopped the batch
+
+
+def send_isolating_rejects(rows: List[Dict], send: Callable[[List[Dict]], Any]) -> BatchOutcome:
+    """
+    Write rows with `send`, bisecting batches the database rejects.
+
+    A rejected batch is split in halves and each half retried, down to
+    single rows; costs O(bad rows × log n) extra calls. A retryable failure
+    (transport error, open circuit) stops the write and the rows not yet
+    written come back in `unsent`.
+    """
+    outcome = BatchOutcome()
+    stack = [rows] if rows else []
+    while stack:
+        batch = stack.pop()
+        try:
+            send(batch)
+        except Exception as e:
+            if not is_client_error(e):
+                outcome.error = e
+                outcome.unsent = batch + [row for pending in reversed(stack) for row in pending]
+                return outcome
+            if len(batch) == 1:
+                outcome.rejected.append((batch[0], str(e)))
+            else:
+                middle = len(batch) // 2
+                stack.append(batch[middle:])
+                stack.append(batch[:middle])
+            continue
+        outcome.written += len(batch)
+    return outcome
+
+
+# ============================================================================
+# BREAKER
+# ============================================================================
+
+class CircuitBreaker:
+    """
+    Thread-safe closed / open / half-open breaker for blocking calls.
+
+    Usage:
+        breaker = CircuitBreaker()
+        rows = breaker.call(lambda: query.execute().data)
+        fetch = breaker.guard(fetch)     # same, as a wrapped callable
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        slow_call_seconds: float = SLOW_CALL_SECONDS,
+        reset_timeout: float = RESET_TIMEOUT_SECONDS
+    ):
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+        self.short_circuited = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.state != CLOSED
+
+    def _before_call(self):
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            if (self.state == OPEN
+                    and time.monotonic() - self.opened_at >= self.reset_timeout
+                    and not self._trial_in_flight):
+                self.state = HALF_OPEN
+                self._trial_in_flight = True
+                return
+            self.short_circuited += 1
+            raise CircuitOpenError("Database circuit is open; serving from local cache")
+
+    def _record(self, ok: bool):
+        with self._lock:
+            self._trial_in_flight = False
+            if ok:
+                self.state = CLOSED
+                self.failures = 0
+                return
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.trips += 1
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn unless the breaker is open.
+
+        Raises:
+            CircuitOpenError: While open (no call is made)
+            Whatever fn raises (recorded as a failure)
+        """
+        self._before_call()
+        started = time.monotonic()
+        try:
+            result = fn()
+        except Exception as e:
+            # The database answered: it is up, the request was just bad
+            self._record(is_client_error(e))
+            raise
+        self._record(time.monotonic() - started < self.slow_call_seconds)
+        return result
+
+    def guard(self, fn: Callable[[], Any]) -> Callable[[], Any]:
+        return lambda: self.call(fn)
+
+    async def run_probe(self, probe: Callable[[], Any], interval: float = PROBE_INTERVAL_SECONDS):
+        """
+        Health-probe loop: while the breaker is open, try a cheap query
+        once the reset timeout has passed and close it on success.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            if self.state != OPEN:
+                continue
+            try:
+                await asyncio.to_thread(self.call, probe)
+            except Exception:
+                pass
+
+    def metrics(self) -> Dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "trips": self.trips,
+            "short_circuited": self.short_circuited,
+        }
+
@@ -0,0 +1,195 @@
+"""
+God Mode Engine — Database Transport
+=====================================
+Pooled, keep-alive HTTP transport for Supabase/PostgREST with a global
+concurrency governor.
+
+Every `.execute()` on a client from `create_db_client` goes through one
+httpx connection pool (bounded size, keep-alive, explicit timeouts) and
+one BoundedSemaphore that caps in-flight database requests per process.
+When the cap is reached, callers queue for up to `acquire_timeout` seconds
+and then fail fast with httpx.PoolTimeout instead of piling more load onto
+the database.
+
+The semaphore is acquired inside the transport, i.e. in whichever thread
+runs the request (the event loop for direct calls, a worker thread for
+calls made via asyncio.to_thread), so it governs both paths.
+
+Configuration (environment, all optional):
+    DB_POOL_SIZE           max open connections            (default 20)
+    DB_KEEPALIVE           idle keep-alive connections     (default 10)
+    DB_KEEPALIVE_EXPIRY    seconds an idle conn is kept    (default 30)
+    DB_CONNECT_TIMEOUT     seconds                         (default 5)
+    DB_READ_TIMEOUT        seconds                         (default 10)
+    DB_MAX_IN_FLIGHT       concurrent requests             (default 16)
+    DB_ACQUIRE_TIMEOUT     seconds to wait for a slot      (default 5)
+
+Author: Smarter.Poker Engineering
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import httpx
+from supabase import ClientOptions, create_client
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+@dataclass
+class TransportConfig:
+    """Pool, timeout and concurrency limits for one process."""
+    pool_size: int = 20
+    keepalive: int = 10
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 5.0
+    read_timeout: float = 10.0
+    max_in_flight: int = 16
+    acquire_timeout: float = 5.0
+
+    @classmethod
+    def from_env(cls) -> "TransportConfig":
+        defaults = cls()
+        return cls(
+            pool_size=int(os.environ.get("DB_POOL_SIZE", defaults.pool_size)),
+            keepalive=int(os.environ.get("DB_KEEPALIVE", defaults.keepalive)),
+            keepalive_expiry=float(os.environ.get("DB_KEEPALIVE_EXPIRY", defaults.keepalive_expiry)),
+            connect_timeout=float(os.environ.get("DB_CONNECT_TIMEOUT", defaults.connect_timeout)),
+            read_timeout=float(os.environ.get("DB_READ_TIMEOUT", defaults.read_timeout)),
+            max_in_flight=int(os.environ.get("DB_MAX_IN_FLIGHT", defaults.max_in_flight)),
+            acquire_timeout=float(os.environ.get("DB_ACQUIRE_TIMEOUT", defaults.acquire_timeout)),
+        )
+
+
+# ============================================================================
+# GOVERNOR
+# ============================================================================
+
+class DBGovernor:
+    """Caps concurrent DB requests and records queue-wait / utilization."""
+
+    def __init__(self, max_in_flight: int, acquire_timeout: float):
+        self.max_in_flight = max_in_flight
+        self.acquire_timeout = acquire_timeout
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=1024)  # Recent queue waits (seconds)
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests = 0
+        self.rejected = 0
+        self.errors = 0
+        self.busy_seconds = 0.0  # Sum of request durations, for utilization
+        self._started = time.monotonic()
+
+    def acquire(self) -> float:
+        """
+        Take a slot, waiting up to acquire_timeout.
+
+        Returns:
+            Seconds spent queued
+
+        Raises:
+            httpx.PoolTimeout: If no slot freed up in time
+        """
+        queued = time.monotonic()
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            with self._lock:
+                self.rejected += 1
+            raise httpx.PoolTimeout(
+                f"Database concurrency limit ({self.max_in_flight}) busy for {self.acquire_timeout}s"
+            )
+        wait = time.monotonic() - queued
+        with self._lock:
+            self._waits.append(wait)
+            self.in_flight += 1
+            self.requests += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        return wait
+
+    def release(self, duration: float, failed: bool = False):
+        with self._lock:
+            self.in_flight -= 1
+            self.busy_seconds += duration
+            if failed:
+                self.errors += 1
+        self._slots.release()
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            waits = sorted(self._waits)
+            elapsed = max(time.monotonic() - self._started, 1e-9)
+            return {
+                "max_in_flight": self.max_in_flight,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                "requests": self.requests,
+                "rejected": self.rejected,
+                "errors": self.errors,
+                "utilization": round(self.in_flight / self.max_in_flight, 3),
+                "avg_utilization": round(self.busy_seconds / elapsed / self.max_in_flight, 3),
+                "queue_wait_ms_p50": round(waits[len(waits) // 2] * 1000, 2) if waits else 0.0,
+                "queue_wait_ms_p95": round(waits[int(len(waits) * 0.95)] * 1000, 2) if waits else 0.0,
+                "queue_wait_ms_max": round(waits[-1] * 1000, 2) if waits else 0.0,
+            }
+
+
+# ============================================================================
+# TRANSPORT
+# ============================================================================
+
+class GovernedTransport(httpx.HTTPTransport):
+    """httpx transport that holds a governor slot for each request."""
+
+    def __init__(self, governor: DBGovernor, **kwargs):
+        super().__init__(**kwargs)
+        self.governor = governor
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.governor.acquire()
+        started = time.monotonic()
+        failed = True
+        try:
+            response = super().handle_request(request)
+            failed = response.status_code >= 500
+            return response
+        finally:
+            self.governor.release(time.monotonic() - started, failed)
+
+
+def build_http_client(config: TransportConfig, governor: DBGovernor) -> httpx.Client:
+    """Keep-alive httpx client with bounded pool and explicit timeouts."""
+    return httpx.Client(
+        transport=GovernedTransport(
+            governor,
+            limits=httpx.Limits(
+                max_connections=config.pool_size,
+                max_keepalive_connections=config.keepalive,
+                keepalive_expiry=config.keepalive_expiry,
+            ),
+            http2=False,
+        ),
+        timeout=httpx.Timeout(config.read_timeout, connect=config.connect_timeout),
+    )
+
+
+def create_db_client(url: str, key: str, config: Optional[TransportConfig] = None):
+    """
+    Supabase client whose PostgREST calls use the governed pool.
+
+    Returns:
+        Tuple of (supabase Client, DBGovernor for metrics)
+    """
+    config = config or TransportConfig.from_env()
+    governor = DBGovernor(config.max_in_flight, config.acquire_timeout)
+    options = ClientOptions(
+        httpx_client=build_http_client(config, governor),
+        postgrest_client_timeout=config.read_timeout,
+    )
+    return create_client(url, key, options=options), governor
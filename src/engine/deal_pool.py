@@ -0,0 +1,396 @@
+"""
+God Mode Engine — Rigged Deal Pools
+====================================
+Concrete, verifiable deals for the SCENARIO engine's rigged outcomes.
+
+A scenario that promises a "cooler" or a "bad beat" gets a real heads-up
+deal (hero hole cards, villain hole cards, five-card runout) whose outcome
+was checked with the hand evaluator. Deals are generated in vectorized
+batches, kept in one pool per (outcome, intensity), and popped in O(1);
+each pop applies a random suit permutation so the same deal rarely looks
+the same twice. Pops never generate: an empty pool returns None (the
+scenario plays its script without a concrete deal) and wakes the refill
+thread.
+
+Outcomes (hero always loses the showdown except for card_dead):
+- bad_beat:   hero is a big favourite on the flop and loses on the river
+- cooler:     hero makes a strong hand with its hole cards (better than
+              the board alone), is set or ahead on the flop, and runs into
+              a stronger hand
+- setup_hand: premium pocket pair vs a bigger premium pocket pair
+- card_dead:  hero is dealt a trash starting hand
+
+Intensity 1-3 tightens each outcome's threshold (see INTENSITY_RULES).
+
+Replay: pools are filled from the pool's own generator by a background
+thread, and which deal a session pops depends on every other session's
+pops, so SCENARIO deal cards are NOT reproducible from a session seed.
+The session stream only picks the suit permutation (drawn on every pop,
+hit or miss, so it stays in step on replay); the cards actually dealt are
+recorded on the session (SessionState.deal_cards) instead.
+
+Author: Smarter.Poker Engineering
+"""
+
+import threading
+from collections import deque
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+from typing import Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .chart_index import DECK, SUITS, hand_class_index
+from .evaluator import evaluate, evaluate_batch, hand_category, CATEGORY_NAMES
+from .pushfold import combo_matrix, equity_matrix
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+OUTCOMES = ("bad_beat", "cooler", "setup_hand", "card_dead")
+
+INTENSITIES = (1, 2, 3)
+
+# Per-intensity thresholds:
+# - bad_beat:   minimum hero equity on the flop
+# - cooler:     minimum hero hand category at showdown (3 = trips, 6 = full house)
+# - setup_hand: minimum rank value of the lower pocket pair (8 = TT, 10 = QQ)
+# - card_dead:  maximum hero preflop equity against a random hand
+INTENSITY_RULES: Dict[str, Tuple[float, float, float]] = {
+    "bad_beat": (0.70, 0.80, 0.90),
+    "cooler": (3, 4, 6),
+    "setup_hand": (8, 9, 10),
+    "card_dead": (0.40, 0.37, 0.34),
+}
+
+POOL_TARGET = 200  # Deals kept per (outcome, intensity)
+POOL_LOW_WATER = 50  # Refill below this
+GENERATION_BATCH = 20_000  # Random deals examined per vectorized pass
+REFILL_INTERVAL_SECONDS = 5.0
+
+# A cooler's hero must be ahead on the flop, or strong there (trips or
+# better using a hole card) and not drawing (nearly) dead; anything else is
+# a suckout, not a cooler
+COOLER_FLOP_CATEGORY = 3
+COOLER_AHEAD_EQUITY = 0.5
+COOLER_MIN_FLOP_EQUITY = 0.05
+
+
+def intensity_for_level(level: int) -> int:
+    """Levels 1-3 -> 1, 4-6 -> 2, 7-10 -> 3."""
+    return 1 if level <= 3 else 2 if level <= 6 else 3
+
+
+# ============================================================================
+# DEALS
+# ============================================================================
+
+@dataclass(frozen=True)
+class RiggedDeal:
+    """One heads-up deal with a known outcome (cards as DECK strings)."""
+    outcome: str
+    intensity: int
+    hero: Tuple[str, str]
+    villain: Tuple[str, str]
+    board: Tuple[str, str, str, str, str]
+    hero_flop_equity: float
+    hero_hand: str  # Showdown category name, e.g. "Full House"
+    villain_hand: str
+
+    def permuted(self, suit_map: Dict[str, str]) -> "RiggedDeal":
+        """Same deal with every suit relabelled via suit_map ("s" -> "h", ...)."""
+        def relabel(cards):
+            return tuple(card[0] + suit_map[card[1]] for card in cards)
+        return RiggedDeal(
+            outcome=self.outcome,
+            intensity=self.intensity,
+            hero=relabel(self.hero),
+            villain=relabel(self.villain),
+            board=relabel(self.board),
+            hero_flop_equity=self.hero_flop_equity,
+            hero_hand=self.hero_hand,
+            villain_hand=self.villain_hand,
+        )
+
+    def verify(self) -> bool:
+        """Re-evaluate the showdown; True if villain wins (or for card_dead, always)."""
+        hero = evaluate(list(self.hero + self.board))
+        villain = evaluate(list(self.villain + self.board))
+        return self.outcome == "card_dead" or villain > hero
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        data["flop"] = list(self.board[:3])
+        data["turn"] = self.board[3]
+        data["river"] = self.board[4]
+        return data
+
+
+# ============================================================================
+# GENERATION
+# ============================================================================
+
+@lru_cache(maxsize=1)
+def _class_strength() -> np.ndarray:
+    """Preflop equity of each hand class against a random hand."""
+    matrix, _ = equity_matrix()
+    combos = combo_matrix()
+    return (np.asarray(matrix, dtype=np.float64) * combos).sum(axis=1) / combos.sum(axis=1)
+
+
+@lru_cache(maxsize=1)
+def _combo_classes() -> np.ndarray:
+    """52x52 lookup of hand class index for every ordered card pair."""
+    classes = np.zeros((52, 52), dtype=np.int16)
+    for a in range(52):
+        for b in range(52):
+            if a != b:
+                classes[a, b] = hand_class_index(DECK[a] + DECK[b])
+    return classes
+
+
+@lru_cache(maxsize=1)
+def _turn_river_positions() -> np.ndarray:
+    """All C(45,2) = 990 turn/river position pairs within a 45-card stub."""
+    a, b = np.triu_indices(45, k=1)
+    return np.stack([a, b], axis=1)
+
+
+def _random_deals(rng: np.random.Generator, n: int) -> np.ndarray:
+    """(n, 9) card ints: hero 0-1, villain 2-3, board 4-8."""
+    return rng.random((n, 52)).argpartition(9, axis=1)[:, :9]
+
+
+def _deals_with_holes(rng: np.random.Generator, holes: np.ndarray) -> np.ndarray:
+    """Complete (n, 4) hole cards with random boards from the remaining deck."""
+    n = len(holes)
+    keys = rng.random((n, 52))
+    np.put_along_axis(keys, holes.astype(np.intp), 2.0, axis=1)
+    boards = keys.argpartition(5, axis=1)[:, :5]
+    return np.hstack([holes, boards])
+
+
+def flop_equity(deals: np.ndarray) -> np.ndarray:
+    """Hero's exact equity after the flop (ties half) for (n, 9) deals."""
+    positions = _turn_river_positions()
+    result = np.zeros(len(deals))
+    for k, deal in enumerate(deals):
+        stub = np.setdiff1d(np.arange(52), deal[:7])
+        runouts = stub[positions]
+        flop = np.broadcast_to(deal[4:7], (len(runouts), 3))
+        hero = evaluate_batch(np.hstack([np.broadcast_to(deal[:2], (len(runouts), 2)), flop, runouts]))
+        villain = evaluate_batch(np.hstack([np.broadcast_to(deal[2:4], (len(runouts), 2)), flop, runouts]))
+        result[k] = (np.count_nonzero(hero > villain) + 0.5 * np.count_nonzero(hero == villain)) / len(runouts)
+    return result
+
+
+def _flop_board_category(flops: np.ndarray) -> np.ndarray:
+    """Category the three flop cards make alone (0 high card, 1 pair, 3 trips)."""
+    ranks = np.sort(flops // 4, axis=1)
+    pairs = (ranks[:, 0] == ranks[:, 1]).astype(np.int8) + (ranks[:, 1] == ranks[:, 2])
+    return np.where(pairs == 2, 3, pairs)
+
+
+def _showdown(deals: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    board = deals[:, 4:9]
+    return (
+        evaluate_batch(np.hstack([deals[:, 0:2], board])),
+        evaluate_batch(np.hstack([deals[:, 2:4], board])),
+    )
+
+
+def generate_deals(
+    outcome: str,
+    intensity: int,
+    count: int,
+    rng: Optional[np.random.Generator] = None,
+    max_batches: int = 50
+) -> List[RiggedDeal]:
+    """
+    Generate up to `count` deals of one outcome/intensity.
+
+    bad_beat and cooler filter uniformly random deals; setup_hand and
+    card_dead construct the hole cards directly (they are too rare to find
+    by filtering) and complete them with random boards.
+
+    Raises:
+        ValueError: For an unknown outcome or intensity
+    """
+    if outcome not in INTENSITY_RULES or intensity not in INTENSITIES:
+        raise ValueError(f"Unknown rigged outcome {outcome!r} / intensity {intensity}")
+    rng = rng or np.random.default_rng()
+    threshold = INTENSITY_RULES[outcome][intensity - 1]
+    deals: List[RiggedDeal] = []
+
+    for _ in range(max_batches):
+        if outcome == "setup_hand":
+            batch = _deals_with_holes(rng, _setup_holes(rng, int(threshold), GENERATION_BATCH // 10))
+        elif outcome == "card_dead":
+            batch = _deals_with_holes(rng, _card_dead_holes(rng, threshold, GENERATION_BATCH // 10))
+        else:
+            batch = _random_deals(rng, GENERATION_BATCH)
+
+        hero, villain = _showdown(batch)
+        if outcome == "card_dead":
+            keep = np.ones(len(batch), dtype=bool)
+        else:
+            keep = villain > hero
+        flop_strong = None
+        if outcome == "cooler":
+            # The hole cards must make the hand: not the board playing
+            category = hand_category(hero)
+            keep &= (category >= threshold) & (category > hand_category(evaluate_batch(batch[:, 4:9])))
+            flop_category = hand_category(evaluate_batch(batch[:, [0, 1, 4, 5, 6]]))
+            flop_strong = (flop_category >= COOLER_FLOP_CATEGORY) & (
+                flop_category > _flop_board_category(batch[:, 4:7])
+            )
+        elif outcome == "bad_beat":
+            hero_flop = evaluate_batch(batch[:, [0, 1, 4, 5, 6]])
+            villain_flop = evaluate_batch(batch[:, [2, 3, 4, 5, 6]])
+            keep &= hero_flop > villain_flop
+
+        # bad_beat and cooler filter on flop equity, so they over-select
+        needed = count - len(deals)
+        rows = np.flatnonzero(keep)[: 4 * needed if outcome in ("bad_beat", "cooler") else needed]
+        equity = flop_equity(batch[rows])
+        if outcome == "bad_beat":
+            rows, equity = rows[equity >= threshold], equity[equity >= threshold]
+        elif outcome == "cooler":
+            ok = (equity >= COOLER_AHEAD_EQUITY) | (flop_strong[rows] & (equity >= COOLER_MIN_FLOP_EQUITY))
+            rows, equity = rows[ok], equity[ok]
+
+        for row, eq in zip(rows[: count - len(deals)], equity):
+            cards = [DECK[c] for c in batch[row]]
+            deals.append(RiggedDeal(
+                outcome=outcome,
+                intensity=intensity,
+                hero=(cards[0], cards[1]),
+                villain=(cards[2], cards[3]),
+                board=tuple(cards[4:9]),
+                hero_flop_equity=round(float(eq), 4),
+                hero_hand=CATEGORY_NAMES[hand_category(int(hero[row]))],
+                villain_hand=CATEGORY_NAMES[hand_category(int(villain[row]))],
+            ))
+        if len(deals) >= count:
+            break
+    return deals
+
+
+def _setup_holes(rng: np.random.Generator, min_rank: int, n: int) -> np.ndarray:
+    """Hero pair and a strictly bigger villain pair, both >= min_rank (0 = deuce)."""
+    # rank value v -> rank index 12 - v, cards rank_index*4 + suit
+    villain_rank = rng.integers(min_rank + 1, 13, size=n)
+    hero_rank = np.array([rng.integers(min_rank, v) for v in villain_rank])
+    hero_suits = np.argsort(rng.random((n, 4)), axis=1)[:, :2]
+    villain_suits = np.argsort(rng.random((n, 4)), axis=1)[:, :2]
+    hero = (12 - hero_rank)[:, None] * 4 + hero_suits
+    villain = (12 - villain_rank)[:, None] * 4 + villain_suits
+    return np.hstack([hero, villain])
+
+
+def _card_dead_holes(rng: np.random.Generator, max_equity: float, n: int) -> np.ndarray:
+    """Hero holding a hand class weaker than max_equity vs random; random villain."""
+    holes = _random_deals(rng, n * 4)[:, :4]
+    strength = _class_strength()[_combo_classes()[holes[:, 0], holes[:, 1]]]
+    return holes[strength <= max_equity][:n]
+
+
+# ============================================================================
+# POOLS
+# ============================================================================
+
+class DealPool:
+    """
+    Per-(outcome, intensity) deques of pre-generated deals.
+
+    Usage:
+        pool = DealPool()
+        pool.start_refill_worker()          # background top-ups
+        deal = pool.pop("cooler", 3, rng)   # O(1), suit-permuted
+    """
+
+    def __init__(self, target: int = POOL_TARGET, low_water: int = POOL_LOW_WATER):
+        self.target = target
+        self.low_water = low_water
+        self.pools: Dict[Tuple[str, int], Deque[RiggedDeal]] = {
+            (outcome, intensity): deque()
+            for outcome in OUTCOMES
+            for intensity in INTENSITIES
+        }
+        self._rng = np.random.default_rng()
+        self._lock = threading.Lock()  # Serializes refills; pops never take it
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self.misses = 0
+        self._worker: Optional[threading.Thread] = None
+
+    def pop(self, outcome: str, intensity: int, rng) -> Optional[RiggedDeal]:
+        """
+        Take one deal and relabel its suits.
+
+        Called on the event loop, so it never generates: if the pool is
+        empty (the refill worker has not caught up yet) it returns None and
+        wakes the worker.
+
+        Args:
+            outcome: One of OUTCOMES
+            intensity: 1-3 (see intensity_for_level)
+            rng: random.Random-like source for the suit permutation (the
+                deal itself does not come from it; see the module docstring)
+        """
+        # Drawn before the pool is checked: the session stream advances the
+        # same way whether or not a deal is available
+        shuffled = list(SUITS)
+        rng.shuffle(shuffled)
+
+        pool = self.pools.get((outcome, intensity))
+        if pool is None:
+            return None
+        try:
+            deal = pool.popleft()
+        except IndexError:
+            self.misses += 1
+            self._wake.set()
+            return None
+        if len(pool) < self.low_water:
+            self._wake.set()
+        return deal.permuted(dict(zip(SUITS, shuffled)))
+
+    def sizes(self) -> Dict[str, int]:
+        return {f"{outcome}:{intensity}": len(pool) for (outcome, intensity), pool in self.pools.items()}
+
+    def refill(self):
+        """Top up every pool that is below its low-water mark."""
+        with self._lock:
+            for (outcome, intensity), pool in self.pools.items():
+                if len(pool) < self.low_water:
+                    # deque.extend is atomic, so concurrent pops are safe
+                    pool.extend(generate_deals(outcome, intensity, self.target - len(pool), self._rng))
+
+    # ------------------------------------------------------------------------
+    # Background refill
+    # ------------------------------------------------------------------------
+
+    def start_refill_worker(self, interval: float = REFILL_INTERVAL_SECONDS):
+        """Fill all pools, then keep them topped up from a daemon thread."""
+        if self._worker is not None and self._worker.is_alive():
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.is_set():
+                self._wake.clear()
+                self.refill()
+                self._wake.wait(interval)
+
+        self._worker = threading.Thread(target=run, name="deal-pool-refill", daemon=True)
+        self._worker.start()
+
+    def stop_refill_worker(self):
+        self._stop.set()
+        self._wake.set()
+        if self._worker is not None:
+            self._worker.join(timeout=5)
+            self._worker = None
@@ -0,0 +1,154 @@
+"""
+God Mode Engine — Spot Difficulty
+==================================
+Scores solver spots at ingest and lets the engine pick a spot whose
+difficulty matches the player's level without extra queries.
+
+A spot's difficulty (0.0 easy – 1.0 hard) blends three signals over every
+hand in its strategy matrix:
+
+- EV gap:            how close the best action is to the runner-up
+                     (exp(-gap / GAP_SCALE_BB), so a 0 bb gap scores 1)
+- Mixed share:       fraction of hands the solver plays as a mix
+- Close alternatives: share of non-best actions within CLOSE_EV_BB of best
+
+At ingest the score is also cut into DIFFICULTY_BUCKETS equal bins
+(difficulty_bucket). The engine instead buckets by percentile within each
+filter combination: a filter set whose spots all score 0.3-0.5 would
+otherwise leave most levels drawing from the same one or two bins.
+DifficultyIndex holds spot ids per bucket for one filter combination and
+samples a level-appropriate id in O(1), falling back to the nearest
+non-empty bucket.
+
+Author: Smarter.Poker Engineering
+"""
+
+import math
+from typing import Dict, Iterable, List, Optional
+
+from .rng import SessionRNG
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+DIFFICULTY_BUCKETS = 10  # One per training level
+GAP_SCALE_BB = 1.0
+CLOSE_EV_BB = 0.25
+
+WEIGHT_GAP = 0.45
+WEIGHT_MIXED = 0.35
+WEIGHT_CLOSE = 0.20
+
+
+# ============================================================================
+# SCORING
+# ============================================================================
+
+def spot_difficulty(strategy_matrix: Dict[str, Dict]) -> float:
+    """
+    Difficulty of one solved spot.
+
+    Args:
+        strategy_matrix: {hand: {"actions": {name: {"ev": ...}}, "is_mixed": ...}}
+            as written by scripts/ingest_god_mode.py
+
+    Returns:
+        Score in [0.0, 1.0] (0.0 for an empty matrix)
+    """
+    gap_total = mixed_total = close_total = 0.0
+    hands = 0
+    for entry in strategy_matrix.values():
+        evs = sorted(
+            (float(a.get("ev", 0.0)) for a in entry.get("actions", {}).values()),
+            reverse=True
+        )
+        if len(evs) < 2:
+            continue
+        hands += 1
+        gap_total += math.exp(-(evs[0] - evs[1]) / GAP_SCALE_BB)
+        mixed_total += 1.0 if entry.get("is_mixed") else 0.0
+        close = sum(1 for ev in evs[1:] if evs[0] - ev <= CLOSE_EV_BB)
+        close_total += close / (len(evs) - 1)
+
+    if hands == 0:
+        return 0.0
+    score = (
+        WEIGHT_GAP * gap_total / hands
+        + WEIGHT_MIXED * mixed_total / hands
+        + WEIGHT_CLOSE * close_total / hands
+    )
+    return round(min(1.0, max(0.0, score)), 4)
+
+
+def difficulty_bucket(score: float) -> int:
+    """1..DIFFICULTY_BUCKETS for a score in [0, 1]."""
+    return min(DIFFICULTY_BUCKETS, 1 + int(score * DIFFICULTY_BUCKETS))
+
+
+def level_bucket(level: int) -> int:
+    """Bucket a training level draws from (levels beyond the range clamp)."""
+    return min(DIFFICULTY_BUCKETS, max(1, level))
+
+
+# ============================================================================
+# INDEX
+# ============================================================================
+
+class DifficultyIndex:
+    """
+    Spot ids for one filter combination, bucketed by difficulty.
+
+    Usage:
+        index = DifficultyIndex.from_rows(rows)   # rows: {"id", "difficulty"}
+        spot_id = index.sample(level, rng)
+    """
+
+    def __init__(self):
+        self.buckets: List[List[str]] = [[] for _ in range(DIFFICULTY_BUCKETS + 1)]
+        self._nearest: List[int] = [0] * (DIFFICULTY_BUCKETS + 1)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict]) -> "DifficultyIndex":
+        """
+        Build from (id, difficulty) rows, bucketed by percentile of the
+        score among these rows (equal-count buckets; ties broken by id).
+        Rows not scored yet (difficulty NULL) go to the middle bucket.
+        """
+        index = cls()
+        middle = (DIFFICULTY_BUCKETS + 1) // 2
+        scored = []
+        for row in rows:
+            if row.get("difficulty") is None:
+                index.buckets[middle].append(row["id"])
+            else:
+                scored.append((float(row["difficulty"]), str(row["id"]), row["id"]))
+        scored.sort()
+        for rank, (_, _, spot_id) in enumerate(scored):
+            index.buckets[1 + rank * DIFFICULTY_BUCKETS // len(scored)].append(spot_id)
+        index._link()
+        return index
+
+    def _link(self):
+        """Precompute each bucket's nearest non-empty bucket (ties go easier)."""
+        filled = [b for b in range(1, DIFFICULTY_BUCKETS + 1) if self.buckets[b]]
+        for b in range(1, DIFFICULTY_BUCKETS + 1):
+            self._nearest[b] = min(filled, key=lambda f: (abs(f - b), f)) if filled else 0
+
+    def sample(self, level: int, rng: SessionRNG) -> Optional[str]:
+        """A random spot id from the level's bucket (or the nearest filled one)."""
+        bucket = self._nearest[level_bucket(level)]
+        if not bucket:
+            return None
+        ids = self.buckets[bucket]
+        return ids[rng.randint(0, len(ids) - 1)]
+
+    def ids_near(self, level: int) -> List[str]:
+        """All ids ordered by bucket distance from the level (fallback scans)."""
+        target = level_bucket(level)
+        order = sorted(range(1, DIFFICULTY_BUCKETS + 1), key=lambda b: (abs(b - target), b))
+        return [spot_id for b in order for spot_id in self.buckets[b]]
+
+    def __len__(self) -> int:
+        return sum(len(b) for b in self.buckets)
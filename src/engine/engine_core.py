@@ -8,6 +8,9 @@ This module provides:
 - Suit isomorphism ("The Magic Trick") for infinite content from finite files
 - Active villain resolution using weighted RNG
 - HP loss calculation with indifference rule support
+- Server-side CHART grading against compiled range charts
+- ICM table context (prize equity, bubble factor) for ICM/bubble charts
+- Per-session seeded RNG streams (SessionRNG) for deterministic replay
 
 Tables Used:
 - game_registry: 100 games with engine_type routing
@@ -17,14 +20,36 @@ Tables Used:
 Author: Smarter.Poker Engineering
 """
 
-import random
 import re
 import json
+import asyncio
 import hashlib
+import time
+from collections import OrderedDict
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 from enum import Enum
 
+from .chart_index import (
+    ACTION_NAMES,
+    CompiledChart,
+    action_matches,
+    deal_hand,
+    load_default_chart_index,
+)
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .deal_pool import DealPool, intensity_for_level
+from .difficulty import DifficultyIndex
+from .evaluator import tables
+from .icm import bubble_factor, icm_equity, satellite_payouts, standard_payouts
+from .preflop_equity import load_preflop_equity
+from .render_cache import RenderCache, RenderedHand
+from .review_queue import ReviewScheduler
+from .rng import SessionRNG
+from .single_flight import SingleFlight, query_key
+from .snapshot import EngineSnapshot
+from .pushfold import DEFAULT_ANTE_BB, parse_spot_key, seats_for, solve_chart
+
 
 # ============================================================================
 # DATA STRUCTURES
@@ -45,6 +70,7 @@ class HandResult:
     variant_hash: str
     hand_data: Dict[str, Any]
     config: Dict[str, Any]
+    is_review: bool = False  # Spaced-repetition replay of a missed spot
     
     
 @dataclass
@@ -55,6 +81,9 @@ class ChartInstruction:
     stack_bb: int
     villain_position: Optional[str] = None
     extra_params: Optional[Dict] = None
+    hero_hand: Optional[str] = None  # e.g., "AhKd"
+    hand_class: Optional[int] = None  # 0-168 index on the 13x13 grid
+    chart_id: Optional[str] = None  # Compiled chart used for grading
 
 
 @dataclass
@@ -63,6 +92,7 @@ class ScenarioInstruction:
     scenario_id: str
     script_name: str
     rigged_outcome: Optional[str] = None  # e.g., "bad_beat", "cooler"
+    deal: Optional[Dict] = None  # Concrete cards realizing rigged_outcome
     
 
 @dataclass
@@ -96,19 +126,41 @@ SUITS = ['s', 'h', 'd', 'c']
 # Rank regex for card detection
 CARD_PATTERN = re.compile(r'([AKQJT98765432])([shdc])')
 
+# Spots sampled per PIO hand while looking for an unseen suit variant
+SOLVER_SAMPLE_ATTEMPTS = 8
+
+# Per-filter-set difficulty index: refresh period, size cap and page size
+# (PostgREST returns at most 1000 rows per request by default)
+DIFFICULTY_INDEX_TTL_SECONDS = 600.0
+DIFFICULTY_INDEX_LIMIT = 5000
+DIFFICULTY_INDEX_PAGE = 1000
+
+# Solver rows kept by file_id so sessions can hold references, not payloads
+SOLVER_ROW_CACHE_SIZE = 20000
+
+# HP damage for a CHART mistake (charts have no per-action EV to scale by)
+CHART_MISTAKE_DAMAGE = 10
+
+# Chart types whose instructions carry an ICM table context
+ICM_CHART_TYPES = ('icm_ranges', 'bubble_pressure')
 
-def generate_suit_map() -> Tuple[Dict[str, str], str]:
+
+def generate_suit_map(rng: Optional[SessionRNG] = None) -> Tuple[Dict[str, str], str]:
     """
     Generate a random suit mapping for isomorphism.
     
+    Args:
+        rng: Session stream to draw from (a fresh stream if omitted)
+    
     Returns:
         Tuple of (suit_map dict, variant_hash string)
         
     Example:
         {"s": "h", "h": "d", "d": "c", "c": "s"} -> "s=h,h=d,d=c,c=s"
     """
+    rng = rng or SessionRNG()
     shuffled = SUITS.copy()
-    random.shuffle(shuffled)
+    rng.shuffle(shuffled)
     
     suit_map = {original: new for original, new in zip(SUITS, shuffled)}
     variant_hash = ",".join(f"{k}={v}" for k, v in sorted(suit_map.items()))
@@ -187,15 +239,77 @@ class GameEngine:
         result = engine.calculate_hp_loss("CALL", solver_node)
     """
     
-    def __init__(self, supabase_client):
+    def __init__(self, supabase_client, snapshot: Optional[EngineSnapshot] = None):
         """
         Initialize the engine with a Supabase client.
         
         Args:
             supabase_client: Authenticated Supabase client instance
+            snapshot: Optional boot snapshot (see src/engine/snapshot.py);
+                its registry and compiled charts are used as-is, so the
+                first requests need no database round trip
         """
         self.supabase = supabase_client
         self._game_cache: Dict[str, Dict] = {}
+        self.snapshot = snapshot
+        if snapshot is not None:
+            self.charts = snapshot.charts
+            self._game_cache.update(snapshot.games_by_key)
+        else:
+            self.charts = load_default_chart_index()
+        self.preflop_equity = load_preflop_equity()  # None until built
+        self.deal_pool = DealPool()  # Refilled by start_refill_worker()
+        self.history_buffer = None  # Optional HistoryWriteBuffer (server)
+        self.flights = SingleFlight()  # Coalesces identical concurrent reads
+        self.breaker = CircuitBreaker()  # Trips to degraded mode when the DB is slow/down
+        self._solver_rows: "OrderedDict[str, Dict]" = OrderedDict()  # file_id -> row (LRU)
+        self._difficulty_indexes: Dict[Tuple, Tuple[float, DifficultyIndex]] = {}
+        self.reviews = ReviewScheduler()  # Missed PIO spots, fed from the action path (store set by the server)
+        self.render_cache = RenderCache()  # (file_id, variant_hash) -> RenderedHand
+    
+    def preload(self):
+        """
+        Build every read-only structure up front.
+        
+        Called in the parent before forking workers so the evaluator tables
+        and the full game registry are shared copy-on-write instead of being
+        built lazily (and privately) in each worker.
+        """
+        tables()
+        if self.supabase is not None and self.snapshot is None:
+            self._apply_registry(self._fetch_registry())
+    
+    async def reconcile_registry(self) -> int:
+        """
+        Refresh the registry cache from the database in the background.
+        
+        Used after booting from a snapshot: requests are served from the
+        snapshot immediately and pick up any rows changed since the build
+        once this completes.
+        
+        Returns:
+            Number of games added or changed relative to the cache
+        """
+        if self.supabase is None:
+            return 0
+        rows = await asyncio.to_thread(self.breaker.call, self._fetch_registry)
+        return self._apply_registry(rows)
+    
+    def _fetch_registry(self) -> List[Dict]:
+        result = self.supabase.table('game_registry').select('*').execute()
+        return result.data or []
+    
+    def _apply_registry(self, rows: List[Dict]) -> int:
+        """Swap in a registry cache keyed by slug and id; returns changed games."""
+        fresh: Dict[str, Dict] = {}
+        changed = 0
+        for game in rows:
+            if self._game_cache.get(game['slug']) != game:
+                changed += 1
+            fresh[game['slug']] = game
+            fresh[game['id']] = game
+        self._game_cache = fresh
+        return changed
         
     # ========================================================================
     # MAIN API: fetch_next_hand
@@ -205,7 +319,8 @@ class GameEngine:
         self, 
         user_id: str, 
         game_id: str, 
-        current_level: int
+        current_level: int,
+        rng: Optional[SessionRNG] = None
     ) -> HandResult | ChartInstruction | ScenarioInstruction:
         """
         Fetch the next training hand for a user.
@@ -216,6 +331,8 @@ class GameEngine:
             user_id: UUID of the current user
             game_id: UUID or slug of the game from game_registry
             current_level: Current level (1-10) for difficulty scaling
+            rng: The session's random stream; every random choice for
+                this hand is drawn from it (a fresh stream if omitted)
             
         Returns:
             HandResult for PIO engine
@@ -229,16 +346,17 @@ class GameEngine:
         game = await self._get_game_config(game_id)
         engine_type = EngineType(game['engine_type'])
         config = game.get('config', {})
+        rng = rng or SessionRNG()
         
         # STEP B: Route to appropriate engine
         if engine_type == EngineType.PIO:
-            return await self._fetch_solver_hand(user_id, game_id, config, current_level)
+            return await self._fetch_solver_hand(user_id, game_id, config, current_level, rng)
             
         elif engine_type == EngineType.CHART:
-            return self._build_chart_instruction(config, current_level)
+            return self._build_chart_instruction(config, current_level, rng)
             
         elif engine_type == EngineType.SCENARIO:
-            return self._build_scenario_instruction(game_id, config, current_level)
+            return self._build_scenario_instruction(game_id, config, current_level, rng)
             
         raise ValueError(f"Unknown engine type: {engine_type}")
     
@@ -251,59 +369,72 @@ class GameEngine:
         user_id: str,
         game_id: str,
         config: Dict,
-        level: int
+        level: int,
+        rng: SessionRNG
     ) -> HandResult:
         """
         Fetch a hand from solved_spots_gold with suit isomorphism.
         
         CRITICAL LOGIC:
-        1. Query solved_spots_gold for candidates matching config
-        2. For each candidate, check if user has seen ALL 24 suit variations
+        1. Sample a spot matching config from the level's difficulty bucket
+        2. Check if user has seen ALL 24 suit variations of it
         3. If not all seen, pick a random unseen variation
         4. Apply suit rotation to the hand data
         5. Return the transformed hand with variant_hash
         
+        Due spaced-repetition reviews (see review_queue.py) are interleaved
+        ahead of step 1.
+        
         This creates 24x content multiplication from the solver database.
         """
-        # Build query filters from config
-        filters = self._build_solver_filters(config, level)
+        all_variants = self._generate_all_variant_hashes()
         
-        # Query candidate hands
-        query = self.supabase.table('solved_spots_gold').select('*')
+        # A missed spot that is due for review comes back in a new suit variant
+        review = await self.reviews.next_due(user_id, game_id, all_variants, rng)
+        if review is not None:
+            file_id, variant_hash = review
+            try:
+                return HandResult(
+                    engine_type=EngineType.PIO,
+                    file_id=file_id,
+                    variant_hash=variant_hash,
+                    hand_data=await self.resolve_solver_hand(file_id, variant_hash),
+                    config=config,
+                    is_review=True
+                )
+            except (ValueError, CircuitOpenError):
+                pass  # Spot deleted or DB down: deal a regular hand
         
-        for field, value in filters.items():
-            query = query.eq(field, value)
-            
-        # Get batch of candidates
-        result = query.limit(50).execute()
-        candidates = result.data if result.data else []
+        # Build query filters from config
+        filters = self._build_solver_filters(config, level)
         
-        if not candidates:
+        # Spots for this filter set, bucketed by difficulty (no query once warm)
+        index = await self._difficulty_index(filters)
+        if not len(index):
             raise ValueError(f"No solver hands found for config: {config}")
         
-        # Shuffle to randomize selection
-        random.shuffle(candidates)
+        # While the database is down only spots already in memory can be dealt
+        degraded = self.breaker.is_open
         
-        # Find a hand with an unseen variant
-        for candidate in candidates:
-            file_id = candidate['id']
+        # Sample level-appropriate spots until one has an unseen variant
+        tried = set()
+        for _ in range(SOLVER_SAMPLE_ATTEMPTS):
+            file_id = index.sample(level, rng)
+            if file_id in tried or (degraded and file_id not in self._solver_rows):
+                continue
+            tried.add(file_id)
             
             # Check which variants user has seen for this file
             seen_variants = await self._get_seen_variants(user_id, file_id)
-            
-            # Generate all 24 possible variant hashes
-            all_variants = self._generate_all_variant_hashes()
             unseen_variants = [v for v in all_variants if v not in seen_variants]
             
             if unseen_variants:
-                # Pick a random unseen variant
-                chosen_variant = random.choice(unseen_variants)
-                
-                # Parse the variant hash back to suit map
-                suit_map = self._parse_variant_hash(chosen_variant)
-                
-                # Apply suit rotation to hand data
-                rotated_data = self._rotate_suits(candidate, suit_map)
+                # Pick a random unseen variant and rotate the spot into it
+                chosen_variant = rng.choice(unseen_variants)
+                try:
+                    rotated_data = await self.resolve_solver_hand(file_id, chosen_variant)
+                except CircuitOpenError:
+                    continue
                 
                 return HandResult(
                     engine_type=EngineType.PIO,
@@ -313,19 +444,144 @@ class GameEngine:
                     config=config
                 )
         
-        # All variants seen for all candidates — need more content!
-        # Fallback: Return first candidate with identity rotation
-        fallback = candidates[0]
-        identity_map = {s: s for s in SUITS}
+        # All sampled variants seen — need more content!
+        # Fallback: closest-difficulty loadable spot with identity rotation
         identity_hash = ",".join(f"{s}={s}" for s in sorted(SUITS))
+        for file_id in index.ids_near(level):
+            if degraded and file_id not in self._solver_rows:
+                continue
+            return HandResult(
+                engine_type=EngineType.PIO,
+                file_id=file_id,
+                variant_hash=identity_hash,
+                hand_data=await self.resolve_solver_hand(file_id, identity_hash),
+                config=config
+            )
+        raise CircuitOpenError("Database circuit is open and no cached spot matches this game")
+    
+    async def _difficulty_index(self, filters: Dict) -> DifficultyIndex:
+        """
+        Difficulty-bucketed spot ids for one filter combination.
+        
+        Built from light (id, difficulty) keyset pages ordered by id, shared
+        by every session with the same filters and refreshed after
+        DIFFICULTY_INDEX_TTL_SECONDS. Ids are random UUIDs, so when a filter
+        set has more than DIFFICULTY_INDEX_LIMIT spots the first ones by id
+        are a uniform sample (and the same one on every worker). If the
+        refresh fails the stale index keeps serving; with no index at all,
+        one is built from the solver rows already in memory (degraded mode).
+        """
+        key = query_key('solved_spots_gold', 'difficulty_index', **filters)
+        cached = self._difficulty_indexes.get(key)
+        if cached is not None and time.monotonic() < cached[0]:
+            return cached[1]
+        
+        def fetch_index() -> DifficultyIndex:
+            rows: List[Dict] = []
+            while len(rows) < DIFFICULTY_INDEX_LIMIT:
+                query = self.supabase.table('solved_spots_gold').select('id, difficulty').order('id')
+                for field, value in filters.items():
+                    query = query.eq(field, value)
+                if rows:
+                    query = query.gt('id', rows[-1]['id'])
+                page = query.limit(min(DIFFICULTY_INDEX_PAGE, DIFFICULTY_INDEX_LIMIT - len(rows))).execute().data
+                if not page:
+                    break
+                rows.extend(page)
+            return DifficultyIndex.from_rows(rows)
+        
+        try:
+            index = await self.flights.do(key, self.breaker.guard(fetch_index))
+        except Exception as e:
+            if not isinstance(e, CircuitOpenError):
+                print(f"⚠️ Spot index query failed, serving cached spots: {e}")
+            if cached is not None:
+                return cached[1]
+            resident = [
+                row for row in self._solver_rows.values()
+                if all(row.get(field) == value for field, value in filters.items())
+            ]
+            if not resident:
+                raise
+            return DifficultyIndex.from_rows(resident)
         
-        return HandResult(
-            engine_type=EngineType.PIO,
-            file_id=fallback['id'],
-            variant_hash=identity_hash,
-            hand_data=fallback,
-            config=config
+        self._difficulty_indexes[key] = (time.monotonic() + DIFFICULTY_INDEX_TTL_SECONDS, index)
+        return index
+    
+    def _remember_solver_row(self, row: Dict):
+        self._solver_rows[row['id']] = row
+        self._solver_rows.move_to_end(row['id'])
+        if len(self._solver_rows) > SOLVER_ROW_CACHE_SIZE:
+            self._solver_rows.popitem(last=False)
+    
+    async def resolve_solver_hand(self, file_id: str, variant_hash: str) -> Dict:
+        """
+        Rebuild a dealt PIO hand from its references.
+        
+        Sessions store only (file_id, variant_hash); see render_solver_hand.
+        
+        Returns:
+            The rotated hand data, as it was dealt (shared: read-only)
+            
+        Raises:
+            ValueError: If the spot no longer exists
+        """
+        return (await self.render_solver_hand(file_id, variant_hash)).hand_data
+    
+    async def render_solver_hand(self, file_id: str, variant_hash: str) -> RenderedHand:
+        """
+        The rotated, display-ready form of one spot in one suit variant.
+        
+        Served from the process-wide render cache; on a miss the row comes
+        from the shared per-worker row cache, or one lookup by id (another
+        worker dealt it, or it was evicted), and is rotated and rendered
+        once for every later session.
+        
+        Args:
+            file_id: solved_spots_gold id
+            variant_hash: Suit rotation the hand is dealt with
+            
+        Raises:
+            ValueError: If the spot no longer exists
+        """
+        key = (file_id, variant_hash)
+        rendered = self.render_cache.get(key)
+        if rendered is not None:
+            return rendered
+        
+        row = self._solver_rows.get(file_id)
+        if row is None:
+            def fetch_row() -> List[Dict]:
+                result = self.supabase.table('solved_spots_gold') \
+                    .select('*') \
+                    .eq('id', file_id) \
+                    .execute()
+                return result.data
+            
+            rows = await self.flights.do(
+                query_key('solved_spots_gold', id=file_id),
+                self.breaker.guard(fetch_row)
+            )
+            if not rows:
+                raise ValueError(f"Solver spot not found: {file_id}")
+            row = rows[0]
+            self._remember_solver_row(row)
+        
+        hand_data = self._rotate_suits(row, self._parse_variant_hash(variant_hash))
+        display = format_hand_for_display(hand_data)
+        narrative = build_narrative_summary(hand_data)
+        display_json = json.dumps(display).encode()
+        narrative_json = json.dumps(narrative).encode()
+        rendered = RenderedHand(
+            hand_data=hand_data,
+            display=display,
+            narrative=narrative,
+            display_json=display_json,
+            narrative_json=narrative_json,
+            size=len(json.dumps(hand_data)) + len(display_json) + len(narrative_json),
         )
+        self.render_cache.put(key, rendered)
+        return rendered
     
     async def _get_seen_variants(self, user_id: str, file_id: str) -> set:
         """
@@ -338,15 +594,24 @@ class GameEngine:
         Returns:
             Set of variant_hash strings the user has already played
         """
-        result = self.supabase.table('user_hand_history') \
-            .select('variant_hash') \
-            .eq('user_id', user_id) \
-            .eq('file_id', file_id) \
-            .execute()
-            
-        if result.data:
-            return {row['variant_hash'] for row in result.data}
-        return set()
+        def fetch_seen():
+            return self.supabase.table('user_hand_history') \
+                .select('variant_hash') \
+                .eq('user_id', user_id) \
+                .eq('file_id', file_id) \
+                .execute()
+        
+        try:
+            result = await asyncio.to_thread(self.breaker.call, fetch_seen)
+            seen = {row['variant_hash'] for row in result.data} if result.data else set()
+        except Exception:
+            # Degraded mode: only this worker's unsaved rows are known
+            seen = set()
+        
+        # Include rows still waiting in this worker's write buffer
+        if self.history_buffer is not None:
+            seen |= self.history_buffer.pending_variants(user_id, file_id)
+        return seen
     
     def _generate_all_variant_hashes(self) -> List[str]:
         """
@@ -386,7 +651,8 @@ class GameEngine:
         
         Args:
             config: Game configuration from registry
-            level: Current difficulty level (affects hand complexity)
+            level: Current difficulty level (not a filter: spots are picked
+                per level from the filter set's DifficultyIndex)
             
         Returns:
             Dict of field=value filters for the query
@@ -498,29 +764,34 @@ class GameEngine:
     def _build_chart_instruction(
         self, 
         config: Dict, 
-        level: int
+        level: int,
+        rng: Optional[SessionRNG] = None
     ) -> ChartInstruction:
         """
         Build instruction for CHART engine frontend.
         
         Chart games use static JSON files, not solver queries.
-        The frontend loads the appropriate chart UI.
+        The frontend loads the appropriate chart UI; the dealt hand is
+        graded server-side against the compiled chart (see grade_chart_action).
         
         Args:
             config: Game configuration with chart parameters
             level: Difficulty level (affects stack depths, etc.)
+            rng: Session stream (a fresh stream if omitted)
             
         Returns:
             ChartInstruction for frontend to render
         """
+        rng = rng or SessionRNG()
+        
         # Generate a random scenario based on config
         positions = ['BTN', 'CO', 'HJ', 'LJ', 'SB', 'BB']
         
-        hero_pos = config.get('position', random.choice(positions))
+        hero_pos = config.get('position', rng.choice(positions))
         
         # Scale stack based on level (lower levels = more desperate stacks)
         base_stack = config.get('stack', 15)
-        stack_variance = random.randint(-3, 3)
+        stack_variance = rng.randint(-3, 3)
         stack_bb = max(5, min(25, base_stack + stack_variance))
         
         # Determine chart type
@@ -534,18 +805,219 @@ class GameEngine:
         villain_pos = None
         if chart_type in ['3bet_range', 'squeeze', 'resteal']:
             available = [p for p in positions if p != hero_pos]
-            villain_pos = random.choice(available)
+            villain_pos = rng.choice(available)
+        
+        # Snap to the compiled chart that will grade this hand; push/fold
+        # spots without an exact static chart are solved on demand
+        chart = self.charts.select(chart_type, hero_pos, stack_bb)
+        if chart_type == 'push_fold' and (
+            chart is None or (chart.position, chart.stack_bb) != (hero_pos, stack_bb)
+        ):
+            chart = self._solve_push_fold_chart(hero_pos, stack_bb, config, rng)
+        if chart is not None:
+            hero_pos = chart.position
+            stack_bb = chart.stack_bb
+            villain_pos = chart.villain_position or villain_pos
+        
+        # Deal a concrete hand for the user to act on
+        hero_hand, hand_class = deal_hand(rng)
+        
+        extra_params = {
+            'level': level,
+            'ante': config.get('ante', True),
+            'players_remaining': config.get('players', 6)
+        }
+        if chart_type in ICM_CHART_TYPES:
+            extra_params['icm'] = self._build_icm_context(chart_type, config, stack_bb, rng)
             
         return ChartInstruction(
             chart_type=chart_type,
             hero_position=hero_pos,
             stack_bb=stack_bb,
             villain_position=villain_pos,
-            extra_params={
-                'level': level,
-                'ante': config.get('ante', True),
-                'players_remaining': config.get('players', 6)
-            }
+            extra_params=extra_params,
+            hero_hand=hero_hand,
+            hand_class=hand_class,
+            chart_id=chart.chart_id if chart else None
+        )
+    
+    def _solve_push_fold_chart(
+        self,
+        hero_pos: str,
+        stack_bb: int,
+        config: Dict,
+        rng: SessionRNG
+    ) -> CompiledChart:
+        """
+        Solve (or load from cache) the push/fold chart for an exact spot.
+        
+        Args:
+            hero_pos: Hero's seat; re-dealt if the table is too short for it
+            stack_bb: Effective stack in big blinds
+            config: Game configuration (players, ante)
+            rng: Session stream for re-dealing the seat
+            
+        Returns:
+            CompiledChart registered in the engine's chart index
+        """
+        players = config.get('players', 6)
+        seats = seats_for(players)
+        if hero_pos not in seats:
+            hero_pos = rng.choice(seats)
+            
+        ante = config.get('ante', True)
+        ante_bb = DEFAULT_ANTE_BB if ante is True else float(ante or 0)
+        
+        chart = solve_chart(hero_pos, stack_bb, ante_bb, players)
+        if chart.chart_id not in self.charts.charts:
+            self.charts.add(chart)
+        return chart
+    
+    def _chart_for(self, chart_id: str) -> Optional[CompiledChart]:
+        """
+        The compiled chart a hand was dealt against.
+        
+        Solved push/fold charts are only registered in the process that
+        dealt the hand; another worker (shared sessions) or a restarted one
+        (journaled sessions) rebuilds them from the spot key, which encodes
+        every solve parameter.
+        
+        Returns:
+            The chart, or None if it is unknown and cannot be re-solved
+        """
+        chart = self.charts.charts.get(chart_id)
+        if chart is not None:
+            return chart
+        spot = parse_spot_key(chart_id)
+        if spot is None:
+            return None
+        position, stack_bb, ante_bb, players, _ = spot
+        try:
+            chart = solve_chart(position, stack_bb, ante_bb, players)
+        except Exception as e:
+            print(f"Could not re-solve chart {chart_id}: {e}")
+            return None
+        if chart.chart_id != chart_id:
+            return None
+        self.charts.add(chart)
+        return chart
+    
+    def _build_icm_context(
+        self,
+        chart_type: str,
+        config: Dict,
+        stack_bb: int,
+        rng: SessionRNG
+    ) -> Dict:
+        """
+        Deal a table around hero and price it with ICM.
+        
+        Payouts come from config['payouts'] when set; otherwise satellites
+        pay equal seats, bubble spots pay all but one player, and final
+        tables pay everyone on a top-heavy ladder.
+        
+        Args:
+            chart_type: "icm_ranges" or "bubble_pressure"
+            config: Game configuration (players, payouts, description)
+            stack_bb: Hero's stack in big blinds
+            rng: Session stream for the opponents' stacks
+            
+        Returns:
+            Dict with stacks (hero first), payouts, hero prize equity, and
+            hero's bubble factor against the biggest and shortest opponents
+            (None where undefined, see icm.bubble_factor)
+        """
+        players = max(2, config.get('players', 6))
+        description = str(config.get('description', '')).lower()
+        
+        payouts = config.get('payouts')
+        if not payouts:
+            if 'satellite' in description or 'extreme icm' in description:
+                payouts = satellite_payouts(max(1, players // 2))
+            elif chart_type == 'bubble_pressure':
+                payouts = standard_payouts(players - 1)
+            else:
+                payouts = standard_payouts(players)
+        
+        # Opponent stacks spread around hero's, rounded to half big blinds
+        stacks = [float(stack_bb)] + [
+            round(stack_bb * rng.uniform(0.4, 2.5) * 2) / 2
+            for _ in range(players - 1)
+        ]
+        big = max(range(1, players), key=lambda i: stacks[i])
+        short = min(range(1, players), key=lambda i: stacks[i])
+        bf_big = bubble_factor(stacks, payouts, 0, big, rng.generator)
+        bf_short = bubble_factor(stacks, payouts, 0, short, rng.generator)
+        
+        return {
+            'stacks': stacks,
+            'payouts': payouts,
+            'hero_equity': round(icm_equity(stacks, payouts, rng.generator)[0], 4),
+            # None when a won flip can't add prize equity (e.g. seat locked)
+            'bubble_factor_vs_big': round(bf_big, 2) if bf_big is not None else None,
+            'bubble_factor_vs_short': round(bf_short, 2) if bf_short is not None else None
+        }
+    
+    def grade_chart_action(
+        self,
+        instruction: ChartInstruction,
+        user_action: str
+    ) -> HPResult:
+        """
+        Grade a CHART hand against its compiled chart.
+        
+        The expected action is a single lookup in the chart's 169-entry
+        array, so grading needs no I/O.
+        
+        Args:
+            instruction: The ChartInstruction the user was dealt
+            user_action: Action user chose ("FOLD", "CALL", "PUSH", "RAISE", etc.)
+            
+        Returns:
+            HPResult (EV fields are 0; charts carry no per-action EV)
+        """
+        return self.grade_chart_hand(
+            instruction.chart_id, instruction.hand_class, instruction.hero_hand, user_action
+        )
+    
+    def grade_chart_hand(
+        self,
+        chart_id: Optional[str],
+        hand_class: Optional[int],
+        hero_hand: Optional[str],
+        user_action: str
+    ) -> HPResult:
+        """grade_chart_action from the references a session keeps."""
+        chart = self._chart_for(chart_id) if chart_id is not None else None
+        if chart is None or hand_class is None:
+            return HPResult(
+                is_correct=True,
+                is_indifferent=False,
+                user_ev=0.0,
+                max_ev=0.0,
+                ev_loss=0.0,
+                hp_damage=0,
+                feedback="✅ Ungraded (no chart for this spot)"
+            )
+        
+        expected = chart.actions[hand_class]
+        is_correct = action_matches(expected, user_action)
+        
+        if is_correct:
+            hp_damage = 0
+            feedback = "✅ Correct!"
+        else:
+            hp_damage = CHART_MISTAKE_DAMAGE
+            feedback = f"❌ Mistake! Chart: {ACTION_NAMES[expected]} with {hero_hand}"
+        
+        return HPResult(
+            is_correct=is_correct,
+            is_indifferent=False,
+            user_ev=0.0,
+            max_ev=0.0,
+            ev_loss=0.0,
+            hp_damage=hp_damage,
+            feedback=feedback
         )
     
     # ========================================================================
@@ -556,22 +1028,27 @@ class GameEngine:
         self, 
         game_id: str,
         config: Dict, 
-        level: int
+        level: int,
+        rng: Optional[SessionRNG] = None
     ) -> ScenarioInstruction:
         """
         Build instruction for SCENARIO engine frontend.
         
         Scenario games use hardcoded scripts with "rigged" RNG
-        to test mental game and psychology.
+        to test mental game and psychology. Rigged outcomes come with a
+        concrete deal popped from the engine's DealPool.
         
         Args:
             game_id: Slug of the scenario game
             config: Game configuration
             level: Difficulty level (affects rigging intensity)
+            rng: Session stream (a fresh stream if omitted)
             
         Returns:
             ScenarioInstruction for frontend to render
         """
+        rng = rng or SessionRNG()
+        
         # Map game_id to scenario scripts
         scenario_map = {
             'tilt-control': 'bad_beats_sequence',
@@ -593,19 +1070,30 @@ class GameEngine:
         elif level >= 4:
             rigged_outcomes = ['bad_beat', 'card_dead']
             
-        rigged = random.choice(rigged_outcomes) if rigged_outcomes else None
+        rigged = rng.choice(rigged_outcomes) if rigged_outcomes else None
+        
+        # Back the rigged outcome with a real, pre-verified deal
+        deal = None
+        if rigged:
+            pooled = self.deal_pool.pop(rigged, intensity_for_level(level), rng)
+            deal = pooled.to_dict() if pooled else None
         
         return ScenarioInstruction(
             scenario_id=game_id,
             script_name=script_name,
-            rigged_outcome=rigged
+            rigged_outcome=rigged,
+            deal=deal
         )
     
     # ========================================================================
     # VILLAIN ACTION RESOLUTION
     # ========================================================================
     
-    def resolve_villain_action(self, solver_node: Dict) -> VillainAction:
+    def resolve_villain_action(
+        self,
+        solver_node: Dict,
+        rng: Optional[SessionRNG] = None
+    ) -> VillainAction:
         """
         Resolve villain's action using weighted random selection.
         
@@ -621,6 +1109,7 @@ class GameEngine:
                         "bet_100": {"frequency": 0.15, "ev": 0.65, "next_node": {...}}
                     }
                 }
+            rng: Session stream for the roll (a fresh stream if omitted)
                 
         Returns:
             VillainAction with chosen action, sizing, and next node
@@ -652,7 +1141,7 @@ class GameEngine:
             ]
         
         # Roll the dice
-        roll = random.random()
+        roll = (rng or SessionRNG()).random()
         
         # Find the action that matches the roll
         for threshold, action_key, action_data in cumulative:
@@ -857,23 +1346,31 @@ class GameEngine:
         if game_id in self._game_cache:
             return self._game_cache[game_id]
         
-        # Query by slug first, then by ID
-        result = self.supabase.table('game_registry') \
-            .select('*') \
-            .eq('slug', game_id) \
-            .execute()
-            
-        if not result.data:
-            # Try by UUID
+        def fetch_game() -> List[Dict]:
+            # Query by slug first, then by ID
             result = self.supabase.table('game_registry') \
                 .select('*') \
-                .eq('id', game_id) \
+                .eq('slug', game_id) \
                 .execute()
+                
+            if not result.data:
+                # Try by UUID
+                result = self.supabase.table('game_registry') \
+                    .select('*') \
+                    .eq('id', game_id) \
+                    .execute()
+            return result.data
+        
+        # A cache-miss storm for one game becomes a single lookup
+        rows = await self.flights.do(
+            query_key('game_registry', slug_or_id=game_id),
+            self.breaker.guard(fetch_game)
+        )
         
-        if not result.data:
+        if not rows:
             raise ValueError(f"Game not found: {game_id}")
             
-        game = result.data[0]
+        game = rows[0]
         self._game_cache[game_id] = game
         return game
 
@@ -902,6 +1399,46 @@ def format_hand_for_display(hand_data: Dict) -> Dict:
     return display
 
 
+def build_narrative_summary(hand_data: Dict) -> str:
+    """
+    Build the narrative summary for Director Mode.
+    
+    Example: "Hero (BTN) Raises 2.2bb... Villain (BB) Calls..."
+    """
+    lines = []
+    
+    action_history = hand_data.get("action_history", [])
+    hero_pos = hand_data.get("hero_position", "BTN")
+    villain_pos = hand_data.get("villain_position", "BB")
+    
+    for action in action_history:
+        player = action.get("player", "hero")
+        action_type = action.get("action", "")
+        amount = action.get("amount")
+        
+        pos = hero_pos if player == "hero" else villain_pos
+        player_name = "Hero" if player == "hero" else "Villain"
+        
+        if action_type == "raises":
+            lines.append(f"{player_name} ({pos}) Raises to {amount}bb...")
+        elif action_type == "calls":
+            lines.append(f"{player_name} ({pos}) Calls...")
+        elif action_type == "checks":
+            lines.append(f"{player_name} ({pos}) Checks...")
+        elif action_type == "bets":
+            lines.append(f"{player_name} ({pos}) Bets {amount}bb...")
+        elif action_type == "folds":
+            lines.append(f"{player_name} ({pos}) Folds...")
+    
+    # Add board if present
+    board = hand_data.get("board", "")
+    if board and len(board) >= 6:
+        flop = board[:6]
+        lines.append(f"Flop: {flop}")
+    
+    return "\n".join(lines) if lines else "Action begins..."
+
+
 def get_available_actions(solver_node: Dict) -> List[Dict]:
     """
     Get available actions for the frontend action buttons.
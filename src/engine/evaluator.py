@@ -0,0 +1,322 @@
+"""
+God Mode Engine — Hand Evaluator
+=================================
+Table-driven 5-, 6- and 7-card poker hand evaluation.
+
+Every hand maps to a strength in 1..7462 (higher is better), one value per
+distinct 5-card hand class, so two hands compare with a plain integer `>`.
+
+How it works:
+- Non-flush hands depend only on the rank multiset. Summing 5**rank over the
+  cards writes the rank counts in base 5, a unique key per multiset; the
+  ~74k keys for 5-7 cards live in one sorted table searched with
+  np.searchsorted, next to the strength for each key.
+- Flush hands depend only on the ranks within the flush suit, so a 13-bit
+  rank mask indexes FLUSH[mask] directly (5-7 bits set). Summing 8**suit
+  gives the suit counts, and a 4096-entry table names the flush suit.
+With 7 cards a flush rules out quads and full houses, so whenever a suit has
+5+ cards the flush table answer is the hand's strength.
+
+Cards are ints in the engine's DECK order (rank_index * 4 + suit, Aces first)
+or strings like "As"; `evaluate` is the scalar API and `evaluate_batch`
+evaluates an (N, k) array of card ints with a few gathers and one search.
+
+Author: Smarter.Poker Engineering
+"""
+
+import itertools
+from functools import lru_cache
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from .chart_index import DECK
+
+
+# ============================================================================
+# CARDS
+# ============================================================================
+
+CARD_INDEX: Dict[str, int] = {card: i for i, card in enumerate(DECK)}
+
+CATEGORY_NAMES = [
+    "High Card", "Pair", "Two Pair", "Three of a Kind", "Straight",
+    "Flush", "Full House", "Four of a Kind", "Straight Flush",
+]
+
+Card = Union[int, str]
+
+
+def card_index(card: Card) -> int:
+    """Convert "As"/"td" style strings (or ints) to DECK indices."""
+    if isinstance(card, (int, np.integer)):
+        return int(card)
+    return CARD_INDEX[card[0].upper() + card[1].lower()]
+
+
+def parse_cards(cards: Union[str, Iterable[Card]]) -> List[int]:
+    """Parse "AsKd7h" or ["As", "Kd", "7h"] into DECK indices."""
+    if isinstance(cards, str):
+        cards = [cards[i:i + 2] for i in range(0, len(cards), 2)]
+    return [card_index(c) for c in cards]
+
+
+def format_cards(cards: Iterable[int]) -> str:
+    return "".join(DECK[c] for c in cards)
+
+
+def _rank_value(card: int) -> int:
+    """0 = deuce .. 12 = ace."""
+    return 12 - card // 4
+
+
+# ============================================================================
+# HAND VALUES
+# ============================================================================
+
+def _straight_high(ranks: Sequence[int]):
+    """Highest straight top card within a rank collection, or None."""
+    present = set(ranks)
+    for top in range(12, 2, -1):
+        if all((top - d) in present for d in range(5)):
+            return top
+    if {12, 0, 1, 2, 3} <= present:
+        return 3  # Wheel
+    return None
+
+
+def _noflush_value(counts: Sequence[int]) -> Tuple:
+    """Best 5-card value tuple for a rank multiset, ignoring suits."""
+    ranks_desc = [r for r in range(12, -1, -1) for _ in range(counts[r])]
+    by_count = sorted(((counts[r], r) for r in range(13) if counts[r]), reverse=True)
+
+    top_count, top_rank = by_count[0]
+    if top_count == 4:
+        return (7, top_rank, max(r for r in ranks_desc if r != top_rank))
+    if top_count == 3 and len(by_count) > 1 and by_count[1][0] >= 2:
+        return (6, top_rank, by_count[1][1])
+
+    high = _straight_high(ranks_desc)
+    if high is not None:
+        return (4, high)
+
+    if top_count == 3:
+        return (3, top_rank, *[r for r in ranks_desc if r != top_rank][:2])
+    if top_count == 2 and by_count[1][0] == 2:
+        second = by_count[1][1]
+        return (2, top_rank, second, max(r for r in ranks_desc if r not in (top_rank, second)))
+    if top_count == 2:
+        return (1, top_rank, *[r for r in ranks_desc if r != top_rank][:3])
+    return (0, *ranks_desc[:5])
+
+
+def _flush_value(mask: int) -> Tuple:
+    """Best flush/straight-flush value tuple for 5+ ranks of one suit."""
+    ranks = [r for r in range(13) if mask >> r & 1]
+    high = _straight_high(ranks)
+    if high is not None:
+        return (8, high)
+    return (5, *sorted(ranks, reverse=True)[:5])
+
+
+# ============================================================================
+# PER-CARD KEYS
+# ============================================================================
+
+# Summing a per-card key over a hand builds an aggregate in one pass:
+# - RANK_KEY: 5**rank, so the sum is the rank counts written in base 5
+# - SUIT_KEY: 8**suit, so the sum is the suit counts written in base 8
+# - RANK_BIT: 1 << rank, summed over one suit's cards to get its rank mask
+RANK_KEY = np.array([5 ** _rank_value(c) for c in range(52)], dtype=np.int64)
+SUIT_KEY = np.array([8 ** (c % 4) for c in range(52)], dtype=np.int64)
+RANK_BIT = np.array([1 << _rank_value(c) for c in range(52)], dtype=np.int64)
+CARD_SUIT = np.array([c % 4 for c in range(52)], dtype=np.int64)
+
+
+# ============================================================================
+# TABLES
+# ============================================================================
+
+class _Tables:
+    """Lookup tables built once per process (about two seconds)."""
+
+    def __init__(self):
+        # Dense strength for every distinct 5-card value (1..7462)
+        values = set()
+        for combo in itertools.combinations_with_replacement(range(13), 5):
+            counts = [combo.count(r) for r in range(13)]
+            if max(counts) <= 4:
+                values.add(_noflush_value(counts))
+        for ranks in itertools.combinations(range(13), 5):
+            values.add(_flush_value(sum(1 << r for r in ranks)))
+        ordered = sorted(values)
+        strength = {value: i + 1 for i, value in enumerate(ordered)}
+
+        # First strength of each category, for hand_category()
+        self.category_start = np.array(
+            [next(strength[v] for v in ordered if v[0] == c) for c in range(9)]
+        )
+
+        # Non-flush strength for every 5-7 card rank multiset, keyed by the
+        # base-5 rank-count key and sorted for np.searchsorted
+        noflush = {}
+        for k in (5, 6, 7):
+            for combo in itertools.combinations_with_replacement(range(13), k):
+                counts = [combo.count(r) for r in range(13)]
+                if max(counts) <= 4:
+                    key = sum(5 ** r for r in combo)
+                    noflush[key] = strength[_noflush_value(counts)]
+        self.noflush_keys = np.array(sorted(noflush), dtype=np.int64)
+        self.noflush = np.array([noflush[k] for k in self.noflush_keys.tolist()], dtype=np.uint16)
+        self.noflush_dict = noflush
+
+        # Flush strength by 13-bit rank mask of the flush suit
+        self.flush = np.zeros(1 << 13, dtype=np.uint16)
+        for mask in range(1 << 13):
+            if bin(mask).count("1") >= 5:
+                self.flush[mask] = strength[_flush_value(mask)]
+        self.flush_list = self.flush.tolist()
+
+        # Flush suit (or -1) by base-8 suit-count key
+        self.flush_suit = np.full(8 ** 4, -1, dtype=np.int64)
+        for key in range(8 ** 4):
+            for suit in range(4):
+                if key // 8 ** suit % 8 >= 5:
+                    self.flush_suit[key] = suit
+
+
+@lru_cache(maxsize=1)
+def tables() -> _Tables:
+    return _Tables()
+
+
+# ============================================================================
+# SCALAR API
+# ============================================================================
+
+def evaluate(cards: Union[str, Iterable[Card]]) -> int:
+    """
+    Strength (1..7462, higher wins) of the best hand within 5-7 cards.
+
+    Example:
+        evaluate("AsKsQsJsTs") == 7462
+        evaluate(["Ah", "Ad", "7c", "7d", "2s", "9h", "Kc"])
+    """
+    cards = parse_cards(cards)
+    if not 5 <= len(cards) <= 7:
+        raise ValueError(f"Can only evaluate 5-7 cards, got {len(cards)}")
+
+    t = tables()
+    rank_key = 0
+    suit_masks = [0, 0, 0, 0]
+    suit_counts = [0, 0, 0, 0]
+    for c in cards:
+        r = 12 - c // 4
+        s = c % 4
+        rank_key += 5 ** r
+        suit_masks[s] |= 1 << r
+        suit_counts[s] += 1
+
+    for s in range(4):
+        if suit_counts[s] >= 5:
+            return t.flush_list[suit_masks[s]]
+    return t.noflush_dict[rank_key]
+
+
+def hand_category(strength: Union[int, np.ndarray]) -> Union[int, np.ndarray]:
+    """Category index (0 = High Card .. 8 = Straight Flush) for strengths."""
+    result = np.searchsorted(tables().category_start, strength, side="right") - 1
+    return int(result) if np.ndim(result) == 0 else result
+
+
+def hand_name(strength: int) -> str:
+    return CATEGORY_NAMES[hand_category(strength)]
+
+
+# ============================================================================
+# BATCH API
+# ============================================================================
+
+def evaluate_batch(cards: np.ndarray) -> np.ndarray:
+    """
+    Evaluate many hands at once.
+
+    Args:
+        cards: (N, k) integer array of DECK indices, 5 <= k <= 7
+
+    Returns:
+        (N,) uint16 array of strengths
+    """
+    cards = np.asarray(cards)
+    if cards.ndim != 2 or not 5 <= cards.shape[1] <= 7:
+        raise ValueError(f"Expected an (N, 5..7) card array, got shape {cards.shape}")
+
+    t = tables()
+    cards = cards.astype(np.intp, copy=False)
+
+    # Non-flush: base-5 rank-count key -> binary search in the key table
+    rank_keys = RANK_KEY[cards].sum(axis=1)
+    strength = t.noflush[np.searchsorted(t.noflush_keys, rank_keys)]
+
+    # Flush: at most one suit can hold 5+ of 7 cards
+    flush_suit = t.flush_suit[SUIT_KEY[cards].sum(axis=1)]
+    flush_rows = np.flatnonzero(flush_suit >= 0)
+    if flush_rows.size:
+        sub = cards[flush_rows]
+        in_suit = CARD_SUIT[sub] == flush_suit[flush_rows, None]
+        masks = np.where(in_suit, RANK_BIT[sub], 0).sum(axis=1)
+        strength[flush_rows] = t.flush[masks]
+
+    return strength
+
+
+# ============================================================================
+# SELF CHECK
+# ============================================================================
+
+# Known 5-card category frequencies over all 2,598,960 hands
+FIVE_CARD_COUNTS = [1302540, 1098240, 123552, 54912, 10200, 5108, 3744, 624, 40]
+
+
+def self_check(samples: int = 20000, seed: int = 7):
+    """
+    Exhaustively validate the 5-card tables and cross-check 6/7 cards.
+
+    - All C(52,5) hands through the batch API must reproduce the known
+      category frequencies and exactly 7462 distinct strengths.
+    - Random 6- and 7-card hands must equal the best of their 5-card subsets
+      and agree between the scalar and batch APIs.
+    """
+    all_hands = np.array(list(itertools.combinations(range(52), 5)), dtype=np.int8)
+    strengths = evaluate_batch(all_hands)
+    counts = np.bincount(hand_category(strengths), minlength=9).tolist()
+    assert counts == FIVE_CARD_COUNTS, f"5-card category counts {counts}"
+    assert len(np.unique(strengths)) == 7462
+
+    rng = np.random.default_rng(seed)
+    for k in (6, 7):
+        hands = np.array([rng.choice(52, k, replace=False) for _ in range(samples)])
+        batch = evaluate_batch(hands)
+        for hand, value in zip(hands[:2000], batch[:2000]):
+            best = max(evaluate(list(sub)) for sub in itertools.combinations(hand.tolist(), 5))
+            assert value == best == evaluate(hand.tolist()), format_cards(hand)
+    return True
+
+
+if __name__ == "__main__":
+    import time
+
+    started = time.time()
+    tables()
+    print(f"Tables built in {time.time() - started:.2f}s")
+
+    started = time.time()
+    self_check()
+    print(f"Self check passed in {time.time() - started:.2f}s")
+
+    rng = np.random.default_rng(1)
+    hands = np.tile(np.array([rng.choice(52, 7, replace=False) for _ in range(200_000)]), (10, 1))
+    started = time.time()
+    evaluate_batch(hands)
+    elapsed = time.time() - started
+    print(f"Batch: {len(hands) / elapsed:,.0f} 7-card hands/s")
@@ -0,0 +1,270 @@
+"""
+God Mode Engine — Hand History Write Buffer
+============================================
+Batches hand-history inserts per worker process.
+
+Each graded hand used to cost one blocking INSERT round trip inside the
+request. The buffer queues rows and writes them as one multi-row insert
+when it fills up or on a short timer, and once more at shutdown. Flushes
+run in a worker thread (`asyncio.to_thread`), never on the event loop;
+`add` only swaps in under a short lock and wakes the flush task when the
+batch is full.
+
+Rows still queued are reported by `pending_variants`, so the engine's
+"already seen" check does not re-deal a variant that has not reached the
+database yet.
+
+While the database circuit breaker is open (or an insert fails) rows are
+spooled to data/spool/history.<pid>.jsonl instead of being dropped, and
+replayed in batches by the first flush after the database recovers. Any
+worker may drain any spool file; a file is claimed by renaming it to
+history.<pid>.draining.<claimer pid> first. Claims whose worker died
+mid-replay (or that this process left before a restart) are picked up
+again by the next drain. Torn or unparseable spool lines, e.g. from a
+crash mid-append, go to the rejected file instead of stopping the replay.
+
+Rows the database rejects outright (bad user_id, FK or constraint
+violations) are isolated by bisecting the batch and moved to
+data/spool/rejected-history.jsonl, so one poison row neither blocks the
+rest of its batch nor keeps the spool replaying forever.
+
+Author: Smarter.Poker Engineering
+"""
+
+import asyncio
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from .circuit_breaker import BatchOutcome, CircuitBreaker, send_isolating_rejects
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+HISTORY_TABLE = "god_mode_hand_history"
+FLUSH_MAX_ROWS = 50
+FLUSH_INTERVAL_SECONDS = 2.0
+SPOOL_DIR = Path(__file__).resolve().parents[2] / "data" / "spool"
+REJECTED_FILE = "rejected-history.jsonl"  # Outside the history.*.jsonl replay glob
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class HistoryWriteBuffer:
+    """
+    Per-worker queue of hand-history rows.
+
+    Usage:
+        buffer = HistoryWriteBuffer(supabase)
+        task = asyncio.create_task(buffer.run())   # periodic flush
+        buffer.add(record)                         # never blocks on I/O
+        buffer.flush()                             # at shutdown
+    """
+
+    def __init__(
+        self,
+        supabase_client,
+        table: str = HISTORY_TABLE,
+        max_rows: int = FLUSH_MAX_ROWS,
+        interval: float = FLUSH_INTERVAL_SECONDS,
+        breaker: Optional[CircuitBreaker] = None,
+        spool_dir: Path = SPOOL_DIR
+    ):
+        self.supabase = supabase_client
+        self.table = table
+        self.max_rows = max_rows
+        self.interval = interval
+        self.breaker = breaker
+        self.spool_dir = Path(spool_dir)
+        self.spooled_rows = 0  # Rows on disk written by this worker, not yet replayed
+        self.rejected_rows = 0
+        self._rows: List[Dict] = []
+        self._pending: Dict[Tuple[str, str], Set[str]] = {}
+        self._spooled: Dict[Tuple[str, str], Set[str]] = {}
+        self._lock = threading.Lock()  # Guards the queues; never held during I/O
+        self._flush_lock = threading.Lock()  # One flush (and spool drain) at a time
+        self._full = asyncio.Event()
+
+    def add(self, record: Dict):
+        """Queue one row; wakes the flush task once the batch is full."""
+        key = (record.get("user_id"), record.get("file_id"))
+        with self._lock:
+            self._rows.append(record)
+            self._pending.setdefault(key, set()).add(record.get("variant_hash"))
+            full = len(self._rows) >= self.max_rows
+        if full:
+            self._full.set()
+
+    def pending_variants(self, user_id: str, file_id: str) -> Set[str]:
+        key = (user_id, file_id)
+        with self._lock:
+            return self._pending.get(key, set()) | self._spooled.get(key, set())
+
+    def _take(self) -> List[Dict]:
+        """Swap out the queued rows atomically."""
+        with self._lock:
+            rows, self._rows = self._rows, []
+            self._pending = {}
+        return rows
+
+    def _insert(self, rows: List[Dict]):
+        def insert():
+            self.supabase.table(self.table).insert(rows).execute()
+        if self.breaker is not None:
+            self.breaker.call(insert)
+        else:
+            insert()
+
+    def _write(self, rows: List[Dict]) -> BatchOutcome:
+        """Insert rows, setting aside any the database rejects."""
+        outcome = send_isolating_rejects(rows, self._insert)
+        if outcome.rejected:
+            self._reject(outcome.rejected)
+        return outcome
+
+    def flush(self) -> int:
+        """
+        Insert all queued rows in one request, then replay any spool.
+
+        Blocking; the server calls it through `run` (in a thread) and once
+        at shutdown.
+
+        Returns:
+            Number of rows written (0 if empty or the rows were spooled)
+        """
+        with self._flush_lock:
+            return self._flush()
+
+    def _flush(self) -> int:
+        if self.breaker is not None and self.breaker.is_open:
+            rows = self._take()
+            if rows:
+                self._spool(rows)
+            return 0
+        written = 0
+        rows = self._take()
+        if rows:
+            outcome = self._write(rows)
+            if outcome.unsent:
+                # Keep the rows on disk, don't fail the request path
+                print(f"Failed to save {len(outcome.unsent)} hand history rows, spooling: {outcome.error}")
+                self._spool(outcome.unsent)
+                return outcome.written
+            written = outcome.written
+        return written + self._drain_spool()
+
+    # ========================================================================
+    # DISK SPOOL
+    # ========================================================================
+
+    def _spool(self, rows: List[Dict]):
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        path = self.spool_dir / f"history.{os.getpid()}.jsonl"
+        with open(path, "a", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row) + "\n")
+        with self._lock:
+            for row in rows:
+                key = (row.get("user_id"), row.get("file_id"))
+                self._spooled.setdefault(key, set()).add(row.get("variant_hash"))
+                self._pending.get(key, set()).discard(row.get("variant_hash"))
+            self.spooled_rows += len(rows)
+
+    def _reject(self, rejected: List[Tuple[Dict, str]]):
+        """Set rows the database refused (or unreadable spool lines) aside for inspection."""
+        self.rejected_rows += len(rejected)
+        print(f"Set aside {len(rejected)} hand history rows: {rejected[0][1]}")
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.spool_dir / REJECTED_FILE, "a", encoding="utf-8") as f:
+            for row, error in rejected:
+                f.write(json.dumps({"row": row, "error": error}) + "\n")
+
+    def _claimable(self) -> List[Path]:
+        """Unclaimed spool files, plus claims no live worker is replaying."""
+        paths = sorted(self.spool_dir.glob("history.*.jsonl"))
+        for path in sorted(self.spool_dir.glob("history.*.draining.*")):
+            owner = path.name.rsplit(".", 1)[1]
+            # Our own pid can't be mid-replay (we hold the flush lock), so
+            # such a claim is left over from a crash or an earlier process
+            if not owner.isdigit() or int(owner) == os.getpid() or not _pid_alive(int(owner)):
+                paths.append(path)
+        return paths
+
+    def _read_spool(self, path: Path) -> List[Dict]:
+        """Parsed rows of one spool file; torn or invalid lines are set aside."""
+        rows, bad = [], []
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    row = None
+                if isinstance(row, dict):
+                    rows.append(row)
+                else:
+                    bad.append((line.rstrip("\n"), "unparseable spool line"))
+        if bad:
+            self._reject(bad)
+        return rows
+
+    def _drain_spool(self) -> int:
+        """
+        Replay spooled rows in batches. Rejected rows are set aside; on a
+        transport failure the unsent rest is re-spooled for a later flush.
+        """
+        if not self.spool_dir.is_dir():
+            return 0
+        written = 0
+        for path in self._claimable():
+            origin = ".".join(path.name.split(".")[:2])  # history.<pid>
+            claimed = self.spool_dir / f"{origin}.draining.{os.getpid()}"
+            try:
+                path.rename(claimed)
+            except FileNotFoundError:
+                continue  # Another worker took it
+            rows = self._read_spool(claimed)
+            for start in range(0, len(rows), self.max_rows):
+                batch = rows[start:start + self.max_rows]
+                outcome = self._write(batch)
+                written += outcome.written
+                if outcome.unsent:
+                    print(f"Spool replay stopped after {written} rows: {outcome.error}")
+                    self._spool(outcome.unsent + rows[start + self.max_rows:])
+                    claimed.unlink()
+                    return written
+            claimed.unlink()
+        with self._lock:
+            self._spooled = {}
+            self.spooled_rows = 0
+        return written
+
+    async def run(self):
+        """Flush off the event loop on a timer, or sooner once a batch fills, until cancelled."""
+        while True:
+            try:
+                await asyncio.wait_for(self._full.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._full.clear()
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception as e:
+                # Rows stay queued or spooled; the next pass retries
+                print(f"Hand history flush failed: {e}")
+
+    def __len__(self) -> int:
+        return len(self._rows)
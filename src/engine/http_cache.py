@@ -0,0 +1,166 @@
+"""
+God Mode Engine — HTTP Response Cache
+======================================
+Precomputed, precompressed bodies with ETags for the read-mostly API
+endpoints (game registry, leaderboards).
+
+A body is built once per content version: the JSON is encoded with sorted
+keys, its sha256 becomes the ETag, and gzip (and brotli, when the
+`brotli` package is installed) copies are compressed once. Until the
+entry's TTL runs out, requests cost no database work; after it, a rebuild
+that produces identical JSON keeps the same ETag and compressed copies,
+so clients polling with If-None-Match keep getting 304s.
+
+`negotiate` turns a cached body plus request headers into
+(status, body, headers) for the web framework to send.
+
+Author: Smarter.Poker Engineering
+"""
+
+import gzip
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+
+MAX_BODIES = 1024
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    """One encoded response body and its compressed variants."""
+    etag: str
+    identity: bytes
+    gzip: bytes
+    br: Optional[bytes] = None
+
+
+def _json_bytes(payload: Any) -> bytes:
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str).encode()
+
+
+def encode_body(payload: Any) -> CachedBody:
+    """JSON-encode and precompress a payload."""
+    return _compress(_json_bytes(payload))
+
+
+def _compress(identity: bytes) -> CachedBody:
+    return CachedBody(
+        etag=_etag(identity),
+        identity=identity,
+        gzip=gzip.compress(identity, compresslevel=9, mtime=0),
+        br=brotli.compress(identity) if BROTLI_AVAILABLE else None,
+    )
+
+
+def _etag(identity: bytes) -> str:
+    return '"' + hashlib.sha256(identity).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """RFC 9110 weak comparison against an If-None-Match header."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def negotiate(
+    body: CachedBody,
+    if_none_match: Optional[str],
+    accept_encoding: Optional[str],
+    max_age: int
+) -> Tuple[int, bytes, Dict[str, str]]:
+    """
+    Pick the response for a cached body.
+
+    Returns:
+        (status, content, headers): 304 with no content when the client's
+        ETag matches, else 200 with the best encoding it accepts
+    """
+    headers = {
+        "ETag": body.etag,
+        "Cache-Control": f"public, max-age={max_age}, stale-while-revalidate={max_age * 5}",
+        "Vary": "Accept-Encoding",
+    }
+    if etag_matches(if_none_match, body.etag):
+        return 304, b"", headers
+
+    accepted = {
+        part.split(";")[0].strip().lower()
+        for part in (accept_encoding or "").split(",")
+        if not part.strip().endswith(";q=0")
+    }
+    if body.br is not None and "br" in accepted:
+        headers["Content-Encoding"] = "br"
+        return 200, body.br, headers
+    if "gzip" in accepted:
+        headers["Content-Encoding"] = "gzip"
+        return 200, body.gzip, headers
+    return 200, body.identity, headers
+
+
+class BodyCache:
+    """
+    TTL cache of CachedBody objects.
+
+    Usage:
+        bodies = BodyCache()
+        body = await bodies.get(key, produce_payload, ttl=60)
+    """
+
+    def __init__(self, max_bodies: int = MAX_BODIES):
+        self.max_bodies = max_bodies
+        self._bodies: Dict[Hashable, Tuple[float, CachedBody]] = {}
+        self.stats = {"hits": 0, "rebuilds": 0, "unchanged": 0}
+
+    async def get(
+        self,
+        key: Hashable,
+        produce: Callable[[], Awaitable[Any]],
+        ttl: float
+    ) -> CachedBody:
+        """
+        The cached body for key, rebuilt from `produce()` once expired.
+
+        Raises:
+            Whatever produce raises (nothing is cached)
+        """
+        cached = self._bodies.get(key)
+        if cached is not None and time.monotonic() < cached[0]:
+            self.stats["hits"] += 1
+            return cached[1]
+
+        payload = await produce()
+        identity = _json_bytes(payload)
+        if cached is not None and cached[1].identity == identity:
+            body = cached[1]  # Same content: keep ETag and compressed copies
+            self.stats["unchanged"] += 1
+        else:
+            body = _compress(identity)
+            self.stats["rebuilds"] += 1
+
+        if len(self._bodies) >= self.max_bodies:
+            self._bodies.clear()
+        self._bodies[key] = (time.monotonic() + ttl, body)
+        return body
+
+    def metrics(self) -> Dict:
+        return {"bodies": len(self._bodies), "brotli": BROTLI_AVAILABLE, **self.stats}
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        if key is None:
+            self._bodies.clear()
+        else:
+            self._bodies.pop(key, None)
@@ -0,0 +1,364 @@
+"""
+God Mode Engine — ICM
+======================
+Independent Chip Model equity for the `icm_ranges` / `bubble_pressure`
+CHART games ("Final Table ICM", "Satellite Survival", "Ladder Jump", ...).
+
+Two evaluation modes:
+- Exact Malmuth-Harville: a DP over the set of players who have already
+  finished in the paid places. Only sets smaller than the number of paid
+  places are visited, so a 9-handed final table is 511 states and a 50-player
+  field paying 3 is 1,276 states. Vectorized across a batch of stack
+  configurations, memoized for single lookups.
+- Monte Carlo: Harville finishing orders are exactly the arrival order of
+  independent exponential clocks with rate = stack, so a sample is one
+  vectorized exponential draw + partial sort. Used for large fields; the
+  draws come from the caller's generator (the session's stream), so a
+  replayed session sees the same equities.
+
+Author: Smarter.Poker Engineering
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from math import comb
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# Above this many DP states the "auto" method switches to Monte Carlo
+EXACT_STATE_LIMIT = 50_000
+
+MONTE_CARLO_SAMPLES = 20_000
+
+
+def dp_state_count(players: int, paid: int) -> int:
+    """Number of finished-player sets the exact DP visits."""
+    return sum(comb(players, k) for k in range(min(paid, players)))
+
+
+# ============================================================================
+# CORE: BATCHED MALMUTH-HARVILLE
+# ============================================================================
+
+def _harville_exact(stacks: np.ndarray, payouts: np.ndarray) -> np.ndarray:
+    """
+    Exact ICM for a batch of stack configurations.
+
+    Args:
+        stacks: (B, n) positive stacks
+        payouts: (P,) prize per finishing place, P <= n
+
+    Returns:
+        (B, n) prize equity per player
+    """
+    batch, n = stacks.shape
+    paid = len(payouts)
+    if batch == 1:
+        return np.array([_harville_exact_single(stacks[0].tolist(), list(payouts))])
+
+    total = stacks.sum(axis=1)
+    equity = np.zeros((batch, n))
+
+    # layer: finished-set mask -> (probability of that set, chips it removed)
+    layer: Dict[int, Tuple[np.ndarray, np.ndarray]] = {0: (np.ones(batch), np.zeros(batch))}
+    for place in range(paid):
+        prize = payouts[place]
+        next_layer: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        for mask, (prob, removed) in layer.items():
+            remaining = total - removed
+            for i in range(n):
+                if mask >> i & 1:
+                    continue
+                p = prob * stacks[:, i] / remaining
+                equity[:, i] += p * prize
+                if place + 1 < paid:
+                    key = mask | (1 << i)
+                    if key in next_layer:
+                        next_layer[key][0][:] += p
+                    else:
+                        next_layer[key] = (p, removed + stacks[:, i])
+        layer = next_layer
+    return equity
+
+
+def _harville_exact_single(stacks: List[float], payouts: List[float]) -> List[float]:
+    """Same DP on plain floats; array overhead dominates for one configuration."""
+    n = len(stacks)
+    paid = len(payouts)
+    total = sum(stacks)
+    equity = [0.0] * n
+
+    layer: Dict[int, List[float]] = {0: [1.0, 0.0]}
+    for place in range(paid):
+        prize = payouts[place]
+        next_layer: Dict[int, List[float]] = {}
+        for mask, (prob, removed) in layer.items():
+            scale = prob / (total - removed)
+            for i in range(n):
+                if mask >> i & 1:
+                    continue
+                p = scale * stacks[i]
+                equity[i] += p * prize
+                if place + 1 < paid:
+                    key = mask | (1 << i)
+                    if key in next_layer:
+                        next_layer[key][0] += p
+                    else:
+                        next_layer[key] = [p, removed + stacks[i]]
+        layer = next_layer
+    return equity
+
+
+def _harville_monte_carlo(
+    stacks: np.ndarray,
+    payouts: np.ndarray,
+    samples: int,
+    rng: np.random.Generator
+) -> np.ndarray:
+    """Monte-Carlo ICM via exponential races (one draw per player per sample)."""
+    batch, n = stacks.shape
+    paid = len(payouts)
+    equity = np.zeros((batch, n))
+
+    for b in range(batch):
+        clocks = rng.exponential(size=(samples, n)) / stacks[b]
+        if paid < n:
+            top = np.argpartition(clocks, paid - 1, axis=1)[:, :paid]
+            order = np.take_along_axis(top, np.argsort(np.take_along_axis(clocks, top, axis=1), axis=1), axis=1)
+        else:
+            order = np.argsort(clocks, axis=1)
+        equity[b] = np.bincount(
+            order.ravel(),
+            weights=np.broadcast_to(payouts, order.shape).ravel(),
+            minlength=n,
+        ) / samples
+    return equity
+
+
+# ============================================================================
+# PUBLIC API
+# ============================================================================
+
+def icm_equity_batch(
+    stacks: np.ndarray,
+    payouts: Sequence[float],
+    method: str = "auto",
+    samples: int = MONTE_CARLO_SAMPLES,
+    seed: Optional[int] = None,
+    rng: Optional[np.random.Generator] = None
+) -> np.ndarray:
+    """
+    ICM prize equity for many stack configurations at once.
+
+    Players with a zero stack are treated as busted on this hand: they take
+    the lowest remaining places (sharing them evenly if several bust).
+
+    Args:
+        stacks: (B, n) or (n,) chip stacks
+        payouts: Prize for 1st, 2nd, ... (unpaid places may be omitted)
+        method: "exact", "monte_carlo", or "auto"
+        samples: Monte-Carlo samples per configuration
+        seed: Optional seed for Monte-Carlo reproducibility
+        rng: Generator for the Monte-Carlo draws (e.g. SessionRNG.generator);
+            takes precedence over `seed`
+
+    Returns:
+        Array of prize equity with the same shape as `stacks`
+    """
+    stacks = np.asarray(stacks, dtype=np.float64)
+    single = stacks.ndim == 1
+    stacks = np.atleast_2d(stacks)
+    batch, n = stacks.shape
+    if rng is None:
+        rng = np.random.default_rng(seed)
+    prizes = np.zeros(n)
+    prizes[:min(n, len(payouts))] = np.asarray(payouts, dtype=np.float64)[:n]
+
+    equity = np.zeros((batch, n))
+    alive = stacks > 0
+
+    # Group configurations by who is still alive so each group is one DP
+    patterns: Dict[bytes, List[int]] = {}
+    for b in range(batch):
+        patterns.setdefault(alive[b].tobytes(), []).append(b)
+
+    for key, rows in patterns.items():
+        live = np.frombuffer(key, dtype=bool)
+        live_idx = np.flatnonzero(live)
+        dead_idx = np.flatnonzero(~live)
+        m = len(live_idx)
+
+        # Busted players split the prizes for places m..n-1
+        if len(dead_idx):
+            equity[np.ix_(rows, dead_idx)] = prizes[m:].sum() / len(dead_idx)
+        if m == 0:
+            continue
+
+        live_prizes = prizes[:m]
+        paid = int(np.max(np.flatnonzero(live_prizes), initial=-1)) + 1
+        if paid == 0:
+            continue
+        live_prizes = live_prizes[:paid]
+        sub = stacks[np.ix_(rows, live_idx)]
+
+        use_exact = method == "exact" or (
+            method == "auto" and dp_state_count(m, paid) <= EXACT_STATE_LIMIT
+        )
+        if use_exact:
+            result = _harville_exact(sub, live_prizes)
+        else:
+            result = _harville_monte_carlo(sub, live_prizes, samples, rng)
+        equity[np.ix_(rows, live_idx)] = result
+
+    return equity[0] if single else equity
+
+
+@lru_cache(maxsize=4096)
+def _icm_cached(stacks: Tuple[float, ...], payouts: Tuple[float, ...]) -> Tuple[float, ...]:
+    return tuple(icm_equity_batch(np.array(stacks), payouts).tolist())
+
+
+def icm_equity(
+    stacks: Sequence[float],
+    payouts: Sequence[float],
+    rng: Optional[np.random.Generator] = None
+) -> List[float]:
+    """
+    ICM equity for a single table state.
+
+    Exact results are memoized; fields large enough for Monte Carlo are
+    sampled from `rng` and not cached.
+    """
+    paid = min(len(stacks), len(payouts))
+    if dp_state_count(len(stacks), paid) > EXACT_STATE_LIMIT:
+        return icm_equity_batch(np.array(stacks, dtype=np.float64), payouts, rng=rng).tolist()
+    return list(_icm_cached(tuple(float(s) for s in stacks), tuple(float(p) for p in payouts)))
+
+
+# ============================================================================
+# SHOVE / CALL DECISIONS
+# ============================================================================
+
+@dataclass
+class CallDecision:
+    """ICM value of calling an all-in versus folding (in prize units)."""
+    fold_ev: float
+    win_ev: float
+    lose_ev: float
+    required_equity: float  # Break-even all-in equity for the call
+    call_ev: np.ndarray  # Call EV for each supplied equity
+    should_call: np.ndarray  # call_ev > fold_ev
+
+
+def call_decision(
+    stacks: Sequence[float],
+    payouts: Sequence[float],
+    shover: int,
+    caller: int,
+    equities: np.ndarray,
+    caller_posted: float = 0.0,
+    dead_money: float = 0.0,
+    rng: Optional[np.random.Generator] = None
+) -> CallDecision:
+    """
+    Evaluate calling a shove for many caller hands at once.
+
+    Args:
+        stacks: Stacks before the hand's blinds/antes were posted
+        payouts: Prize per place
+        shover: Seat index that moved all-in
+        caller: Seat index deciding to call
+        equities: Caller's all-in equity per hand (any shape, e.g. 169 classes)
+        caller_posted: Blind the caller already has in front (lost on a fold;
+            the shover's own blind is part of the stack it risks)
+        dead_money: Antes and other players' blinds in the pot
+        rng: Generator for Monte-Carlo ICM on large fields
+
+    Returns:
+        CallDecision with the three ICM outcomes and per-hand verdicts
+    """
+    start = np.asarray(stacks, dtype=np.float64)
+    risk = min(start[shover], start[caller])
+
+    fold = start.copy()
+    fold[caller] -= caller_posted
+    fold[shover] += caller_posted + dead_money
+
+    win = start.copy()
+    win[caller] += risk + dead_money
+    win[shover] -= risk
+
+    lose = start.copy()
+    lose[caller] -= risk
+    lose[shover] += risk + dead_money
+
+    outcomes = icm_equity_batch(np.vstack([fold, win, lose]), payouts, rng=rng)
+    fold_ev, win_ev, lose_ev = outcomes[0, caller], outcomes[1, caller], outcomes[2, caller]
+
+    equities = np.asarray(equities, dtype=np.float64)
+    call_ev = equities * win_ev + (1.0 - equities) * lose_ev
+    spread = win_ev - lose_ev
+    required = (fold_ev - lose_ev) / spread if spread > 0 else 1.0
+
+    return CallDecision(
+        fold_ev=float(fold_ev),
+        win_ev=float(win_ev),
+        lose_ev=float(lose_ev),
+        required_equity=float(required),
+        call_ev=call_ev,
+        should_call=call_ev > fold_ev,
+    )
+
+
+def bubble_factor(
+    stacks: Sequence[float],
+    payouts: Sequence[float],
+    hero: int,
+    villain: int,
+    rng: Optional[np.random.Generator] = None
+) -> Optional[float]:
+    """
+    Ratio of ICM lost when losing a flip to ICM gained when winning it.
+
+    1.0 means chips and prize equity move together (chip EV); values above
+    1.0 mean hero should need more than 50% equity to gamble.
+
+    Returns:
+        The ratio, or None when winning the flip gains hero no prize
+        equity (e.g. a satellite seat already locked up), where the
+        ratio is undefined. Never inf, so results stay JSON-safe.
+    """
+    start = np.asarray(stacks, dtype=np.float64)
+    risk = min(start[hero], start[villain])
+
+    win = start.copy()
+    win[hero] += risk
+    win[villain] -= risk
+    lose = start.copy()
+    lose[hero] -= risk
+    lose[villain] += risk
+
+    now, up, down = icm_equity_batch(np.vstack([start, win, lose]), payouts, rng=rng)[:, hero]
+    gain = up - now
+    return float((now - down) / gain) if gain > 1e-12 else None
+
+
+# ============================================================================
+# PAYOUT STRUCTURES
+# ============================================================================
+
+def standard_payouts(paid: int) -> List[float]:
+    """Top-heavy payout fractions for `paid` places (sums to 1)."""
+    weights = np.array([1.0 / (place + 1.2) ** 1.1 for place in range(paid)])
+    return (weights / weights.sum()).round(4).tolist()
+
+
+def satellite_payouts(seats: int) -> List[float]:
+    """Equal prizes for every seat won."""
+    return [1.0] * seats
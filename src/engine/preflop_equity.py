@@ -0,0 +1,122 @@
+"""
+God Mode Engine — Preflop Equity Matrix
+========================================
+Memory-mapped 169×169 hand-class vs hand-class all-in equities.
+
+The matrix is built offline by scripts/build_preflop_equity.py and stored as
+a small binary file (16-byte header + float32 row-major data). Loading maps
+the file read-only, so every worker process shares the same physical pages
+and a lookup is plain array indexing.
+
+File layout:
+    magic    4s   b"PFEQ"
+    version  u16  FORMAT_VERSION
+    size     u16  169
+    samples  u32  boards sampled per combo pair (0 = exact enumeration)
+    pad      4x
+    data     float32[169][169], E[i, j] = equity of class i vs class j
+
+Author: Smarter.Poker Engineering
+"""
+
+import struct
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from .chart_index import NUM_HAND_CLASSES, hand_class_index
+
+
+# ============================================================================
+# FILE FORMAT
+# ============================================================================
+
+MAGIC = b"PFEQ"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHI4x")
+
+EQUITY_PATH = Path(__file__).resolve().parents[2] / "data" / "equity" / "preflop_169.bin"
+
+
+class PreflopEquity:
+    """
+    Read-only view over the equity matrix.
+
+    Usage:
+        eq = load_preflop_equity()
+        eq.hand_vs_hand("AKs", "QQ")        # -> ~0.46
+        eq.hand_vs_range("AhKd", weights)   # weights: 169 combo-class weights
+    """
+
+    def __init__(self, matrix: np.ndarray, samples: int, path: Optional[Path] = None):
+        self.matrix = matrix
+        self.samples = samples
+        self.path = path
+
+    @property
+    def is_exact(self) -> bool:
+        return self.samples == 0
+
+    @property
+    def source(self) -> str:
+        """Short tag describing how the matrix was built (used in cache keys)."""
+        return "exact" if self.is_exact else f"mc{self.samples}"
+
+    def hand_vs_hand(self, hand: str, villain: str) -> float:
+        return float(self.matrix[hand_class_index(hand), hand_class_index(villain)])
+
+    def hand_vs_range(self, hand: str, weights: np.ndarray) -> float:
+        """Equity of one hand against a range given as 169 class weights."""
+        weights = np.asarray(weights, dtype=np.float64)
+        total = weights.sum()
+        if total <= 0:
+            return 0.0
+        return float(self.matrix[hand_class_index(hand)] @ weights / total)
+
+
+def write_equity_file(path: Path, matrix: np.ndarray, samples: int = 0):
+    """Serialize a 169×169 matrix in the format load_preflop_equity expects."""
+    matrix = np.asarray(matrix, dtype="<f4")
+    if matrix.shape != (NUM_HAND_CLASSES, NUM_HAND_CLASSES):
+        raise ValueError(f"Expected a {NUM_HAND_CLASSES}x{NUM_HAND_CLASSES} matrix, got {matrix.shape}")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, NUM_HAND_CLASSES, samples))
+        f.write(matrix.tobytes(order="C"))
+    tmp.replace(path)
+
+
+def open_equity_file(path: Path) -> PreflopEquity:
+    """
+    Memory-map an equity file.
+
+    Raises:
+        ValueError: If the header does not match this format
+    """
+    with open(path, "rb") as f:
+        magic, version, size, samples = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC or version != FORMAT_VERSION or size != NUM_HAND_CLASSES:
+        raise ValueError(f"Unrecognized preflop equity file: {path}")
+
+    matrix = np.memmap(
+        path, dtype="<f4", mode="r", offset=HEADER.size,
+        shape=(NUM_HAND_CLASSES, NUM_HAND_CLASSES),
+    )
+    return PreflopEquity(matrix, samples, path)
+
+
+@lru_cache(maxsize=1)
+def load_preflop_equity() -> Optional[PreflopEquity]:
+    """
+    Map data/equity/preflop_169.bin once per process.
+
+    Returns None when the file has not been built yet, so callers can fall
+    back to an approximation.
+    """
+    if not EQUITY_PATH.exists():
+        return None
+    return open_equity_file(EQUITY_PATH)
@@ -0,0 +1,402 @@
+"""
+God Mode Engine — Push/Fold Equilibrium Solver
+===============================================
+Solves short-stack push/fold spots for any stack, ante, table size and seat,
+so the CHART engine has an exact chart for every situation it can deal.
+
+Model (chip EV, equal effective stacks):
+- Everyone before hero has folded; hero either shoves or folds
+- Each player behind may call; at most one caller (overcalls ignored)
+- Ranges are 169-entry frequency vectors over hand classes
+- Card removal between hero and caller is modelled by the combo
+  compatibility matrix, so "AA vs AKs" weighs 12 of the 24 combo pairs
+
+The equilibrium is found with fictitious play: each round computes best
+responses for the callers against hero's average shoving range, then hero's
+best response against their average calling ranges. Every step is a handful
+of 169×169 matrix-vector products.
+
+Equities come from the memory-mapped preflop matrix (see preflop_equity.py)
+when it has been built. Results are cached in memory and on disk keyed by the
+spot parameters and the equity source.
+
+Author: Smarter.Poker Engineering
+"""
+
+import itertools
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .chart_index import (
+    CALL,
+    DECK,
+    FOLD,
+    HAND_CLASSES,
+    NUM_HAND_CLASSES,
+    PUSH,
+    RANK_INDEX,
+    CompiledChart,
+    hand_class_index,
+)
+from .preflop_equity import load_preflop_equity
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+SOLVER_VERSION = 1
+
+# Seats in acting order for a full ring; an N-handed table uses the last N
+SEAT_ORDER = ["UTG", "UTG1", "LJ", "HJ", "CO", "BTN", "SB", "BB"]
+
+SMALL_BLIND = 0.5
+BIG_BLIND = 1.0
+
+# Ante per player (in BB) used when a game config only says "ante": true
+DEFAULT_ANTE_BB = 0.125
+
+ITERATIONS = 400
+
+CACHE_DIR = Path(__file__).resolve().parents[2] / ".cache" / "pushfold"
+
+
+@dataclass(frozen=True)
+class PushFoldSolution:
+    """Equilibrium ranges for one push/fold spot."""
+    position: str
+    stack_bb: float
+    ante_bb: float
+    players: int
+    push: np.ndarray  # Shove frequency per hand class for `position`
+    calls: Dict[str, np.ndarray]  # Call frequency per hand class for each seat behind
+
+    def to_chart(self, hero_position: Optional[str] = None) -> CompiledChart:
+        """
+        Collapse the solution into a pure 169-entry chart for grading.
+
+        hero_position defaults to the shover; pass a caller's seat to get
+        that seat's calling chart instead.
+        """
+        hero = hero_position or self.position
+        if hero == self.position:
+            actions = np.where(self.push >= 0.5, PUSH, FOLD)
+            villain = next(iter(self.calls), None)
+        else:
+            actions = np.where(self.calls[hero] >= 0.5, CALL, FOLD)
+            villain = self.position
+
+        return CompiledChart(
+            chart_id=spot_key(hero, self.stack_bb, self.ante_bb, self.players, shover=self.position),
+            family="push_fold",
+            position=hero,
+            stack_bb=int(round(self.stack_bb)),
+            actions=bytes(actions.astype(np.uint8)),
+            villain_position=villain,
+        )
+
+
+def seats_for(players: int) -> List[str]:
+    """Seats in acting order for an N-handed table (2-8 players)."""
+    players = max(2, min(len(SEAT_ORDER), players))
+    return SEAT_ORDER[-players:]
+
+
+def spot_key(position: str, stack_bb: float, ante_bb: float, players: int,
+             shover: Optional[str] = None) -> str:
+    """Stable id for a solved spot (also the on-disk cache file stem)."""
+    key = f"pf_v{SOLVER_VERSION}_{players}p_{position}_{stack_bb:g}bb_a{ante_bb:g}"
+    if shover and shover != position:
+        key += f"_vs_{shover}"
+    return key
+
+
+_SPOT_KEY_PATTERN = re.compile(
+    r"^pf_v(\d+)_(\d+)p_([A-Z0-9+]+)_([\d.]+)bb_a([\d.]+)(?:_vs_([A-Z0-9+]+))?$"
+)
+
+
+def parse_spot_key(key: str) -> Optional[Tuple[str, float, float, int, Optional[str]]]:
+    """
+    Inverse of spot_key for the current solver version.
+
+    Returns:
+        (position, stack_bb, ante_bb, players, shover) or None if the key is
+        malformed or was produced by another SOLVER_VERSION
+    """
+    match = _SPOT_KEY_PATTERN.match(key)
+    if not match or int(match.group(1)) != SOLVER_VERSION:
+        return None
+    _, players, position, stack_bb, ante_bb, shover = match.groups()
+    return position, float(stack_bb), float(ante_bb), int(players), shover
+
+
+# ============================================================================
+# COMBO COMPATIBILITY
+# ============================================================================
+
+@lru_cache(maxsize=1)
+def combo_matrix() -> np.ndarray:
+    """
+    Count card-disjoint combo pairs for every pair of hand classes.
+
+    C[i, j] is how many (combo of i, combo of j) pairs share no card:
+    e.g. AA vs KK = 36, AA vs AKs = 12, AKo vs AKo = 84.
+    """
+    combos = list(itertools.combinations(range(52), 2))
+    classes = np.array([hand_class_index(DECK[a] + DECK[b]) for a, b in combos])
+
+    masks = np.zeros((len(combos), 52), dtype=np.float32)
+    for row, (a, b) in enumerate(combos):
+        masks[row, a] = masks[row, b] = 1.0
+    disjoint = (masks @ masks.T) == 0
+
+    onehot = np.zeros((len(combos), NUM_HAND_CLASSES), dtype=np.float32)
+    onehot[np.arange(len(combos)), classes] = 1.0
+    return (onehot.T @ disjoint.astype(np.float32) @ onehot).astype(np.float64)
+
+
+# ============================================================================
+# EQUITY SOURCE
+# ============================================================================
+
+def _class_shape(index: int) -> Tuple[int, int, bool, bool]:
+    """Return (high rank value, low rank value, is_pair, is_suited); A=12 .. 2=0."""
+    name = HAND_CLASSES[index]
+    high = 12 - RANK_INDEX[name[0]]
+    low = 12 - RANK_INDEX[name[1]]
+    return high, low, high == low, name.endswith("s")
+
+
+def _approx_equity(i: int, j: int) -> float:
+    """Rule-of-thumb all-in equity of class i against class j."""
+    h1, l1, pair1, suited1 = _class_shape(i)
+    h2, l2, pair2, suited2 = _class_shape(j)
+
+    if pair1 and pair2:
+        eq = 0.5 if h1 == h2 else (0.815 if h1 > h2 else 0.185)
+    elif pair1 or pair2:
+        p, (h, l) = (h1, (h2, l2)) if pair1 else (h2, (h1, l1))
+        if h == p:
+            pair_eq = 0.88        # e.g. KK vs KQ
+        elif l == p:
+            pair_eq = 0.70        # e.g. KK vs AK
+        elif p > h:
+            pair_eq = 0.83        # two undercards
+        elif p < l:
+            pair_eq = 0.55        # two overcards
+        else:
+            pair_eq = 0.70        # one over, one under
+        eq = pair_eq if pair1 else 1.0 - pair_eq
+    else:
+        if (h1, l1) == (h2, l2):
+            eq = 0.5
+        elif h1 == h2 or l1 == l2 or h1 == l2 or l1 == h2:
+            # Shared rank: the better kicker dominates
+            if h1 == h2:
+                eq = 0.72 if l1 > l2 else 0.28
+            elif l1 == l2:
+                eq = 0.70 if h1 > h2 else 0.30
+            elif l1 == h2:
+                eq = 0.70          # e.g. AK vs KQ
+            else:
+                eq = 0.30
+        elif h1 > h2 and l1 > l2:
+            eq = 0.64              # both cards higher
+        elif h1 < h2 and l1 < l2:
+            eq = 0.36
+        elif h1 > h2:
+            eq = 0.56              # top card higher, second card lower
+        else:
+            eq = 0.44
+
+    # Suitedness is worth roughly 2.5% for an unpaired hand
+    if suited1 and not pair1:
+        eq += 0.025
+    if suited2 and not pair2:
+        eq -= 0.025
+    return min(0.95, max(0.05, eq))
+
+
+@lru_cache(maxsize=1)
+def approximate_equity_matrix() -> np.ndarray:
+    """169×169 hand-vs-hand equity from rules of thumb (E + E.T == 1)."""
+    eq = np.empty((NUM_HAND_CLASSES, NUM_HAND_CLASSES))
+    for i in range(NUM_HAND_CLASSES):
+        for j in range(i, NUM_HAND_CLASSES):
+            value = 0.5 if i == j else _approx_equity(i, j)
+            eq[i, j] = value
+            eq[j, i] = 1.0 - value
+    return eq
+
+
+def equity_matrix() -> Tuple[np.ndarray, str]:
+    """
+    Return (equity matrix, source tag) for the solver.
+
+    Uses the memory-mapped precomputed matrix when it has been built and
+    falls back to the rule-of-thumb approximation otherwise.
+    """
+    table = load_preflop_equity()
+    if table is not None:
+        return table.matrix, table.source
+    return approximate_equity_matrix(), "approx"
+
+
+# ============================================================================
+# SOLVER
+# ============================================================================
+
+def _blind_post(seat: str) -> float:
+    return SMALL_BLIND if seat == "SB" else BIG_BLIND if seat == "BB" else 0.0
+
+
+def solve(
+    stack_bb: float,
+    ante_bb: float = 0.0,
+    players: int = 6,
+    position: str = "BTN",
+    iterations: int = ITERATIONS,
+    equity: Optional[np.ndarray] = None,
+) -> PushFoldSolution:
+    """
+    Solve the push/fold equilibrium for `position` opening the pot.
+
+    Args:
+        stack_bb: Effective stack in big blinds (behind, after antes)
+        ante_bb: Ante per player in big blinds
+        players: Players dealt in (2-8)
+        position: Shoving seat; must not be the BB
+        iterations: Fictitious-play rounds
+        equity: Optional 169×169 equity matrix (defaults to equity_matrix())
+
+    Returns:
+        PushFoldSolution with the shove range and each seat's calling range
+    """
+    seats = seats_for(players)
+    if position not in seats or position == "BB":
+        raise ValueError(f"{position} cannot open-shove at a {players}-handed table")
+    if equity is None:
+        equity, _ = equity_matrix()
+
+    callers = seats[seats.index(position) + 1:]
+    stack = float(stack_bb)
+    n = len(seats)
+    dead = SMALL_BLIND + BIG_BLIND + n * ante_bb  # pot when hero acts
+    hero_post = _blind_post(position)
+
+    compat = combo_matrix()
+    compat_rows = compat.sum(axis=1)
+    weighted_eq = compat * equity  # C[i, j] * E[i, j]
+
+    # Pot and call cost per caller
+    pots = np.array([
+        2 * stack + (SMALL_BLIND + BIG_BLIND - hero_post - _blind_post(c)) + n * ante_bb
+        for c in callers
+    ])
+    call_costs = np.array([stack - _blind_post(c) for c in callers])
+
+    push_avg = np.ones(NUM_HAND_CLASSES)
+    call_avg = np.zeros((len(callers), NUM_HAND_CLASSES))
+
+    for t in range(1, iterations + 1):
+        step = 1.0 / (t + 1)
+
+        # Callers: best response to hero's average shoving range
+        reach = compat @ push_avg                      # combo weight of shoves per caller hand
+        eq_vs_push = (weighted_eq @ push_avg) / np.maximum(reach, 1e-12)
+        call_ev = eq_vs_push[None, :] * pots[:, None] - call_costs[:, None]
+        call_br = ((call_ev > 0) & (reach[None, :] > 0)).astype(np.float64)
+        call_avg += (call_br - call_avg) * step
+
+        # Hero: best response to the callers' average calling ranges
+        ev = np.zeros(NUM_HAND_CLASSES)
+        still_folding = np.ones(NUM_HAND_CLASSES)
+        for k in range(len(callers)):
+            call_weight = compat @ call_avg[k]
+            p_call = call_weight / compat_rows
+            eq_vs_call = (weighted_eq @ call_avg[k]) / np.maximum(call_weight, 1e-12)
+            ev += still_folding * p_call * (eq_vs_call * pots[k] - (stack - hero_post))
+            still_folding *= 1.0 - p_call
+        ev += still_folding * dead
+        push_br = (ev > 0).astype(np.float64)
+        push_avg += (push_br - push_avg) * step
+
+    return PushFoldSolution(
+        position=position,
+        stack_bb=stack,
+        ante_bb=float(ante_bb),
+        players=players,
+        push=push_avg,
+        calls={c: call_avg[k] for k, c in enumerate(callers)},
+    )
+
+
+# ============================================================================
+# CACHED ENTRY POINT
+# ============================================================================
+
+def _disk_path(key: str, source: str) -> Path:
+    return CACHE_DIR / f"{key}_{source}.npy"
+
+
+@lru_cache(maxsize=512)
+def solve_cached(
+    stack_bb: float,
+    ante_bb: float = 0.0,
+    players: int = 6,
+    position: str = "BTN",
+) -> PushFoldSolution:
+    """
+    Solve a spot, reusing in-memory and on-disk results.
+
+    The disk cache stores [push, call_1, ..., call_k] as one .npy array per
+    spot and equity source, so a solved spot survives restarts.
+    """
+    equity, source = equity_matrix()
+    seats = seats_for(players)
+    callers = seats[seats.index(position) + 1:] if position in seats else []
+    path = _disk_path(spot_key(position, stack_bb, ante_bb, players), source)
+
+    if path.exists():
+        ranges = np.load(path)
+        if ranges.shape == (1 + len(callers), NUM_HAND_CLASSES):
+            return PushFoldSolution(
+                position=position,
+                stack_bb=float(stack_bb),
+                ante_bb=float(ante_bb),
+                players=players,
+                push=ranges[0],
+                calls={c: ranges[k + 1] for k, c in enumerate(callers)},
+            )
+
+    solution = solve(stack_bb, ante_bb, players, position, equity=equity)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.save(path, np.vstack([solution.push] + [solution.calls[c] for c in callers]))
+    except OSError:
+        pass  # Read-only deploys still get the in-memory cache
+    return solution
+
+
+def solve_chart(
+    hero_position: str,
+    stack_bb: float,
+    ante_bb: float = 0.0,
+    players: int = 6,
+) -> CompiledChart:
+    """
+    Build the grading chart for hero's seat.
+
+    Non-BB seats get their open-shove chart; the BB gets its calling chart
+    against a small-blind shove.
+    """
+    if hero_position == "BB":
+        solution = solve_cached(stack_bb, ante_bb, players, "SB")
+        return solution.to_chart("BB")
+    return solve_cached(stack_bb, ante_bb, players, hero_position).to_chart()
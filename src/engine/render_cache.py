@@ -0,0 +1,96 @@
+"""
+God Mode Engine — Rendered Hand Cache
+======================================
+Process-wide LRU of fully rendered PIO hands keyed by (file_id,
+variant_hash).
+
+A spot in a given suit variant always renders the same way, so the suit
+rotation, display dict, Director narrative and their JSON encodings are
+computed once and then shared by every session that is dealt it. The
+cache is bounded by a byte budget (sizes are the encoded JSON lengths,
+a stable proxy for the objects' footprint) and evicts least recently used
+entries.
+
+Cached dicts are shared: treat them as read-only.
+
+Author: Smarter.Poker Engineering
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Hashable, Optional
+
+
+RENDER_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class RenderedHand:
+    """One (file_id, variant_hash) rendered for the frontend."""
+    hand_data: Dict  # Rotated solver row (grading reads it)
+    display: Dict  # format_hand_for_display(hand_data)
+    narrative: str  # build_narrative_summary(hand_data)
+    display_json: bytes  # json of `display`, spliced into responses
+    narrative_json: bytes  # json string literal of `narrative`
+    size: int  # Bytes charged against the budget
+
+
+class RenderCache:
+    """
+    Byte-budgeted LRU.
+
+    Usage:
+        cache = RenderCache()
+        rendered = cache.get(key)
+        if rendered is None:
+            cache.put(key, render(...))
+    """
+
+    def __init__(self, max_bytes: int = RENDER_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._entries: "OrderedDict[Hashable, RenderedHand]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[RenderedHand]:
+        rendered = self._entries.get(key)
+        if rendered is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return rendered
+
+    def peek(self, key: Hashable) -> Optional[RenderedHand]:
+        """Lookup without touching recency or hit statistics."""
+        return self._entries.get(key)
+
+    def put(self, key: Hashable, rendered: RenderedHand):
+        if rendered.size > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.bytes -= previous.size
+        self._entries[key] = rendered
+        self.bytes += rendered.size
+        while self.bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.bytes -= evicted.size
+            self.evictions += 1
+
+    def metrics(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
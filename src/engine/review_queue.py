@@ -0,0 +1,347 @@
+"""
+God Mode Engine — Spaced-Repetition Review Queue
+=================================================
+Brings missed PIO spots back to the user on a spaced schedule.
+
+Each user × game has a min-heap of (due_time, seq, file_id) plus a small
+state record per spot. Every graded PIO action updates it incrementally
+(no history scans):
+
+- a miss schedules the spot REVIEW_FIRST_INTERVAL seconds out and resets
+  its interval
+- a correct review multiplies the interval by REVIEW_EASE; once it passes
+  REVIEW_GRADUATE_INTERVAL the spot leaves the queue
+- a correct first-time answer is ignored
+
+`next_due` is called once per PIO hand. It peeks the heap top (stale
+entries from rescheduling are dropped lazily) and returns at most one due
+review every REVIEW_INTERLEAVE hands, together with a suit variant the
+user has not been shown for that spot in review yet.
+
+Queues live in a review store, like sessions in the session store:
+
+- LocalReviewStore: in-process (single worker), optionally pickled to disk
+  at each checkpoint and at shutdown so a restart keeps them
+- RedisReviewStore: one key per user × game, shared by forked workers and
+  hosts; the key's TTL is reset on every save
+
+A queue whose items are all graduated (or dropped) is deleted, and queues
+untouched for REVIEW_IDLE_TTL_SECONDS expire (Redis TTL; the local store
+prunes them and also keeps at most REVIEW_MAX_LOCAL_QUEUES, least recently
+used first). Two workers updating the same user × game at the same moment
+resolve last-write-wins: at worst one schedule update is lost.
+
+Author: Smarter.Poker Engineering
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import pickle
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from .rng import SessionRNG
+
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+REVIEW_FIRST_INTERVAL = 5 * 60.0  # Seconds from a miss to its first review
+REVIEW_EASE = 3.0  # Interval multiplier after a correct review
+REVIEW_GRADUATE_INTERVAL = 7 * 24 * 3600.0  # Beyond this, the spot is learned
+REVIEW_INTERLEAVE = 3  # At most one review per this many hands
+REVIEW_MAX_ITEMS = 500  # Per user × game; furthest-due items are dropped
+REVIEW_IDLE_TTL_SECONDS = 30 * 24 * 3600  # Untouched queues expire (> the longest interval)
+REVIEW_MAX_LOCAL_QUEUES = 20_000  # LRU cap for the in-process store
+REVIEW_KEY_PREFIX = "godmode:reviews:"
+REVIEW_CHECKPOINT_INTERVAL_SECONDS = 60.0
+
+
+class _ReviewItem:
+    __slots__ = ("due", "interval", "variants")
+
+    def __init__(self, due: float, interval: float):
+        self.due = due
+        self.interval = interval
+        self.variants: Set[str] = set()  # Variants already used for this spot
+
+
+class _UserQueue:
+    __slots__ = ("heap", "items", "hands_since_review", "touched")
+
+    def __init__(self):
+        self.heap: List[Tuple[float, int, str]] = []
+        self.items: Dict[str, _ReviewItem] = {}
+        self.hands_since_review = REVIEW_INTERLEAVE  # First due review can go out at once
+        self.touched = time.time()
+
+
+# ============================================================================
+# STORES
+# ============================================================================
+
+class LocalReviewStore:
+    """
+    Review queues in a dict inside one process. Only correct with a single
+    worker. With a path, queues are loaded at construction and written back
+    by `checkpoint` / `run_checkpoints`.
+    """
+
+    shared = False
+
+    def __init__(self, path: Optional[Path] = None, max_queues: int = REVIEW_MAX_LOCAL_QUEUES):
+        self.path = Path(path) if path is not None else None
+        self.max_queues = max_queues
+        self._queues: "OrderedDict[Tuple[str, str], _UserQueue]" = OrderedDict()
+        self._dirty = False
+        if self.path is not None:
+            try:
+                with open(self.path, "rb") as f:
+                    self._queues = pickle.load(f)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"⚠️ Ignoring unreadable review queues {self.path}: {e}")
+            self.prune()
+
+    async def get(self, user_id: str, game_id: str) -> Optional[_UserQueue]:
+        key = (user_id, game_id)
+        queue = self._queues.get(key)
+        if queue is not None:
+            if time.time() - queue.touched > REVIEW_IDLE_TTL_SECONDS:
+                del self._queues[key]
+                return None
+            self._queues.move_to_end(key)
+        return queue
+
+    async def save(self, user_id: str, game_id: str, queue: _UserQueue):
+        key = (user_id, game_id)
+        queue.touched = time.time()
+        self._queues[key] = queue
+        self._queues.move_to_end(key)
+        while len(self._queues) > self.max_queues:
+            self._queues.popitem(last=False)
+        self._dirty = True
+
+    async def delete(self, user_id: str, game_id: str):
+        if self._queues.pop((user_id, game_id), None) is not None:
+            self._dirty = True
+
+    def prune(self) -> int:
+        """Drop idle queues; returns how many."""
+        cutoff = time.time() - REVIEW_IDLE_TTL_SECONDS
+        idle = [key for key, queue in self._queues.items() if queue.touched < cutoff]
+        for key in idle:
+            del self._queues[key]
+        return len(idle)
+
+    def checkpoint(self):
+        """Prune and write every queue atomically (blocking; for shutdown)."""
+        self.prune()
+        if self.path is None:
+            return
+        self._dirty = False
+        self._write(pickle.dumps(self._queues, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def _write(self, payload: bytes):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        tmp.replace(self.path)
+
+    async def run_checkpoints(self, interval: float = REVIEW_CHECKPOINT_INTERVAL_SECONDS):
+        """Prune and, if anything changed, write the queues on `interval`, until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            if self.prune():
+                self._dirty = True
+            if self.path is None or not self._dirty:
+                continue
+            self._dirty = False
+            # Pickled on the loop (a consistent copy), written in a thread
+            payload = pickle.dumps(self._queues, protocol=pickle.HIGHEST_PROTOCOL)
+            await asyncio.to_thread(self._write, payload)
+
+    def __len__(self) -> int:
+        return len(self._queues)
+
+
+class RedisReviewStore:
+    """Pickled review queues in Redis, expiring REVIEW_IDLE_TTL_SECONDS after the last save."""
+
+    shared = True
+
+    def __init__(self, url: str):
+        if not REDIS_AVAILABLE:
+            raise ImportError("redis not installed. Run: pip install redis")
+        self.client = aioredis.Redis.from_url(url)
+
+    @staticmethod
+    def _key(user_id: str, game_id: str) -> str:
+        return f"{REVIEW_KEY_PREFIX}{user_id}:{game_id}"
+
+    async def get(self, user_id: str, game_id: str) -> Optional[_UserQueue]:
+        data = await self.client.get(self._key(user_id, game_id))
+        return pickle.loads(data) if data is not None else None
+
+    async def save(self, user_id: str, game_id: str, queue: _UserQueue):
+        queue.touched = time.time()
+        await self.client.set(
+            self._key(user_id, game_id),
+            pickle.dumps(queue, protocol=pickle.HIGHEST_PROTOCOL),
+            ex=REVIEW_IDLE_TTL_SECONDS,
+        )
+
+    async def delete(self, user_id: str, game_id: str):
+        await self.client.delete(self._key(user_id, game_id))
+
+    def checkpoint(self):
+        """Nothing to do: Redis persists and expires queues itself."""
+
+    async def run_checkpoints(self, *args, **kwargs):
+        return
+
+
+def create_review_store(redis_url: Optional[str] = None, path: Optional[Path] = None):
+    """Redis when REDIS_URL is configured, otherwise in-process (persisted to `path` when given)."""
+    if redis_url:
+        return RedisReviewStore(redis_url)
+    return LocalReviewStore(path)
+
+
+# ============================================================================
+# SCHEDULER
+# ============================================================================
+
+
+class ReviewScheduler:
+    """
+    Spaced-repetition scheduling over a review store.
+
+    Usage:
+        reviews = ReviewScheduler(create_review_store(redis_url, path))
+        await reviews.record(user_id, game, file_id, variant_hash, is_correct)
+        due = await reviews.next_due(user_id, game, all_variants, rng)
+        if due: file_id, variant_hash = due
+    """
+
+    def __init__(self, store=None):
+        self.store = store if store is not None else LocalReviewStore()
+        self._seq = itertools.count()
+
+    async def record(
+        self,
+        user_id: str,
+        game_id: str,
+        file_id: str,
+        variant_hash: str,
+        is_correct: bool,
+        now: Optional[float] = None
+    ):
+        """Update the schedule from one graded PIO action."""
+        now = time.time() if now is None else now
+        queue = await self.store.get(user_id, game_id)
+        item = queue.items.get(file_id) if queue else None
+
+        if is_correct:
+            if item is None:
+                return
+            item.interval *= REVIEW_EASE
+            if item.interval > REVIEW_GRADUATE_INTERVAL:
+                del queue.items[file_id]  # Heap entry goes stale
+                await self._put(user_id, game_id, queue)
+                return
+        else:
+            if queue is None:
+                queue = _UserQueue()
+            if item is None:
+                if len(queue.items) >= REVIEW_MAX_ITEMS:
+                    self._drop_latest(queue)
+                item = queue.items[file_id] = _ReviewItem(now, REVIEW_FIRST_INTERVAL)
+            item.interval = REVIEW_FIRST_INTERVAL
+
+        item.variants.add(variant_hash)
+        item.due = now + item.interval
+        heapq.heappush(queue.heap, (item.due, next(self._seq), file_id))
+        if len(queue.heap) > 2 * len(queue.items) + 16:
+            # Too many stale entries: rebuild from the live items
+            queue.heap = [(it.due, next(self._seq), f) for f, it in queue.items.items()]
+            heapq.heapify(queue.heap)
+        await self._put(user_id, game_id, queue)
+
+    async def next_due(
+        self,
+        user_id: str,
+        game_id: str,
+        all_variants: List[str],
+        rng: SessionRNG,
+        now: Optional[float] = None
+    ) -> Optional[Tuple[str, str]]:
+        """
+        The review to deal for this hand, if one is due and interleaving
+        allows it.
+
+        Returns:
+            (file_id, variant_hash) or None for a regular hand
+        """
+        queue = await self.store.get(user_id, game_id)
+        if queue is None:
+            return None
+        queue.hands_since_review += 1
+        review = None
+        if queue.hands_since_review >= REVIEW_INTERLEAVE:
+            review = self._pop_due(queue, all_variants, rng, time.time() if now is None else now)
+        await self._put(user_id, game_id, queue)
+        return review
+
+    @staticmethod
+    def _pop_due(
+        queue: _UserQueue,
+        all_variants: List[str],
+        rng: SessionRNG,
+        now: float
+    ) -> Optional[Tuple[str, str]]:
+        heap = queue.heap
+        while heap:
+            due, _, file_id = heap[0]
+            item = queue.items.get(file_id)
+            if item is None or item.due != due:
+                heapq.heappop(heap)  # Graduated or rescheduled since
+                continue
+            if due > now:
+                return None
+            fresh = [v for v in all_variants if v not in item.variants]
+            variant = rng.choice(fresh or all_variants)
+            item.variants.add(variant)
+            queue.hands_since_review = 0
+            return file_id, variant
+        return None
+
+    async def _put(self, user_id: str, game_id: str, queue: _UserQueue):
+        """Save the queue, or delete it once nothing is left to review."""
+        if queue.items:
+            await self.store.save(user_id, game_id, queue)
+        else:
+            await self.store.delete(user_id, game_id)
+
+    def _drop_latest(self, queue: _UserQueue):
+        file_id = max(queue.items, key=lambda f: queue.items[f].due)
+        del queue.items[file_id]
+
+    async def pending(self, user_id: str, game_id: str) -> int:
+        queue = await self.store.get(user_id, game_id)
+        return len(queue.items) if queue else 0
@@ -0,0 +1,140 @@
+"""
+God Mode Engine — Session RNG Streams
+======================================
+Independent, seedable random streams so every training session can be
+replayed and no two sessions share generator state.
+
+Each SessionRNG wraps a NumPy PCG64 generator seeded from a SeedSequence.
+A session's stream is derived from (seed, spawn_key), so a whole session is
+reproducible from its seed alone, and `spawn()` hands out statistically
+independent child streams for worker threads or processes without locks.
+
+Fresh seeds are drawn as 53-bit integers (not the SeedSequence's default
+128-bit entropy) so they survive a round trip through a JavaScript number
+and can be handed back from the frontend to replay a session.
+
+Exception: SCENARIO rigged deals come from shared, pre-generated pools
+(see deal_pool.py), so their cards are recorded on the session rather than
+replayed from the seed.
+
+The method names mirror the stdlib `random` module (random, randint,
+uniform, choice, shuffle, sample), so engine code that used the global
+module can take a SessionRNG unchanged.
+
+Author: Smarter.Poker Engineering
+"""
+
+import secrets
+from typing import Any, Dict, List, MutableSequence, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+SEED_BITS = 53  # Largest integer width a JS number holds exactly
+MAX_SEED = 2 ** SEED_BITS - 1
+
+
+class SessionRNG:
+    """
+    One session's random stream.
+
+    Usage:
+        rng = SessionRNG()                   # fresh 53-bit seed
+        rng = SessionRNG(seed=1234)          # deterministic replay
+        rng.choice(["BTN", "CO"]); rng.randint(-3, 3)
+        worker_streams = rng.spawn(4)        # independent child streams
+        saved = rng.to_dict(); SessionRNG.from_dict(saved)
+    """
+
+    def __init__(self, seed: Optional[int] = None, spawn_key: Tuple[int, ...] = ()):
+        if seed is None:
+            seed = secrets.randbits(SEED_BITS)
+        self.seed_sequence = np.random.SeedSequence(seed, spawn_key=tuple(spawn_key))
+        self.generator = np.random.Generator(np.random.PCG64(self.seed_sequence))
+
+    @property
+    def seed(self) -> int:
+        """Root entropy; pass back as `seed` to replay the session."""
+        return int(self.seed_sequence.entropy)
+
+    @property
+    def spawn_key(self) -> Tuple[int, ...]:
+        return tuple(self.seed_sequence.spawn_key)
+
+    # ------------------------------------------------------------------------
+    # random-module compatible draws
+    # ------------------------------------------------------------------------
+
+    def random(self) -> float:
+        """Float in [0.0, 1.0)."""
+        return float(self.generator.random())
+
+    def randint(self, a: int, b: int) -> int:
+        """Integer in [a, b], both ends inclusive (like random.randint)."""
+        return int(self.generator.integers(a, b, endpoint=True))
+
+    def uniform(self, a: float, b: float) -> float:
+        return float(self.generator.uniform(a, b))
+
+    def choice(self, seq: Sequence[Any]) -> Any:
+        if not seq:
+            raise IndexError("Cannot choose from an empty sequence")
+        return seq[int(self.generator.integers(len(seq)))]
+
+    def shuffle(self, seq: MutableSequence[Any]):
+        """Shuffle a list in place."""
+        order = self.generator.permutation(len(seq)).tolist()
+        seq[:] = [seq[j] for j in order]
+
+    def sample(self, population: Sequence[Any], k: int) -> List[Any]:
+        """k distinct elements, in selection order."""
+        if not 0 <= k <= len(population):
+            raise ValueError("Sample larger than population or is negative")
+        picks = self.generator.choice(len(population), size=k, replace=False)
+        return [population[i] for i in picks.tolist()]
+
+    # ------------------------------------------------------------------------
+    # Streams and state
+    # ------------------------------------------------------------------------
+
+    def spawn(self, n: int = 1) -> List["SessionRNG"]:
+        """Independent child streams (e.g. one per worker)."""
+        children = []
+        for child in self.seed_sequence.spawn(n):
+            rng = SessionRNG.__new__(SessionRNG)
+            rng.seed_sequence = child
+            rng.generator = np.random.Generator(np.random.PCG64(child))
+            children.append(rng)
+        return children
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable snapshot (seed, spawn key and current position)."""
+        state = self.generator.bit_generator.state
+        return {
+            "seed": self.seed,
+            "spawn_key": list(self.spawn_key),
+            "children_spawned": self.seed_sequence.n_children_spawned,
+            "state": state["state"]["state"],
+            "inc": state["state"]["inc"],
+            "has_uint32": state["has_uint32"],
+            "uinteger": state["uinteger"],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SessionRNG":
+        """Rebuild a stream at exactly the position `to_dict` captured."""
+        seed_sequence = np.random.SeedSequence(
+            data["seed"],
+            spawn_key=tuple(data.get("spawn_key", ())),
+            n_children_spawned=data.get("children_spawned", 0),
+        )
+        rng = cls.__new__(cls)
+        rng.seed_sequence = seed_sequence
+        rng.generator = np.random.Generator(np.random.PCG64(seed_sequence))
+        rng.generator.bit_generator.state = {
+            "bit_generator": "PCG64",
+            "state": {"state": data["state"], "inc": data["inc"]},
+            "has_uint32": data["has_uint32"],
+            "uinteger": data["uinteger"],
+        }
+        return rng
@@ -0,0 +1,195 @@
+"""
+God Mode Engine — Accuracy Rollups
+===================================
+Streaming per-user accuracy aggregates, so profile and coach views never
+scan god_mode_hand_history.
+
+Every graded action adds one to (hands, correct) and its EV loss / HP
+damage to a handful of counters keyed by
+
+    user × game × level × (attribute, value)
+
+where the attributes describe the spot: ("all", "all") plus e.g.
+("street", "Flop"), ("stack_depth", "40"), ("chart_type", "push_fold").
+Deltas accumulate in worker memory and are flushed as one
+`increment_accuracy_rollups` RPC call on a timer, in a worker thread (the
+function adds them onto god_mode_accuracy_rollup rows). A flush that fails in transit keeps
+its deltas for the next attempt; rows the database rejects (e.g. a user_id
+that is not a UUID) are isolated by bisecting the batch and appended to
+data/spool/rejected-rollups.jsonl instead of being retried forever.
+
+Author: Smarter.Poker Engineering
+"""
+
+import asyncio
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .circuit_breaker import CircuitBreaker, send_isolating_rejects
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+ROLLUP_TABLE = "god_mode_accuracy_rollup"
+ROLLUP_RPC = "increment_accuracy_rollups"
+FLUSH_INTERVAL_SECONDS = 5.0
+REJECTED_PATH = Path(__file__).resolve().parents[2] / "data" / "spool" / "rejected-rollups.jsonl"
+
+RollupKey = Tuple[str, str, int, str, str]  # user, game, level, attribute, value
+
+
+class AccuracyRollups:
+    """
+    Per-worker buffer of rollup deltas.
+
+    Usage:
+        rollups = AccuracyRollups(supabase)
+        task = asyncio.create_task(rollups.run())
+        rollups.add(user_id, game_id, level, {"street": "Flop"}, True, 0.0, 0)
+        rollups.flush()                             # at shutdown
+    """
+
+    def __init__(
+        self,
+        supabase_client,
+        interval: float = FLUSH_INTERVAL_SECONDS,
+        breaker: Optional[CircuitBreaker] = None,
+        rejected_path: Path = REJECTED_PATH
+    ):
+        self.supabase = supabase_client
+        self.interval = interval
+        self.breaker = breaker
+        self.rejected_path = Path(rejected_path)
+        self.rejected_rows = 0
+        self._deltas: Dict[RollupKey, List[float]] = {}  # [hands, correct, ev_loss, hp_damage]
+        self._lock = threading.Lock()  # add() on the loop vs flush() in a thread
+
+    def add(
+        self,
+        user_id: str,
+        game_id: str,
+        level: int,
+        attributes: Dict[str, object],
+        is_correct: bool,
+        ev_loss: float,
+        hp_damage: int
+    ):
+        """Count one graded action under ("all", "all") and each attribute."""
+        pairs = [("all", "all")]
+        pairs.extend((name, str(value)) for name, value in attributes.items() if value is not None)
+        with self._lock:
+            for attribute, value in pairs:
+                delta = self._deltas.setdefault((user_id, game_id, level, attribute, value), [0, 0, 0.0, 0])
+                delta[0] += 1
+                delta[1] += 1 if is_correct else 0
+                delta[2] += ev_loss
+                delta[3] += hp_damage
+
+    def pending(self, user_id: str, game_id: Optional[str] = None) -> List[Dict]:
+        """Unflushed deltas for one user, shaped like rollup rows."""
+        with self._lock:
+            return [
+                self._row(key, delta)
+                for key, delta in self._deltas.items()
+                if key[0] == user_id and (game_id is None or key[1] == game_id)
+            ]
+
+    @staticmethod
+    def _row(key: RollupKey, delta: List[float]) -> Dict:
+        user_id, game_id, level, attribute, value = key
+        return {
+            "user_id": user_id,
+            "game_id": game_id,
+            "level": level,
+            "attribute": attribute,
+            "value": value,
+            "hands": delta[0],
+            "correct": delta[1],
+            "ev_loss_sum": round(delta[2], 4),
+            "hp_damage_sum": delta[3],
+        }
+
+    def flush(self) -> int:
+        """
+        Apply all deltas in one RPC call (more only if the database rejects
+        some rows).
+
+        Returns:
+            Number of rollup rows incremented
+        """
+        with self._lock:
+            if not self._deltas:
+                return 0
+            deltas, self._deltas = self._deltas, {}
+        rows = [self._row(key, delta) for key, delta in deltas.items()]
+
+        def increment(batch: List[Dict]):
+            self.supabase.rpc(ROLLUP_RPC, {"deltas": batch}).execute()
+
+        send = increment
+        if self.breaker is not None:
+            send = lambda batch: self.breaker.call(lambda: increment(batch))
+        outcome = send_isolating_rejects(rows, send)
+
+        if outcome.rejected:
+            self._reject(outcome.rejected)
+        if outcome.unsent:
+            # Fold the unsent rows back in; newer deltas were added meanwhile
+            with self._lock:
+                for row in outcome.unsent:
+                    key = (row["user_id"], row["game_id"], row["level"], row["attribute"], row["value"])
+                    current = self._deltas.setdefault(key, [0, 0, 0.0, 0])
+                    for i, amount in enumerate(deltas[key]):
+                        current[i] += amount
+            if not (self.breaker is not None and self.breaker.is_open):
+                print(f"Failed to flush {len(outcome.unsent)} accuracy rollups: {outcome.error}")
+        return outcome.written
+
+    def _reject(self, rejected: List[Tuple[Dict, str]]):
+        """Set rows the database refused aside for inspection."""
+        self.rejected_rows += len(rejected)
+        print(f"Dropped {len(rejected)} accuracy rollup rows the database rejected: {rejected[0][1]}")
+        try:
+            self.rejected_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.rejected_path, "a", encoding="utf-8") as f:
+                for row, error in rejected:
+                    f.write(json.dumps({"row": row, "error": error}) + "\n")
+        except OSError as e:
+            print(f"Could not record rejected rollups: {e}")
+
+    async def run(self):
+        """Flush off the event loop on a timer until cancelled."""
+        while True:
+            await asyncio.sleep(self.interval)
+            await asyncio.to_thread(self.flush)
+
+    def __len__(self) -> int:
+        return len(self._deltas)
+
+
+def merge_rollups(stored: List[Dict], pending: List[Dict]) -> List[Dict]:
+    """Add unflushed deltas onto stored rollup rows and derive accuracy."""
+    merged: Dict[Tuple, Dict] = {}
+    for row in list(stored) + list(pending):
+        key = (row["game_id"], row["level"], row["attribute"], row["value"])
+        total = merged.setdefault(key, {
+            "game_id": row["game_id"],
+            "level": row["level"],
+            "attribute": row["attribute"],
+            "value": row["value"],
+            "hands": 0,
+            "correct": 0,
+            "ev_loss_sum": 0.0,
+            "hp_damage_sum": 0,
+        })
+        for field in ("hands", "correct", "ev_loss_sum", "hp_damage_sum"):
+            total[field] += row[field]
+    for total in merged.values():
+        hands = total["hands"]
+        total["accuracy"] = round(100.0 * total["correct"] / hands, 2) if hands else None
+        total["avg_ev_loss"] = round(total["ev_loss_sum"] / hands, 4) if hands else None
+    return sorted(merged.values(), key=lambda r: (r["game_id"], r["level"], r["attribute"], r["value"]))
@@ -0,0 +1,208 @@
+"""
+God Mode Engine — Session Journal
+==================================
+Keeps in-process sessions across restarts and crashes.
+
+Two files under data/sessions/:
+
+    sessions.snap   full snapshot of every live session
+    sessions.log    append-only log of saves/deletes since that snapshot
+
+Every `save` appends one record to the log (buffered; flushed about once a
+second). A checkpoint rewrites the snapshot atomically and truncates the
+log; the server checkpoints periodically and at shutdown. Restore loads
+the snapshot and replays the log, tolerating a torn final record from a
+crash.
+
+The snapshot can be written off the event loop: between
+`begin_checkpoint` and `finish_checkpoint` appends still go to the old
+log and are also held in memory, then become the start of the new log.
+A crash at any point leaves a snapshot + log pair that replays to the
+latest state.
+
+Records are pickled SessionState objects, whose state is a compact tuple
+(~170 bytes), so 50k sessions are a few MB and restore in well under a
+second.
+
+Snapshot layout:
+    magic    4s   b"GMSJ"
+    version  u16  FORMAT_VERSION
+    layout   u16  CRC of SessionState.__slots__ (records are slot tuples)
+    count    u32
+    payload  pickle of [(session_id, SessionState), ...]
+
+Log record:
+    length   u32
+    payload  pickle of (session_id, SessionState or None for a delete)
+
+Author: Smarter.Poker Engineering
+"""
+
+import os
+import pickle
+import struct
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .session_state import SessionState
+
+
+# ============================================================================
+# FILE FORMAT
+# ============================================================================
+
+MAGIC = b"GMSJ"
+FORMAT_VERSION = 2
+# Pickled SessionStates are bare slot tuples, so a changed slot list must
+# invalidate old files rather than shift values into the wrong fields
+SLOT_LAYOUT = zlib.crc32(",".join(SessionState.__slots__).encode()) & 0xFFFF
+HEADER = struct.Struct("<4sHHI")
+RECORD = struct.Struct("<I")
+
+JOURNAL_DIR = Path(__file__).resolve().parents[2] / "data" / "sessions"
+CHECKPOINT_INTERVAL_SECONDS = 60.0
+LOG_FLUSH_INTERVAL_SECONDS = 1.0
+
+
+class SessionJournal:
+    """
+    Snapshot + append-only log for one process's sessions.
+
+    Usage:
+        journal = SessionJournal()
+        sessions = journal.restore()            # at boot
+        journal.append(session_id, session)     # after every save
+        journal.append(session_id, None)        # delete
+        journal.checkpoint(sessions)            # periodically / at shutdown
+    """
+
+    def __init__(self, directory: Path = JOURNAL_DIR):
+        self.directory = Path(directory)
+        self.snapshot_path = self.directory / "sessions.snap"
+        self.log_path = self.directory / "sessions.log"
+        self._log = None
+        self._held: Optional[List[bytes]] = None  # Records appended mid-checkpoint
+        self.appended = 0  # Log records since the last checkpoint
+
+    # ------------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------------
+
+    def _open_log(self):
+        if self._log is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._log = open(self.log_path, "ab")
+        return self._log
+
+    def append(self, session_id: str, session: Optional[SessionState]):
+        payload = pickle.dumps((session_id, session), protocol=pickle.HIGHEST_PROTOCOL)
+        record = RECORD.pack(len(payload)) + payload
+        self._open_log().write(record)
+        if self._held is not None:
+            self._held.append(record)
+        self.appended += 1
+
+    def flush(self):
+        if self._log is not None:
+            self._log.flush()
+
+    def checkpoint(self, sessions: Dict[str, SessionState]) -> int:
+        """
+        Write a full snapshot atomically, then start a fresh log.
+
+        Returns:
+            Snapshot size in bytes
+        """
+        self.begin_checkpoint()
+        try:
+            return self.write_snapshot(sessions)
+        finally:
+            self.finish_checkpoint()
+
+    def begin_checkpoint(self):
+        """Start holding appends for the log that follows the next snapshot."""
+        self._held = []
+
+    def write_snapshot(self, sessions: Dict[str, SessionState]) -> int:
+        """
+        Pickle and atomically replace the snapshot. Touches no shared state,
+        so it may run in a worker thread (pass detached copies).
+
+        Returns:
+            Snapshot size in bytes
+        """
+        payload = pickle.dumps(list(sessions.items()), protocol=pickle.HIGHEST_PROTOCOL)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.snapshot_path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, SLOT_LAYOUT, len(sessions)))
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        tmp.replace(self.snapshot_path)
+        return HEADER.size + len(payload)
+
+    def finish_checkpoint(self):
+        """Start a fresh log holding only what was appended since begin_checkpoint."""
+        held, self._held = self._held or [], None
+        if self._log is not None:
+            self._log.close()
+        self._log = open(self.log_path, "wb")
+        for record in held:
+            self._log.write(record)
+        self.appended = len(held)
+
+    def close(self):
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    # ------------------------------------------------------------------------
+    # Restore
+    # ------------------------------------------------------------------------
+
+    def restore(self) -> Dict[str, SessionState]:
+        """Snapshot plus replayed log; empty if neither exists."""
+        started = time.perf_counter()
+        sessions: Dict[str, SessionState] = {}
+
+        try:
+            with open(self.snapshot_path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            data = b""
+        if len(data) >= HEADER.size:
+            magic, version, layout, _count = HEADER.unpack_from(data)
+            if magic == MAGIC and version == FORMAT_VERSION and layout == SLOT_LAYOUT:
+                sessions.update(pickle.loads(memoryview(data)[HEADER.size:]))
+            else:
+                # The log was written in the same format; skip both
+                print(f"⚠️ Ignoring session journal from another format: {self.snapshot_path}")
+                return sessions
+
+        replayed = 0
+        try:
+            with open(self.log_path, "rb") as f:
+                log = f.read()
+        except FileNotFoundError:
+            log = b""
+        offset = 0
+        while offset + RECORD.size <= len(log):
+            (length,) = RECORD.unpack_from(log, offset)
+            end = offset + RECORD.size + length
+            if end > len(log):
+                break  # Torn write from a crash
+            session_id, session = pickle.loads(log[offset + RECORD.size:end])
+            if session is None:
+                sessions.pop(session_id, None)
+            else:
+                sessions[session_id] = session
+            offset = end
+            replayed += 1
+
+        if sessions or replayed:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            print(f"♻️ Restored {len(sessions)} sessions ({replayed} log records) in {elapsed_ms:.0f} ms")
+        return sessions
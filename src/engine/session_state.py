@@ -0,0 +1,178 @@
+"""
+God Mode Engine — Compact Session State
+========================================
+One slotted record per live training session.
+
+The old session dicts carried ~14 string keys plus the full current hand
+(HandResult / instruction object) and a copy of its solver node, so a
+session cost kilobytes. SessionState keeps only counters and references:
+
+- PIO hands:      file_id + variant_hash (hand data is re-resolved from
+                  the engine's shared spot cache, see resolve_solver_hand)
+- CHART hands:    chart_id + hand_class + hero_hand (enough to grade)
+- SCENARIO hands: scenario_id, plus the rigged deal's cards (deal_cards:
+                  hero, villain, board concatenated), because pooled deals
+                  can't be replayed from the session seed
+
+Repeated strings (game ids, file ids, variant hashes, hands) are interned,
+so 100k sessions share one copy of each. The session's RNG is kept as its
+compact numeric state between requests and only rebuilt as a SessionRNG
+while a request is using it (`compact()` is called by the session stores
+on save).
+
+Author: Smarter.Poker Engineering
+"""
+
+import sys
+import time
+from typing import Any, Optional, Tuple
+
+from .engine_core import ChartInstruction, EngineType, HandResult, ScenarioInstruction
+from .rng import SessionRNG
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value is not None else None
+
+
+class SessionState:
+    """
+    Mutable per-session record.
+
+    Usage:
+        session = SessionState(user_id, game, hands_per_round=20, rng=SessionRNG(seed))
+        session.set_hand(hand_id, hand_result)
+        session.rng.choice(...)
+        store.save(session_id, session)        # compacts the RNG
+    """
+
+    __slots__ = (
+        "user_id",
+        "game_id",
+        "game_slug",
+        "game_name",
+        "engine_type",
+        "current_level",
+        "current_hp",
+        "hands_played",
+        "correct_answers",
+        "hands_per_round",
+        # Current hand, by reference
+        "hand_id",
+        "hand_kind",
+        "file_id",
+        "variant_hash",
+        "chart_id",
+        "hand_class",
+        "hero_hand",
+        "scenario_id",
+        "deal_cards",
+        # Expiry (see session_store): wall-clock time of the last save
+        "last_active",
+        "completed",
+        # RNG: live stream while in use, numeric state otherwise
+        "_rng",
+        "_rng_state",
+    )
+
+    def __init__(self, user_id: str, game: dict, hands_per_round: int, rng: SessionRNG):
+        self.user_id = user_id
+        self.game_id = _intern(game["id"])
+        self.game_slug = _intern(game["slug"])
+        self.game_name = _intern(game["title"])
+        self.engine_type = _intern(game["engine_type"])
+        self.current_level = 1
+        self.current_hp = 100
+        self.hands_played = 0
+        self.correct_answers = 0
+        self.hands_per_round = hands_per_round
+        self.clear_hand()
+        self.last_active = time.time()
+        self.completed = False
+        self._rng = rng
+        self._rng_state = None
+
+    # ------------------------------------------------------------------------
+    # Current hand
+    # ------------------------------------------------------------------------
+
+    def clear_hand(self):
+        self.hand_id = None
+        self.hand_kind = None
+        self.file_id = None
+        self.variant_hash = None
+        self.chart_id = None
+        self.hand_class = None
+        self.hero_hand = None
+        self.scenario_id = None
+        self.deal_cards = None
+
+    def set_hand(self, hand_id: str, hand: Any):
+        """Record references to a freshly dealt hand (never the payload)."""
+        self.clear_hand()
+        self.hand_id = hand_id
+        if isinstance(hand, HandResult):
+            self.hand_kind = EngineType.PIO.value
+            self.file_id = _intern(hand.file_id)
+            self.variant_hash = _intern(hand.variant_hash)
+        elif isinstance(hand, ChartInstruction):
+            self.hand_kind = EngineType.CHART.value
+            self.chart_id = _intern(hand.chart_id)
+            self.hand_class = hand.hand_class
+            self.hero_hand = _intern(hand.hero_hand)
+        elif isinstance(hand, ScenarioInstruction):
+            self.hand_kind = EngineType.SCENARIO.value
+            self.scenario_id = _intern(hand.scenario_id)
+            if hand.deal:
+                self.deal_cards = "".join(hand.deal["hero"] + hand.deal["villain"] + hand.deal["board"])
+
+    # ------------------------------------------------------------------------
+    # RNG
+    # ------------------------------------------------------------------------
+
+    @property
+    def rng(self) -> SessionRNG:
+        if self._rng is None:
+            seed, spawn_key, children, state, inc, has_uint32, uinteger = self._rng_state
+            self._rng = SessionRNG.from_dict({
+                "seed": seed,
+                "spawn_key": spawn_key,
+                "children_spawned": children,
+                "state": state,
+                "inc": inc,
+                "has_uint32": has_uint32,
+                "uinteger": uinteger,
+            })
+            self._rng_state = None
+        return self._rng
+
+    def compact(self):
+        """Fold the live RNG back into its numeric state (~10x smaller)."""
+        if self._rng is not None:
+            self._rng_state = self._rng_state_tuple(self._rng)
+            self._rng = None
+
+    @staticmethod
+    def _rng_state_tuple(rng: SessionRNG) -> Tuple:
+        d = rng.to_dict()
+        return (
+            d["seed"], tuple(d["spawn_key"]), d["children_spawned"],
+            d["state"], d["inc"], d["has_uint32"], d["uinteger"],
+        )
+
+    def copy(self) -> "SessionState":
+        """Detached, compact copy (safe to pickle off the event loop)."""
+        clone = SessionState.__new__(SessionState)
+        clone.__setstate__(self.__getstate__())
+        return clone
+
+    def __getstate__(self):
+        # Doesn't compact in place: a request may hold the live stream
+        state = {name: getattr(self, name) for name in self.__slots__}
+        if self._rng is not None:
+            state["_rng"], state["_rng_state"] = None, self._rng_state_tuple(self._rng)
+        return tuple(state.values())
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
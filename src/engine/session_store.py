@@ -0,0 +1,284 @@
+"""
+God Mode Engine — Session Store
+================================
+Where live training sessions are kept between requests.
+
+- LocalSessionStore: a plain dict inside one process (dev / single worker),
+  optionally journaled to disk so sessions survive restarts
+- RedisSessionStore: shared across forked workers and hosts (needs `redis`,
+  used through its asyncio client)
+
+Sessions are SessionState records (src/engine/session_state.py), which the
+Redis store pickles. Request handlers read-modify-write a session inside
+`transaction`, so two requests for the same session can't interleave and
+lose each other's update:
+
+    async with sessions.transaction(session_id) as session:
+        ...  # mutate; saved on exit (compacting the RNG)
+
+Sessions expire after SESSION_TTL_SECONDS without a save, or
+COMPLETED_TTL_SECONDS once the session is over (`session.completed`).
+Redis expires keys itself; the local store treats expired sessions as
+missing and prunes them at each checkpoint, so the process and its
+snapshot don't grow without bound.
+
+The local store serializes transactions with a per-session asyncio.Lock.
+The Redis store is optimistic: it WATCHes the key, and if another worker
+saved the session in the meantime the write is refused with
+SessionConflict so the client can retry.
+
+Author: Smarter.Poker Engineering
+"""
+
+import asyncio
+import pickle
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Dict, Optional
+
+from .session_journal import (
+    CHECKPOINT_INTERVAL_SECONDS,
+    LOG_FLUSH_INTERVAL_SECONDS,
+    SessionJournal,
+)
+from .session_state import SessionState
+
+try:
+    import redis.asyncio as aioredis
+    from redis.exceptions import WatchError
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+SESSION_TTL_SECONDS = 6 * 60 * 60  # Idle sessions expire after 6 hours
+COMPLETED_TTL_SECONDS = 10 * 60  # Finished sessions linger for result polls
+SESSION_KEY_PREFIX = "godmode:session:"
+
+
+class SessionConflict(Exception):
+    """The session was saved by another request during this transaction."""
+
+
+def session_ttl(session: SessionState, ttl: int = SESSION_TTL_SECONDS) -> int:
+    """Seconds a session lives past its last save."""
+    return min(ttl, COMPLETED_TTL_SECONDS) if session.completed else ttl
+
+
+# ============================================================================
+# STORES
+# ============================================================================
+
+class LocalSessionStore:
+    """
+    In-process session dict. Only correct with a single worker.
+
+    With a journal, sessions are restored at construction, every save and
+    delete is logged, and `run_checkpoints` / `checkpoint` prune expired
+    sessions and write snapshots.
+    """
+
+    shared = False
+
+    def __init__(self, journal: Optional[SessionJournal] = None, ttl: int = SESSION_TTL_SECONDS):
+        self.journal = journal
+        self.ttl = ttl
+        self.expired = 0  # Sessions pruned since start
+        self._sessions: Dict[str, SessionState] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._lock_users: Dict[str, int] = {}
+        if journal is not None:
+            self._sessions = journal.restore()
+            self.prune()
+            journal.checkpoint(self._sessions)  # Fresh log, drops any torn tail
+
+    def _live(self, session_id: str) -> Optional[SessionState]:
+        session = self._sessions.get(session_id)
+        if session is not None and self._is_expired(session, time.time()):
+            return None
+        return session
+
+    def _is_expired(self, session: SessionState, now: float) -> bool:
+        return now - session.last_active > session_ttl(session, self.ttl)
+
+    async def get(self, session_id: str) -> Optional[SessionState]:
+        return self._live(session_id)
+
+    async def save(self, session_id: str, session: SessionState):
+        self._save(session_id, session)
+
+    def _save(self, session_id: str, session: SessionState):
+        session.compact()
+        session.last_active = time.time()
+        self._sessions[session_id] = session
+        if self.journal is not None:
+            self.journal.append(session_id, session)
+
+    async def delete(self, session_id: str):
+        if self._sessions.pop(session_id, None) is not None and self.journal is not None:
+            self.journal.append(session_id, None)
+
+    @asynccontextmanager
+    async def transaction(self, session_id: str) -> AsyncIterator[Optional[SessionState]]:
+        """
+        Hold the session's lock, yield it (None if missing) and save it on
+        exit, also when the body raises.
+        """
+        lock = self._locks.setdefault(session_id, asyncio.Lock())
+        self._lock_users[session_id] = self._lock_users.get(session_id, 0) + 1
+        try:
+            async with lock:
+                session = self._live(session_id)
+                try:
+                    yield session
+                finally:
+                    if session is not None:
+                        self._save(session_id, session)
+        finally:
+            self._lock_users[session_id] -= 1
+            if not self._lock_users[session_id]:
+                del self._lock_users[session_id]
+                del self._locks[session_id]
+
+    def prune(self) -> int:
+        """
+        Drop expired sessions (not logged: the next snapshot omits them).
+
+        Returns:
+            Number of sessions dropped
+        """
+        now = time.time()
+        expired = [sid for sid, session in self._sessions.items() if self._is_expired(session, now)]
+        for session_id in expired:
+            del self._sessions[session_id]
+        self.expired += len(expired)
+        return len(expired)
+
+    def checkpoint(self):
+        """Prune, snapshot every session and truncate the log (blocking; for shutdown)."""
+        self.prune()
+        if self.journal is not None:
+            self.journal.checkpoint(self._sessions)
+
+    async def checkpoint_async(self):
+        """Same as `checkpoint`, with the pickling and fsync in a worker thread."""
+        self.prune()
+        if self.journal is None:
+            return
+        # Detached copies: requests keep mutating the live sessions meanwhile
+        copies = {session_id: session.copy() for session_id, session in self._sessions.items()}
+        self.journal.begin_checkpoint()
+        try:
+            await asyncio.to_thread(self.journal.write_snapshot, copies)
+        finally:
+            self.journal.finish_checkpoint()
+
+    async def run_checkpoints(
+        self,
+        interval: float = CHECKPOINT_INTERVAL_SECONDS,
+        flush_interval: float = LOG_FLUSH_INTERVAL_SECONDS
+    ):
+        """
+        Flush the log every second and prune + snapshot on `interval`, until
+        cancelled. Without a journal, only prunes.
+        """
+        since_checkpoint = 0.0
+        while True:
+            await asyncio.sleep(flush_interval)
+            since_checkpoint += flush_interval
+            if since_checkpoint < interval:
+                if self.journal is not None:
+                    self.journal.flush()
+                continue
+            since_checkpoint = 0.0
+            if self.journal is None:
+                self.prune()
+            elif self.journal.appended or any(
+                self._is_expired(session, time.time()) for session in self._sessions.values()
+            ):
+                await self.checkpoint_async()
+            else:
+                self.journal.flush()
+
+    async def count(self) -> int:
+        return len(self._sessions)
+
+
+class RedisSessionStore:
+    """Pickled sessions in Redis, with a TTL reset on every save and optimistic locking."""
+
+    shared = True
+
+    def __init__(self, url: str, ttl: int = SESSION_TTL_SECONDS):
+        if not REDIS_AVAILABLE:
+            raise ImportError("redis not installed. Run: pip install redis")
+        self.client = aioredis.Redis.from_url(url)
+        self.ttl = ttl
+
+    async def get(self, session_id: str) -> Optional[SessionState]:
+        data = await self.client.get(SESSION_KEY_PREFIX + session_id)
+        return pickle.loads(data) if data is not None else None
+
+    async def save(self, session_id: str, session: SessionState):
+        await self.client.set(SESSION_KEY_PREFIX + session_id, self._dumps(session), ex=session_ttl(session, self.ttl))
+
+    async def delete(self, session_id: str):
+        await self.client.delete(SESSION_KEY_PREFIX + session_id)
+
+    @staticmethod
+    def _dumps(session: SessionState) -> bytes:
+        session.compact()
+        session.last_active = time.time()
+        return pickle.dumps(session, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @asynccontextmanager
+    async def transaction(self, session_id: str) -> AsyncIterator[Optional[SessionState]]:
+        """
+        WATCH the session, yield it (None if missing) and write it back in
+        MULTI/EXEC on exit, also when the body raises.
+
+        Raises:
+            SessionConflict: Another request saved the session meanwhile
+        """
+        key = SESSION_KEY_PREFIX + session_id
+        async with self.client.pipeline(transaction=True) as pipe:
+            await pipe.watch(key)
+            data = await pipe.get(key)
+            session = pickle.loads(data) if data is not None else None
+            try:
+                yield session
+            finally:
+                if session is not None:
+                    pipe.multi()
+                    pipe.set(key, self._dumps(session), ex=session_ttl(session, self.ttl))
+                    try:
+                        await pipe.execute()
+                    except WatchError:
+                        raise SessionConflict(session_id)
+
+    def checkpoint(self):
+        """Nothing to do: Redis persists sessions itself."""
+
+    async def run_checkpoints(self, *args, **kwargs):
+        return
+
+    async def count(self) -> int:
+        return sum([1 async for _ in self.client.scan_iter(match=SESSION_KEY_PREFIX + "*")])
+
+
+def create_session_store(redis_url: Optional[str] = None, journal_dir: Optional[Path] = None):
+    """
+    Redis when REDIS_URL is configured, otherwise the in-process dict
+    (journaled to `journal_dir` when given).
+
+    Check `store.shared` before running several workers: with the local
+    store each worker would only see its own sessions.
+    """
+    if redis_url:
+        return RedisSessionStore(redis_url)
+    return LocalSessionStore(SessionJournal(journal_dir) if journal_dir else None)
@@ -0,0 +1,101 @@
+"""
+God Mode Engine — Single-Flight Reads
+======================================
+Collapses concurrent identical database reads into one call.
+
+When a popular key misses every cache at once (a new game goes live, a
+deploy empties the registry cache), each request would otherwise issue the
+same query. With SingleFlight the first caller starts the fetch and every
+concurrent caller with the same key awaits that one result. An optional
+TTL keeps the result for a few seconds so the next wave hits memory.
+
+Fetch functions are plain blocking callables (supabase-py `.execute()`
+chains); they run in a worker thread so the event loop stays free.
+
+Author: Smarter.Poker Engineering
+"""
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+def query_key(table: str, *parts: Any, **filters: Any) -> Tuple:
+    """
+    Hashable key describing a query's shape.
+
+    Example:
+        query_key("solved_spots_gold", "limit=50", street="flop", pot_type="SRP")
+    """
+    return (table, parts, tuple(sorted((k, repr(v)) for k, v in filters.items())))
+
+
+class SingleFlight:
+    """
+    Per-key request coalescing with optional short-lived result caching.
+
+    Usage:
+        flights = SingleFlight()
+        rows = await flights.do(key, lambda: query.execute().data, ttl=5)
+    """
+
+    def __init__(self, max_cached: int = 4096):
+        self.max_cached = max_cached
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._cache: Dict[Hashable, Tuple[float, Any]] = {}
+        self.stats = {"calls": 0, "fetches": 0, "coalesced": 0, "cache_hits": 0}
+
+    async def do(self, key: Hashable, fetch: Callable[[], Any], ttl: float = 0.0) -> Any:
+        """
+        Return fetch()'s result, sharing one execution among concurrent callers.
+
+        Args:
+            key: Query shape (see query_key)
+            fetch: Blocking zero-argument callable; runs in a thread
+            ttl: Seconds to keep the result for later callers (0 = only
+                coalesce calls that overlap in time)
+
+        Raises:
+            Whatever fetch raises; every waiter of that flight sees it and
+            nothing is cached. Cancelling a caller only stops its own wait.
+        """
+        self.stats["calls"] += 1
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            expires, value = cached
+            if time.monotonic() < expires:
+                self.stats["cache_hits"] += 1
+                return value
+            del self._cache[key]
+
+        flight = self._inflight.get(key)
+        if flight is not None:
+            self.stats["coalesced"] += 1
+        else:
+            # The fetch runs as its own task, so a cancelled caller (the one
+            # that started it included) never cancels it for the others
+            flight = asyncio.create_task(self._fetch(key, fetch, ttl))
+            # Mark a failure retrieved even if every caller has gone
+            flight.add_done_callback(lambda task: task.cancelled() or task.exception())
+            self._inflight[key] = flight
+            self.stats["fetches"] += 1
+        return await asyncio.shield(flight)
+
+    async def _fetch(self, key: Hashable, fetch: Callable[[], Any], ttl: float) -> Any:
+        try:
+            value = await asyncio.to_thread(fetch)
+        finally:
+            del self._inflight[key]
+        if ttl > 0:
+            if len(self._cache) >= self.max_cached:
+                self._cache.clear()
+            self._cache[key] = (time.monotonic() + ttl, value)
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Drop one cached result, or all of them."""
+        if key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(key, None)
@@ -0,0 +1,139 @@
+"""
+God Mode Engine — Boot Snapshot
+================================
+One prebuilt file holding everything the engine would otherwise fetch or
+compile on first use: the game registry and the compiled charts from
+data/charts, plus their lookup indexes.
+
+Built by scripts/build_snapshot.py at deploy time and loaded at boot in a
+few milliseconds; the server then reconciles the registry with the
+database in the background (GameEngine.reconcile_registry).
+
+File layout:
+    magic     4s   b"GMSN"
+    version   u16  FORMAT_VERSION (a mismatch means "rebuild", not an error)
+    pad       2x
+    built_at  f64  unix time of the build
+    digest    32s  sha256 of the payload
+    payload   pickle of {"registry": [...], "charts": [...]}
+
+Charts are stored as plain tuples so the payload does not depend on
+class import paths. Every registry row must carry its database `id`
+(sessions and history are keyed on it), so write_snapshot refuses rows
+without one.
+
+Author: Smarter.Poker Engineering
+"""
+
+import hashlib
+import pickle
+import struct
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .chart_index import CHARTS_DIR, ChartIndex, CompiledChart
+
+
+# ============================================================================
+# FILE FORMAT
+# ============================================================================
+
+MAGIC = b"GMSN"
+FORMAT_VERSION = 2  # 2: dropped the unused scenarios payload
+HEADER = struct.Struct("<4sH2xd32s")
+
+DATA_DIR = Path(__file__).resolve().parents[2] / "data"
+SNAPSHOT_PATH = DATA_DIR / "snapshot" / "engine.snapshot"
+
+
+@dataclass
+class EngineSnapshot:
+    """Decoded snapshot plus the indexes derived from it at load."""
+    built_at: float
+    registry: List[Dict[str, Any]]
+    charts: ChartIndex
+    games_by_key: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # slug and id
+
+
+# ============================================================================
+# BUILD
+# ============================================================================
+
+def write_snapshot(
+    path: Path,
+    registry: List[Dict[str, Any]],
+    charts: Optional[ChartIndex] = None
+) -> int:
+    """
+    Serialize a snapshot atomically.
+
+    Args:
+        path: Output file
+        registry: game_registry rows, each with its `id`
+        charts: Compiled charts (defaults to compiling data/charts)
+
+    Returns:
+        Size of the written file in bytes
+
+    Raises:
+        ValueError: If a registry row has no id
+    """
+    missing = [game.get("slug") for game in registry if not game.get("id")]
+    if missing:
+        raise ValueError(f"{len(missing)} registry rows have no id (e.g. {missing[0]!r})")
+    charts = charts or ChartIndex.load(CHARTS_DIR)
+
+    payload = pickle.dumps({
+        "registry": registry,
+        "charts": [
+            (c.chart_id, c.family, c.position, c.stack_bb, c.actions, c.villain_position)
+            for c in charts.charts.values()
+        ],
+    }, protocol=pickle.HIGHEST_PROTOCOL)
+
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, time.time(), hashlib.sha256(payload).digest())
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(header)
+        f.write(payload)
+    tmp.replace(path)
+    return len(header) + len(payload)
+
+
+# ============================================================================
+# LOAD
+# ============================================================================
+
+def load_snapshot(path: Path = SNAPSHOT_PATH) -> Optional[EngineSnapshot]:
+    """
+    Load a snapshot, or None if it is missing, from another format
+    version, or fails its checksum (callers fall back to live loading).
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+
+    if len(data) < HEADER.size:
+        return None
+    magic, version, built_at, digest = HEADER.unpack_from(data)
+    payload = memoryview(data)[HEADER.size:]
+    if magic != MAGIC or version != FORMAT_VERSION or hashlib.sha256(payload).digest() != digest:
+        print(f"⚠️ Ignoring stale or corrupt snapshot: {path}")
+        return None
+
+    raw = pickle.loads(payload)
+    snapshot = EngineSnapshot(
+        built_at=built_at,
+        registry=raw["registry"],
+        charts=ChartIndex([CompiledChart(*fields) for fields in raw["charts"]]),
+    )
+    for game in snapshot.registry:
+        for key in (game.get("slug"), game.get("id")):
+            if key:
+                snapshot.games_by_key[key] = game
+    return snapshot
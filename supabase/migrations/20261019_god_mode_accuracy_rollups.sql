@@ -0,0 +1,70 @@
+-- Migration: Streaming accuracy rollups for the God Mode engine
+-- One row per user × game × level × spot attribute, incremented in batches
+-- by the server (src/engine/rollups.py) so profile / coach views never scan
+-- god_mode_hand_history.
+
+CREATE TABLE IF NOT EXISTS god_mode_accuracy_rollup (
+    user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+    game_id TEXT NOT NULL,          -- game_registry slug
+    level INTEGER NOT NULL,
+    attribute TEXT NOT NULL,        -- 'all', 'street', 'stack_depth', 'chart_type', ...
+    value TEXT NOT NULL,
+    hands INTEGER NOT NULL DEFAULT 0,
+    correct INTEGER NOT NULL DEFAULT 0,
+    ev_loss_sum NUMERIC NOT NULL DEFAULT 0,
+    hp_damage_sum INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (user_id, game_id, level, attribute, value)
+);
+
+-- Enable RLS
+ALTER TABLE god_mode_accuracy_rollup ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view their own rollups"
+    ON god_mode_accuracy_rollup FOR SELECT USING (auth.uid() = user_id);
+
+-- Batch increment: deltas is a JSON array of
+-- {user_id, game_id, level, attribute, value, hands, correct, ev_loss_sum, hp_damage_sum}
+-- Deltas whose user_id is not a UUID or not a known user are skipped rather
+-- than failing the whole batch; the return value counts applied rows only.
+CREATE OR REPLACE FUNCTION increment_accuracy_rollups(deltas JSONB)
+RETURNS INTEGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+    applied INTEGER;
+BEGIN
+    INSERT INTO god_mode_accuracy_rollup AS r (
+        user_id, game_id, level, attribute, value,
+        hands, correct, ev_loss_sum, hp_damage_sum, updated_at
+    )
+    SELECT
+        u.id,
+        d->>'game_id',
+        (d->>'level')::INTEGER,
+        d->>'attribute',
+        d->>'value',
+        (d->>'hands')::INTEGER,
+        (d->>'correct')::INTEGER,
+        (d->>'ev_loss_sum')::NUMERIC,
+        (d->>'hp_damage_sum')::INTEGER,
+        NOW()
+    FROM jsonb_array_elements(deltas) AS d
+    JOIN auth.users u ON u.id = CASE
+        WHEN d->>'user_id' ~* '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
+        THEN (d->>'user_id')::UUID
+    END
+    ON CONFLICT (user_id, game_id, level, attribute, value) DO UPDATE SET
+        hands = r.hands + EXCLUDED.hands,
+        correct = r.correct + EXCLUDED.correct,
+        ev_loss_sum = r.ev_loss_sum + EXCLUDED.ev_loss_sum,
+        hp_damage_sum = r.hp_damage_sum + EXCLUDED.hp_damage_sum,
+        updated_at = NOW();
+    GET DIAGNOSTICS applied = ROW_COUNT;
+    RETURN applied;
+END;
+$$;
+
+REVOKE ALL ON FUNCTION increment_accuracy_rollups(JSONB) FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION increment_accuracy_rollups(JSONB) TO service_role;
@@ -0,0 +1,28 @@
+-- Migration: Difficulty score for solved_spots_gold
+-- Computed at ingest (src/engine/difficulty.py) from the EV gap between the
+-- top actions, the mixed-strategy share and the number of close alternatives.
+-- The engine pages (id, difficulty) per filter combination, ordered by id,
+-- and buckets the scores by percentile within that combination; bucket N is
+-- dealt to level N. difficulty_bucket keeps the global equal-width bin.
+
+ALTER TABLE solved_spots_gold
+    ADD COLUMN IF NOT EXISTS difficulty REAL CHECK (difficulty BETWEEN 0 AND 1),
+    ADD COLUMN IF NOT EXISTS difficulty_bucket SMALLINT CHECK (difficulty_bucket BETWEEN 1 AND 10);
+
+-- Columns GameEngine._build_solver_filters filters on
+ALTER TABLE solved_spots_gold
+    ADD COLUMN IF NOT EXISTS stack_category TEXT,
+    ADD COLUMN IF NOT EXISTS hero_position TEXT,
+    ADD COLUMN IF NOT EXISTS spot_type TEXT;
+
+-- Index-only keyset scans for the engine's per-filter index load:
+-- equality on the filter columns, then ORDER BY id
+DROP INDEX IF EXISTS idx_solved_spots_difficulty;
+CREATE INDEX IF NOT EXISTS idx_solved_spots_difficulty
+    ON solved_spots_gold(street, stack_category, hero_position, spot_type, id)
+    INCLUDE (difficulty);
+
+-- Backfill scan for rows scored before the difficulty column existed
+CREATE INDEX IF NOT EXISTS idx_solved_spots_unscored
+    ON solved_spots_gold(id)
+    WHERE difficulty IS NULL;
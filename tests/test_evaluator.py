@@ -0,0 +1,157 @@
+"""
+Tests for src/engine/evaluator.py.
+
+The category checks are exhaustive: every 5-, 6- and 7-card hand is
+evaluated with the batch API and the best-hand category frequencies are
+compared against the known totals. The 7-card pass covers all
+133,784,560 hands and takes the better part of a minute.
+"""
+
+import itertools
+import sys
+from functools import lru_cache
+from math import comb
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.engine.evaluator import (
+    CATEGORY_NAMES,
+    FIVE_CARD_COUNTS,
+    evaluate,
+    evaluate_batch,
+    hand_category,
+    hand_name,
+)
+
+
+# Best-five-card category counts (High Card .. Straight Flush, royals included)
+SIX_CARD_COUNTS = [6612900, 9730740, 2532816, 732160, 361620, 205792, 165984, 14664, 1844]
+SEVEN_CARD_COUNTS = [23294460, 58627800, 31433400, 6461620, 6180020, 4047644, 3473184, 224848, 41584]
+
+
+@lru_cache(maxsize=1)
+def _five_subsets_colex() -> np.ndarray:
+    """All 5-subsets of range(51) in colex order: those of range(n) are the first C(n, 5)."""
+    subsets = np.array(list(itertools.combinations(range(51), 5)), dtype=np.int8)
+    return subsets[np.lexsort(subsets.T)]
+
+
+def _category_counts(hole_size: int) -> list:
+    """Category counts over every (hole_size + 5)-card hand, in sorted-card order."""
+    subsets = _five_subsets_colex()
+    counts = np.zeros(9, dtype=np.int64)
+    for hole in itertools.combinations(range(52), hole_size):
+        rest = 51 - hole[-1]
+        if rest < 5:
+            continue
+        tail = subsets[:comb(rest, 5)] + (hole[-1] + 1)
+        hands = np.hstack([np.broadcast_to(np.array(hole, dtype=np.int8), (len(tail), hole_size)), tail])
+        counts += np.bincount(hand_category(evaluate_batch(hands)), minlength=9)
+    return counts.tolist()
+
+
+def _random_hands(k: int, n: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.random((n, 52)).argpartition(k, axis=1)[:, :k]
+
+
+# ============================================================================
+# EXHAUSTIVE CATEGORY COUNTS
+# ============================================================================
+
+def test_five_card_categories_exhaustive():
+    hands = np.array(list(itertools.combinations(range(52), 5)), dtype=np.int8)
+    strengths = evaluate_batch(hands)
+    assert np.bincount(hand_category(strengths), minlength=9).tolist() == FIVE_CARD_COUNTS
+    assert len(np.unique(strengths)) == 7462
+    assert strengths.min() == 1 and strengths.max() == 7462
+
+
+def test_six_card_categories_exhaustive():
+    counts = _category_counts(1)
+    assert sum(counts) == comb(52, 6)
+    assert counts == SIX_CARD_COUNTS
+
+
+def test_seven_card_categories_exhaustive():
+    counts = _category_counts(2)
+    assert sum(counts) == comb(52, 7)
+    assert counts == SEVEN_CARD_COUNTS
+
+
+# ============================================================================
+# BATCH VS SCALAR
+# ============================================================================
+
+@pytest.mark.parametrize("k", [5, 6, 7])
+def test_batch_matches_scalar(k):
+    hands = _random_hands(k, 3000, seed=k)
+    batch = evaluate_batch(hands)
+    assert batch.dtype == np.uint16
+    for hand, value in zip(hands.tolist(), batch.tolist()):
+        assert evaluate(hand) == value
+
+
+@pytest.mark.parametrize("k", [6, 7])
+def test_batch_is_best_five_card_subset(k):
+    hands = _random_hands(k, 1000, seed=10 + k)
+    batch = evaluate_batch(hands)
+    for hand, value in zip(hands.tolist(), batch.tolist()):
+        subsets = np.array(list(itertools.combinations(hand, 5)))
+        assert evaluate_batch(subsets).max() == value
+
+
+def test_batch_is_order_independent():
+    hands = _random_hands(7, 2000, seed=3)
+    shuffled = np.random.default_rng(4).permuted(hands, axis=1)
+    assert np.array_equal(evaluate_batch(hands), evaluate_batch(shuffled))
+
+
+# ============================================================================
+# SCALAR API
+# ============================================================================
+
+@pytest.mark.parametrize("cards, category", [
+    ("AsKsQsJsTs", "Straight Flush"),
+    ("5h4h3h2hAh", "Straight Flush"),
+    ("AsAhAdAcKs", "Four of a Kind"),
+    ("KsKhKd2c2s", "Full House"),
+    ("As9s7s4s2s", "Flush"),
+    ("5d4c3h2sAs", "Straight"),
+    ("QsQhQd7c2s", "Three of a Kind"),
+    ("JsJh4d4c9s", "Two Pair"),
+    ("8s8h4dKc2s", "Pair"),
+    ("AsJh8d5c3s", "High Card"),
+])
+def test_named_hands(cards, category):
+    assert hand_name(evaluate(cards)) == category
+
+
+def test_royal_flush_is_strongest():
+    assert evaluate("AsKsQsJsTs") == 7462
+    assert evaluate(["Ah", "Kh", "Qh", "Jh", "Th", "2c", "3d"]) == 7462
+
+
+def test_wheel_is_lowest_straight():
+    wheel = evaluate("5d4c3h2sAs")
+    six_high = evaluate("6d5c4h3s2s")
+    assert hand_category(wheel) == CATEGORY_NAMES.index("Straight")
+    assert wheel < six_high
+
+
+def test_scalar_accepts_ints_and_mixed_case():
+    assert evaluate("asKSqsJsts") == evaluate([0, 4, 8, 12, 16]) == 7462
+
+
+def test_rejects_wrong_card_counts():
+    with pytest.raises(ValueError):
+        evaluate("AsKsQsJs")
+    with pytest.raises(ValueError):
+        evaluate_batch(np.zeros((3, 8), dtype=np.int8))
+    with pytest.raises(ValueError):
+        evaluate_batch(np.zeros(7, dtype=np.int8))